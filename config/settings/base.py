@@ -3,6 +3,8 @@ from django.apps import apps
 import environ
 import datetime
 
+from kombu import Queue
+
 ROOT_DIR = environ.Path(__file__) - 3  # (odin/config/settings/base.py - 3 = odin/)
 APPS_DIR = ROOT_DIR.path('odin')
 
@@ -191,10 +193,41 @@ CELERY_TASK_SOFT_TIME_LIMIT = env('CELERY_TASK_SOFT_TIME_LIMIT', default=60)
 CELERY_TASK_TIME_LIMIT = env('CELERY_TASK_TIME_LIMIT', default=60+60)
 CELERY_TASK_MAX_RETRIES = env('CELERY_TASK_MAX_RERIES', default=3)
 
+# Interactive grading, bulk grading and emails get separate queues, so they can be served by separate workers
+CELERY_TASK_DEFAULT_QUEUE = 'celery'
+CELERY_GRADING_MAX_PRIORITY = 10
+
+CELERY_TASK_QUEUES = (
+    Queue('celery'),
+    Queue('emails'),
+    Queue('grading_submit', queue_arguments={'x-max-priority': CELERY_GRADING_MAX_PRIORITY}),
+    Queue('grading_poll'),
+    Queue('grading_bulk'),
+)
+
+CELERY_TASK_ROUTES = {
+    'odin.grading.tasks.submit_solution': {'queue': 'grading_submit'},
+    'odin.grading.tasks.poll_solution': {'queue': 'grading_poll'},
+    'odin.grading.tasks.poll_waiting_solutions': {'queue': 'grading_poll'},
+    'odin.education.tasks.dispatch_regrade_job': {'queue': 'grading_bulk'},
+    'odin.emails.tasks.send_mail': {'queue': 'emails'},
+    'odin.emails.tasks.send_template_mail': {'queue': 'emails'},
+    'odin.emails.tasks.send_batch_template_mail': {'queue': 'emails'},
+    'odin.common.tasks.send_template_mail': {'queue': 'emails'},
+}
+
+# Priorities only take effect when a worker does not prefetch past the task it is running.
+# Late acks are enabled per task, only for the grading tasks that are safe to run twice
+CELERY_TASK_ACKS_LATE = env.bool('CELERY_TASK_ACKS_LATE', default=False)
+CELERY_WORKER_PREFETCH_MULTIPLIER = env.int('CELERY_WORKER_PREFETCH_MULTIPLIER', default=1)
+
 # Mandrill settings
 
 MANDRILL_API_KEY = env('MANDRILL_API_KEY', default='')
 
+# Recipients per Mandrill API call when sending batched template emails
+MANDRILL_BATCH_SIZE = env.int('MANDRILL_BATCH_SIZE', default=500)
+
 USE_DJANGO_EMAIL_BACKEND = env(
     'USE_DJANGO_EMAIL_BACKEND',
     default=(MANDRILL_API_KEY == '')
@@ -216,6 +249,17 @@ EMAIL_TEMPLATES = {
     for key, f in templates.items()
 }
 
+# Seconds to keep resolved user roles in the cache, 0 keeps them for the request only.
+# Needs a cache shared by all processes, which the common.E001 system check enforces
+USER_ROLES_CACHE_TIMEOUT = env.int('USER_ROLES_CACHE_TIMEOUT', default=0)
+
+# Seconds to keep the course ids of a user in the cache, 0 checks membership with a query every time.
+# Needs a cache shared by all processes, which the common.E001 system check enforces
+COURSE_MEMBERSHIP_CACHE_TIMEOUT = env.int('COURSE_MEMBERSHIP_CACHE_TIMEOUT', default=0)
+
+# Maximum number of solutions accepted by one bulk submit request
+SOLUTIONS_BULK_SUBMIT_LIMIT = env.int('SOLUTIONS_BULK_SUBMIT_LIMIT', default=500)
+
 TASK_PASSED = "Passed"
 TASK_FAILED = "Failed"
 
@@ -12,3 +12,42 @@ GRADER_API_KEY = env('GRADER_API_KEY', default='')
 GRADER_API_SECRET = env('GRADER_API_SECRET', default='')
 GRADER_POLLING_COUNTDOWN = env.int('GRADER_POLLING_COUNTDOWN', default=2)
 GRADER_RESUBMIT_COUNTDOWN = env.int('GRADER_RESUBMIT_COUNTDOWN', default=10)
+GRADER_REQUEST_TIMEOUT = env.float('GRADER_REQUEST_TIMEOUT', default=10)
+GRADER_POOL_CONNECTIONS = env.int('GRADER_POOL_CONNECTIONS', default=4)
+GRADER_POOL_MAXSIZE = env.int('GRADER_POOL_MAXSIZE', default=10)
+GRADER_CONNECT_RETRIES = env.int('GRADER_CONNECT_RETRIES', default=3)
+GRADER_CALLBACK_URL = env('GRADER_CALLBACK_URL', default='')
+GRADER_FALLBACK_POLLING_COUNTDOWN = env.int('GRADER_FALLBACK_POLLING_COUNTDOWN', default=60)
+GRADER_POLLING_MAX_COUNTDOWN = env.int('GRADER_POLLING_MAX_COUNTDOWN', default=60)
+GRADER_POLLING_DEADLINE = env.int('GRADER_POLLING_DEADLINE', default=30 * 60)
+GRADER_EXPECTED_TIME_SAMPLE_SIZE = env.int('GRADER_EXPECTED_TIME_SAMPLE_SIZE', default=100)
+GRADER_EXPECTED_TIME_CACHE_TIMEOUT = env.int('GRADER_EXPECTED_TIME_CACHE_TIMEOUT', default=10 * 60)
+GRADER_MAX_FILE_SIZE = env.int('GRADER_MAX_FILE_SIZE', default=10 * 1024 * 1024)
+GRADER_ENCODING_CHUNK_SIZE = env.int('GRADER_ENCODING_CHUNK_SIZE', default=3 * 64 * 1024)
+# Chunked transfer encoding of submissions is opt-in until the production grader is verified with it
+GRADER_CHUNKED_UPLOAD = env.bool('GRADER_CHUNKED_UPLOAD', default=False)
+GRADER_TEST_RESOURCE_CACHE_TIMEOUT = env.int('GRADER_TEST_RESOURCE_CACHE_TIMEOUT', default=24 * 60 * 60)
+GRADER_REGRADE_MAX_IN_FLIGHT = env.int('GRADER_REGRADE_MAX_IN_FLIGHT', default=20)
+GRADER_REGRADE_DISPATCH_INTERVAL = env.int('GRADER_REGRADE_DISPATCH_INTERVAL', default=5)
+GRADER_ASYNC_MAX_IN_FLIGHT = env.int('GRADER_ASYNC_MAX_IN_FLIGHT', default=500)
+GRADER_ASYNC_DB_THREADS = env.int('GRADER_ASYNC_DB_THREADS', default=4)
+# When set, submissions are only marked as queued and the `run_async_grader` command grades them
+GRADER_ASYNC_DISPATCH = env.bool('GRADER_ASYNC_DISPATCH', default=False)
+GRADER_ASYNC_POLL_INTERVAL = env.float('GRADER_ASYNC_POLL_INTERVAL', default=1)
+# Long enough to submit and poll a solution up to GRADER_POLLING_DEADLINE, after that another dispatcher takes it
+GRADER_ASYNC_CLAIM_TIMEOUT = env.int('GRADER_ASYNC_CLAIM_TIMEOUT', default=GRADER_POLLING_DEADLINE + 10 * 60)
+GRADER_METRICS_TOKEN = env('GRADER_METRICS_TOKEN', default='')
+GRADER_METRICS_WINDOW = env.int('GRADER_METRICS_WINDOW', default=15 * 60)
+
+# 'task' schedules a polling task per solution, 'batch' polls all waiting solutions periodically
+GRADER_POLLING_MODE = env('GRADER_POLLING_MODE', default='task')
+GRADER_BATCH_POLLING_INTERVAL = env.float('GRADER_BATCH_POLLING_INTERVAL', default=5)
+GRADER_BATCH_POLLING_SIZE = env.int('GRADER_BATCH_POLLING_SIZE', default=200)
+
+CELERY_BEAT_SCHEDULE = {}
+
+if GRADER_POLLING_MODE == 'batch':
+    CELERY_BEAT_SCHEDULE['poll-waiting-solutions'] = {
+        'task': 'odin.grading.tasks.poll_waiting_solutions',
+        'schedule': GRADER_BATCH_POLLING_INTERVAL,
+    }
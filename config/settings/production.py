@@ -66,6 +66,16 @@ STATIC_CDN_CUSTOM_DOMAIN = '%s/%s' % (AWS_S3_HOST, AWS_STORAGE_BUCKET_NAME)
 STATICFILES_STORAGE = 'config.settings.storages.StaticStorage'
 
 
+# CACHING
+# ------------------------------------------------------------------------------
+# Shared by all web and Celery processes, so cached grader archives and
+# cache invalidations are seen everywhere. The default database cache needs
+# `python manage.py createcachetable`; point DJANGO_CACHE_URL to memcached to use it instead.
+CACHES = {
+    'default': env.cache('DJANGO_CACHE_URL', default='dbcache://odin_cache'),
+}
+
+
 # EMAIL
 # ------------------------------------------------------------------------------
 DEFAULT_FROM_EMAIL = env('DJANGO_DEFAULT_FROM_EMAIL',
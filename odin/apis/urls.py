@@ -8,5 +8,13 @@ urlpatterns = [
     url(
         regex='^auth/',
         view=include('odin.authentication.urls', namespace='auth')
-    )
+    ),
+    url(
+        regex='^grading/',
+        view=include('odin.grading.urls', namespace='grading')
+    ),
+    url(
+        regex='^interviews/',
+        view=include('odin.interviews.urls', namespace='interviews')
+    ),
 ]
@@ -14,11 +14,7 @@ from odin.users.models import (
     PasswordResetToken
 )
 
-from odin.education.models import (
-    Student,
-    Teacher,
-    Course,
-)
+from odin.education.models import Course
 
 
 class _ProfileSerializer(serializers.ModelSerializer):
@@ -44,14 +40,17 @@ TEACHER_TYPE = 'teacher'
 
 
 def get_user_courses_per_user_type(*, user: BaseUser) -> str:
-    teacher = user.downcast(Teacher)
-    student = user.downcast(Student)
+    teacher_courses = Course.objects.none()
+    student_courses = Course.objects.none()
+
+    if user.is_teacher():
+        teacher_courses = Course.objects.filter(teachers__id=user.id)
 
-    teacher_courses = Course.objects.filter(
-        teachers__in=[teacher]).values_list('id', flat=True)
+    if user.is_student():
+        student_courses = Course.objects.filter(students__id=user.id)
 
-    student_courses = Course.objects.filter(
-        students__in=[student]).values_list('id', flat=True)
+    teacher_courses = teacher_courses.values_list('id', flat=True)
+    student_courses = student_courses.values_list('id', flat=True)
 
     return {
         STUDENT_TYPE: student_courses,
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class CommonConfig(AppConfig):
     name = 'odin.common'
+
+    def ready(self):
+        import odin.common.checks  # noqa
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core import checks
+
+PER_PROCESS_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# Caches that are invalidated with `cache.delete` on writes and so must be shared by all processes
+INVALIDATED_CACHE_TIMEOUTS = (
+    'COURSE_MEMBERSHIP_CACHE_TIMEOUT',
+    'USER_ROLES_CACHE_TIMEOUT',
+)
+
+
+@checks.register(checks.Tags.caches)
+def check_invalidated_caches_are_shared(app_configs, **kwargs):
+    backend = settings.CACHES['default']['BACKEND']
+
+    if backend not in PER_PROCESS_CACHE_BACKENDS:
+        return []
+
+    return [
+        checks.Error(
+            f'{name} is set, but the default cache is {backend}.',
+            hint='Its entries are invalidated only in the process that made the change. '
+                 f'Configure a cache shared by all processes or set {name} to 0.',
+            id='common.E001',
+        )
+        for name in INVALIDATED_CACHE_TIMEOUTS
+        if getattr(settings, name)
+    ]
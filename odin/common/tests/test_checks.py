@@ -0,0 +1,29 @@
+from django.test import TestCase, override_settings
+
+from odin.common.checks import check_invalidated_caches_are_shared
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+SHARED_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'odin_cache'}}
+
+
+class CheckInvalidatedCachesAreSharedTests(TestCase):
+    @override_settings(CACHES=LOCMEM_CACHES, COURSE_MEMBERSHIP_CACHE_TIMEOUT=60, USER_ROLES_CACHE_TIMEOUT=0)
+    def test_per_process_cache_with_membership_caching_is_an_error(self):
+        errors = check_invalidated_caches_are_shared(None)
+
+        self.assertEqual(['common.E001'], [error.id for error in errors])
+
+    @override_settings(CACHES=LOCMEM_CACHES, COURSE_MEMBERSHIP_CACHE_TIMEOUT=0, USER_ROLES_CACHE_TIMEOUT=60)
+    def test_per_process_cache_with_role_caching_is_an_error(self):
+        errors = check_invalidated_caches_are_shared(None)
+
+        self.assertEqual(['common.E001'], [error.id for error in errors])
+        self.assertIn('USER_ROLES_CACHE_TIMEOUT', errors[0].msg)
+
+    @override_settings(CACHES=LOCMEM_CACHES, COURSE_MEMBERSHIP_CACHE_TIMEOUT=0, USER_ROLES_CACHE_TIMEOUT=0)
+    def test_per_process_cache_without_caching_is_fine(self):
+        self.assertEqual([], check_invalidated_caches_are_shared(None))
+
+    @override_settings(CACHES=SHARED_CACHES, COURSE_MEMBERSHIP_CACHE_TIMEOUT=60, USER_ROLES_CACHE_TIMEOUT=60)
+    def test_shared_cache_with_caching_is_fine(self):
+        self.assertEqual([], check_invalidated_caches_are_shared(None))
@@ -1,3 +1,7 @@
+from typing import List
+
+from django.db.models import Case, Model, Value, When
+from django.db.models.functions import Cast
 from django.utils import timezone
 
 from rest_framework import serializers
@@ -62,3 +66,31 @@ def inline_serializer(*, fields, data=None, **kwargs):
         return serializer_class(data=data, **kwargs)
 
     return serializer_class(**kwargs)
+
+
+def bulk_update(*, objs: List[Model], fields: List[str], batch_size: int=500) -> int:
+    """
+    Saves `fields` of all `objs` with a single UPDATE ... CASE query per batch.
+    Our Django version has no QuerySet.bulk_update. Like it, this does not send any signals.
+    """
+    if not objs:
+        return 0
+
+    model = type(objs[0])
+    model_fields = [model._meta.get_field(name) for name in fields]
+    updated = 0
+
+    for start in range(0, len(objs), batch_size):
+        batch = objs[start:start + batch_size]
+        updates = {}
+
+        for field in model_fields:
+            whens = [
+                When(pk=obj.pk, then=Value(getattr(obj, field.attname), output_field=field))
+                for obj in batch
+            ]
+            updates[field.name] = Cast(Case(*whens, output_field=field), output_field=field)
+
+        updated += model._default_manager.filter(pk__in=[obj.pk for obj in batch]).update(**updates)
+
+    return updated
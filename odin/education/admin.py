@@ -12,6 +12,7 @@ from .models import (
     Solution,
     CourseAssignment,
     CourseDescription,
+    RegradeJob,
 )
 
 
@@ -96,3 +97,10 @@ class IncludedTestAdmin(admin.ModelAdmin):
 
     def get_week(self, obj):
         return obj.task.week.number
+
+
+@admin.register(RegradeJob)
+class RegradeJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'course', 'task', 'created_by', 'verbose_status', 'created_at', 'finished_at')
+    list_select_related = ('course', 'task', 'created_by')
+    raw_id_fields = ('solutions', )
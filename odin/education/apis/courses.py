@@ -11,8 +11,6 @@ from odin.common.utils import inline_serializer
 
 from odin.education.models import (
     Course,
-    Student,
-    Teacher,
     Week,
     ProgrammingLanguage,
 )
@@ -20,6 +18,7 @@ from odin.education.models import (
 from odin.education.services import (
     create_included_task_with_test,
     get_gradable_tasks_for_course,
+    get_solution_summaries_for_users,
 )
 
 from odin.education.apis.permissions import (
@@ -58,12 +57,18 @@ class StudentCoursesApi(
     def get_queryset(self):
         user = self.request.user
 
-        teacher = user.downcast(Teacher)
-        student = user.downcast(Student)
+        teacher_or_student = Q()
 
-        return Course.objects.filter(
-            Q(teachers__in=[teacher]) | Q(students__in=[student])
-        ).distinct()
+        if user.is_teacher():
+            teacher_or_student |= Q(teachers__id=user.id)
+
+        if user.is_student():
+            teacher_or_student |= Q(students__id=user.id)
+
+        if not teacher_or_student:
+            return Course.objects.none()
+
+        return Course.objects.filter(teacher_or_student).distinct()
 
 
 class CourseDetailApi(
@@ -249,12 +254,12 @@ class TeacherOnlyCourseDetailApi(
     class Serializer(serializers.ModelSerializer):
         languages = serializers.SerializerMethodField()
         students_count = serializers.IntegerField(source='students.count')
-        students = inline_serializer(many=True, fields={
+        students = inline_serializer(source='students_with_summary', many=True, fields={
             'id': serializers.IntegerField(),
-            'user_id': serializers.IntegerField(source='user.id'),
-            'full_name': serializers.CharField(source='user.name'),
+            'user_id': serializers.IntegerField(),
+            'full_name': serializers.CharField(source='name'),
             'solution_status_summary': inline_serializer(
-                source='user.get_solution_summary', fields={
+                source='solution_summary', fields={
                     'OK': serializers.IntegerField(),
                     'TOTAL': serializers.IntegerField(),
                     'completed_tasks': inline_serializer(
@@ -268,7 +273,7 @@ class TeacherOnlyCourseDetailApi(
                         }
                     )
                 }),
-            'avatar': serializers.CharField(source='user.get_avatar'),
+            'avatar': serializers.CharField(source='get_avatar'),
         })
 
         weeks = inline_serializer(many=True, fields={
@@ -304,10 +309,18 @@ class TeacherOnlyCourseDetailApi(
             )
 
     def get_queryset(self):
-        return Course.objects.prefetch_related('students__user__solutions')
+        return Course.objects.prefetch_related('weeks')
 
     def get(self, request, course_id):
 
         course = get_object_or_404(self.get_queryset(), pk=course_id)
 
+        students = list(course.students.select_related('profile'))
+        summaries = get_solution_summaries_for_users(users=students)
+
+        for student in students:
+            student.solution_summary = summaries[student.id]
+
+        course.students_with_summary = students
+
         return Response(self.Serializer(instance=course).data)
@@ -3,62 +3,39 @@ from rest_framework.generics import get_object_or_404
 
 from odin.authentication.permissions import JSONWebTokenAuthenticationMixin
 
-from odin.education.models import (
-    Student,
-    Teacher,
-    Course,
-)
+from odin.education.models import Course
+from odin.education.services import is_user_in_course
 
 
 class IsStudentPermission(BasePermission):
 
     def has_permission(self, request, view):
-        user = request.user
-        student = user.downcast(Student)
-
-        if student is not None:
-            return True
-
-        return False
+        return request.user.is_student()
 
 
 class IsTeacherPermission(BasePermission):
     def has_permission(self, request, view):
-        user = request.user
-        teacher = user.downcast(Teacher)
-
-        if teacher is not None:
-            return True
-
-        return False
+        return request.user.is_teacher()
 
 
 class IsStudentOrTeacherPermission(BasePermission):
 
     def has_permission(self, request, view):
         user = request.user
-        student = user.downcast(Student)
-        teacher = user.downcast(Teacher)
 
-        if student or teacher:
-            return True
-
-        return False
+        return user.is_student() or user.is_teacher()
 
 
 class IsStudentOrTeacherInCoursePermission(BasePermission):
 
     def has_permission(self, request, view):
-        user = request.user
-        student = user.downcast(Student)
-        teacher = user.downcast(Teacher)
         course_id = view.kwargs['course_id']
 
-        course = get_object_or_404(Course.objects.all(), pk=course_id)
-
-        if teacher in course.teachers.all() or student in course.students.all():
+        if is_user_in_course(user=request.user, course_id=course_id):
             return True
 
+        get_object_or_404(Course.objects.all(), pk=course_id)
+
         return False
 
 
@@ -80,3 +57,8 @@ class CourseAuthenticationMixin(JSONWebTokenAuthenticationMixin):
 class CourseDetailAuthenticationMixin(JSONWebTokenAuthenticationMixin):
     def get_permissions(self):
         return super().get_permissions() + [IsStudentOrTeacherInCoursePermission()]
+
+
+class TeacherInCourseAuthenticationMixin(JSONWebTokenAuthenticationMixin):
+    def get_permissions(self):
+        return super().get_permissions() + [IsTeacherPermission(), IsStudentOrTeacherInCoursePermission()]
@@ -0,0 +1,58 @@
+from django.shortcuts import get_object_or_404
+
+from rest_framework import serializers
+from rest_framework.views import APIView
+from rest_framework.response import Response
+
+from odin.apis.mixins import ServiceExceptionHandlerMixin
+
+from odin.education.models import Course, IncludedTask, RegradeJob
+from odin.education.services import create_regrade_job, get_regrade_job_progress
+
+from odin.education.apis.permissions import TeacherInCourseAuthenticationMixin
+
+
+def get_regrade_job_data(job: RegradeJob):
+    return {
+        'id': job.id,
+        'task_id': job.task_id,
+        'status': job.verbose_status,
+        'created_at': job.created_at,
+        'finished_at': job.finished_at,
+        'progress': get_regrade_job_progress(job=job),
+    }
+
+
+class RegradeJobCreateApi(
+    ServiceExceptionHandlerMixin,
+    TeacherInCourseAuthenticationMixin,
+    APIView
+):
+
+    class Serializer(serializers.Serializer):
+        task = serializers.PrimaryKeyRelatedField(queryset=IncludedTask.objects.all(), required=False)
+
+    def post(self, request, *args, **kwargs):
+        course = get_object_or_404(Course, id=self.kwargs.get('course_id'))
+
+        serializer = self.Serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        job = create_regrade_job(
+            course=course,
+            task=serializer.validated_data.get('task'),
+            created_by=request.user
+        )
+
+        return Response(get_regrade_job_data(job))
+
+
+class RegradeJobDetailApi(
+    TeacherInCourseAuthenticationMixin,
+    APIView
+):
+
+    def get(self, request, *args, **kwargs):
+        job = get_object_or_404(RegradeJob, id=self.kwargs.get('job_id'), course_id=self.kwargs.get('course_id'))
+
+        return Response(get_regrade_job_data(job))
@@ -6,3 +6,11 @@ from odin.education.models import IncludedTask
 class SolutionSubmitSerializer(serializers.Serializer):
     task = serializers.PrimaryKeyRelatedField(queryset=IncludedTask.objects.all())
     code = serializers.CharField(required=True)
+
+
+class BulkSolutionSubmitSerializer(serializers.Serializer):
+    class SolutionSerializer(serializers.Serializer):
+        task_id = serializers.IntegerField()
+        code = serializers.CharField(required=True)
+
+    solutions = SolutionSerializer(many=True)
@@ -9,11 +9,15 @@ from odin.education.models import Solution
 
 from odin.education.apis.permissions import CourseAuthenticationMixin
 
-from odin.education.services import create_gradable_solution
+from odin.education.services import create_gradable_solution, create_gradable_solutions
 
-from odin.education.apis.serializers import SolutionSubmitSerializer
+from odin.education.apis.serializers import SolutionSubmitSerializer, BulkSolutionSubmitSerializer
 
-from odin.grading.services import start_grader_communication
+from odin.grading.services import (
+    start_grader_communication,
+    start_bulk_grader_communication,
+    get_submission_priority,
+)
 
 
 class SolutionSubmitApi(
@@ -44,7 +48,8 @@ class SolutionSubmitApi(
         )
         start_grader_communication(
             solution_id=solution.id,
-            solution_model='education.Solution'
+            solution_model='education.Solution',
+            priority=get_submission_priority(solution=solution)
         )
 
         data = {
@@ -55,3 +60,34 @@ class SolutionSubmitApi(
             }
 
         return Response(data)
+
+
+class BulkSolutionSubmitApi(
+    ServiceExceptionHandlerMixin,
+    CourseAuthenticationMixin,
+    APIView
+):
+
+    def post(self, request):
+        serializer = BulkSolutionSubmitSerializer(data=self.request.data)
+        serializer.is_valid(raise_exception=True)
+
+        solutions = create_gradable_solutions(
+            user=self.request.user,
+            solutions=serializer.validated_data['solutions']
+        )
+        start_bulk_grader_communication(
+            solution_ids=[solution.id for solution in solutions],
+            solution_model='education.Solution'
+        )
+
+        data = [
+            {
+                'solution_id': solution.id,
+                'task_id': solution.task_id,
+                'solution_status': solution.verbose_status,
+            }
+            for solution in solutions
+        ]
+
+        return Response(data)
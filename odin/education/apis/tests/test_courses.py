@@ -0,0 +1,135 @@
+from test_plus import TestCase
+
+from django.db import connection
+from django.test import Client
+from django.shortcuts import reverse
+from django.test.utils import CaptureQueriesContext
+
+from odin.common.faker import faker
+
+from odin.users.factories import BaseUserFactory
+
+from odin.education.models import Student, Teacher, Solution
+from odin.education.services import add_student, add_teacher
+from odin.education.factories import (
+    CourseFactory,
+    IncludedTaskFactory,
+    SolutionFactory,
+)
+
+client = Client()
+
+
+class TestCourseDetailApi(TestCase):
+    def setUp(self):
+        self.test_password = faker.password()
+        self.user = BaseUserFactory(password=self.test_password)
+        self.user.is_active = True
+        self.user.save()
+        self.student = Student.objects.create_from_user(self.user)
+
+        self.course = CourseFactory()
+        self.week = self.course.weeks.first()
+        add_student(course=self.course, student=self.student)
+
+        self.login_url = reverse('api:auth:login')
+        self.course_detail_url = f'/api/education/courses/{self.course.id}/'
+
+        login_response = client.post(self.login_url, data={
+            'email': self.user.email,
+            'password': self.test_password,
+        })
+        self.auth_headers = {'HTTP_AUTHORIZATION': f'JWT {login_response.data["token"]}'}
+
+    def add_gradable_tasks_with_solutions(self, count):
+        for _ in range(count):
+            task = IncludedTaskFactory(course=self.course, week=self.week, gradable=True)
+            SolutionFactory(task=task, user=self.user)
+            SolutionFactory(task=task, user=self.user)
+
+    def get_course_detail_query_count(self):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.course_detail_url, **self.auth_headers)
+
+        self.assertEqual(200, response.status_code)
+
+        return len(context.captured_queries), response
+
+    def test_course_detail_returns_last_solution_for_every_gradable_task(self):
+        task = IncludedTaskFactory(course=self.course, week=self.week, gradable=True)
+        SolutionFactory(task=task, user=self.user)
+        last_solution = SolutionFactory(task=task, user=self.user)
+        IncludedTaskFactory(course=self.course, week=self.week, gradable=True)
+
+        _, response = self.get_course_detail_query_count()
+        problems = {problem['id']: problem for problem in response.data['problems']}
+
+        self.assertEqual(2, len(problems))
+        self.assertEqual(last_solution.id, problems[task.id]['last_solution']['id'])
+
+    def test_course_detail_query_count_does_not_grow_with_task_count(self):
+        self.add_gradable_tasks_with_solutions(2)
+        queries_with_few_tasks, _ = self.get_course_detail_query_count()
+
+        self.add_gradable_tasks_with_solutions(20)
+        queries_with_many_tasks, response = self.get_course_detail_query_count()
+
+        self.assertEqual(22, len(response.data['problems']))
+        self.assertEqual(queries_with_few_tasks, queries_with_many_tasks)
+
+
+class TestTeacherOnlyCourseDetailApi(TestCase):
+    def setUp(self):
+        self.test_password = faker.password()
+        self.user = BaseUserFactory(password=self.test_password)
+        self.user.is_active = True
+        self.user.save()
+        self.teacher = Teacher.objects.create_from_user(self.user)
+
+        self.course = CourseFactory()
+        self.week = self.course.weeks.first()
+        self.task = IncludedTaskFactory(course=self.course, week=self.week, gradable=True)
+        add_teacher(self.course, self.teacher)
+
+        self.course_students_url = f'/api/education/courses/{self.course.id}/teachers/'
+
+        login_response = client.post(reverse('api:auth:login'), data={
+            'email': self.user.email,
+            'password': self.test_password,
+        })
+        self.auth_headers = {'HTTP_AUTHORIZATION': f'JWT {login_response.data["token"]}'}
+
+    def add_students_with_solutions(self, count):
+        for _ in range(count):
+            student = Student.objects.create_from_user(BaseUserFactory())
+            add_student(course=self.course, student=student)
+            SolutionFactory(task=self.task, user=student, status=Solution.OK)
+            SolutionFactory(task=self.task, user=student, status=Solution.NOT_OK)
+
+    def get_course_students_query_count(self):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.course_students_url, **self.auth_headers)
+
+        self.assertEqual(200, response.status_code)
+
+        return len(context.captured_queries), response
+
+    def test_course_students_contain_solution_summary(self):
+        self.add_students_with_solutions(1)
+
+        _, response = self.get_course_students_query_count()
+        summary = response.data['students'][0]['solution_status_summary']
+
+        self.assertEqual(1, summary['OK'])
+        self.assertEqual(2, summary['TOTAL'])
+        self.assertEqual(1, len(summary['completed_tasks']))
+
+    def test_course_students_query_count_does_not_grow_with_student_count(self):
+        self.add_students_with_solutions(2)
+        queries_with_few_students, _ = self.get_course_students_query_count()
+
+        self.add_students_with_solutions(10)
+        queries_with_many_students, response = self.get_course_students_query_count()
+
+        self.assertEqual(12, len(response.data['students']))
+        self.assertEqual(queries_with_few_students, queries_with_many_students)
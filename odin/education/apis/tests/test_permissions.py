@@ -1,4 +1,9 @@
 from test_plus import TestCase
+
+from django.core.cache import cache
+from django.http import Http404
+from django.test import override_settings
+
 from odin.education.apis.permissions import (
     IsStudentPermission,
     IsTeacherPermission,
@@ -8,7 +13,8 @@ from odin.education.apis.permissions import (
 
 from odin.users.factories import BaseUserFactory
 from odin.education.models import Student, Teacher, CourseAssignment
-from odin.education.factories import CourseFactory
+from odin.education.factories import CourseFactory, StudentFactory
+from odin.education.services import add_student
 from unittest.mock import Mock
 
 
@@ -177,3 +183,38 @@ class TestIsStudentOrTeacherInCoursePermission(TestCase):
         self.assertTrue(self.user.is_teacher())
         self.assertTrue(self.user.is_student())
         self.assertTrue(permissions.has_permission(self.request, self.view))
+
+    def test_permission_for_student_in_course_costs_a_single_query(self):
+        student = Student.objects.create_from_user(self.user)
+        add_student(course=self.course, student=student)
+
+        for _ in range(10):
+            add_student(course=self.course, student=StudentFactory())
+
+        permissions = IsStudentOrTeacherInCoursePermission()
+
+        with self.assertNumQueries(1):
+            self.assertTrue(permissions.has_permission(self.request, self.view))
+
+    def test_permission_raises_not_found_when_course_does_not_exist(self):
+        self.view.kwargs = {'course_id': self.course.id + 1}
+
+        permissions = IsStudentOrTeacherInCoursePermission()
+
+        with self.assertRaises(Http404):
+            permissions.has_permission(self.request, self.view)
+
+    @override_settings(COURSE_MEMBERSHIP_CACHE_TIMEOUT=60)
+    def test_cached_course_membership_is_cleared_when_user_is_assigned_to_course(self):
+        cache.clear()
+        student = Student.objects.create_from_user(self.user)
+        permissions = IsStudentOrTeacherInCoursePermission()
+
+        self.assertFalse(permissions.has_permission(self.request, self.view))
+
+        add_student(course=self.course, student=student)
+
+        self.assertTrue(permissions.has_permission(self.request, self.view))
+
+        with self.assertNumQueries(0):
+            self.assertTrue(permissions.has_permission(self.request, self.view))
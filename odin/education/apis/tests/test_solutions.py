@@ -0,0 +1,70 @@
+from test_plus import TestCase
+
+from django.db import connection
+from django.test import Client
+from django.shortcuts import reverse
+from django.test.utils import CaptureQueriesContext
+
+from odin.common.faker import faker
+
+from odin.users.factories import BaseUserFactory
+
+from odin.education.models import Student, Solution
+from odin.education.services import add_student
+from odin.education.factories import CourseFactory, IncludedTaskFactory
+
+client = Client()
+
+
+class TestBulkSolutionSubmitApi(TestCase):
+    def setUp(self):
+        self.test_password = faker.password()
+        self.user = BaseUserFactory(password=self.test_password)
+        self.user.is_active = True
+        self.user.save()
+        self.student = Student.objects.create_from_user(self.user)
+
+        self.course = CourseFactory()
+        self.week = self.course.weeks.first()
+        add_student(course=self.course, student=self.student)
+
+        self.url = '/api/education/solutions/bulk/'
+
+        login_response = client.post(reverse('api:auth:login'), data={
+            'email': self.user.email,
+            'password': self.test_password,
+        })
+        self.auth_headers = {'HTTP_AUTHORIZATION': f'JWT {login_response.data["token"]}'}
+
+    def submit(self, tasks):
+        data = {'solutions': [{'task_id': task.id, 'code': faker.text()} for task in tasks]}
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.url, data=data, content_type='application/json', **self.auth_headers)
+
+        return response, len(context.captured_queries)
+
+    def test_bulk_submit_creates_all_solutions(self):
+        tasks = [IncludedTaskFactory(course=self.course, week=self.week, gradable=True) for _ in range(3)]
+
+        response, _ = self.submit(tasks)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(3, len(response.data))
+        self.assertEqual(3, Solution.objects.filter(user=self.user, task__in=tasks).count())
+
+    def test_bulk_submit_query_count_does_not_grow_with_solution_count(self):
+        tasks = [IncludedTaskFactory(course=self.course, week=self.week, gradable=True) for _ in range(10)]
+
+        _, queries_for_few_solutions = self.submit(tasks[:2])
+        _, queries_for_many_solutions = self.submit(tasks)
+
+        self.assertEqual(queries_for_few_solutions, queries_for_many_solutions)
+
+    def test_bulk_submit_rejects_tasks_outside_user_courses(self):
+        task = IncludedTaskFactory(gradable=True)
+
+        response, _ = self.submit([task])
+
+        self.assertEqual(400, response.status_code)
+        self.assertFalse(Solution.objects.filter(user=self.user).exists())
@@ -10,7 +10,9 @@ from .courses import (
 
 from .tasks import TaskDetailApi
 
-from .solutions import SolutionSubmitApi
+from .regrades import RegradeJobCreateApi, RegradeJobDetailApi
+
+from .solutions import SolutionSubmitApi, BulkSolutionSubmitApi
 
 
 urlpatterns = [
@@ -22,6 +24,10 @@ urlpatterns = [
         regex='^solution/(?P<solution_id>[0-9]+)/$',
         view=SolutionSubmitApi.as_view(),
     ),
+    url(
+        regex='^solutions/bulk/$',
+        view=BulkSolutionSubmitApi.as_view(),
+    ),
     url(
         regex='^courses/$',
         view=StudentCoursesApi.as_view()
@@ -46,4 +52,12 @@ urlpatterns = [
         regex='^courses/(?P<course_id>[0-9]+)/teachers/$',
         view=TeacherOnlyCourseDetailApi.as_view(),
     ),
+    url(
+        regex='^courses/(?P<course_id>[0-9]+)/regrades/$',
+        view=RegradeJobCreateApi.as_view(),
+    ),
+    url(
+        regex='^courses/(?P<course_id>[0-9]+)/regrades/(?P<job_id>[0-9]+)/$',
+        view=RegradeJobDetailApi.as_view(),
+    ),
 ]
@@ -0,0 +1,89 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from odin.common.faker import faker
+from odin.users.models import BaseUser
+
+from odin.education.models import Student, Solution
+from odin.education.services import (
+    create_course,
+    create_included_task,
+    add_student,
+    get_user_solution_summary,
+    get_solution_summaries_for_users,
+)
+
+
+class Command(BaseCommand):
+    help = 'Compares per-student and grouped solution summaries on a generated course. All data is rolled back.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=300)
+        parser.add_argument('--tasks', type=int, default=60)
+        parser.add_argument('--solutions', type=int, default=10)
+
+    def generate_course(self, *, students_count, tasks_count, solutions_count):
+        start_date = timezone.now().date()
+        course = create_course(
+            name=f'benchmark-{faker.uuid4()}',
+            start_date=start_date,
+            end_date=start_date + timezone.timedelta(days=30),
+            repository=faker.url(),
+            slug_url=f'benchmark-{faker.uuid4()}',
+        )
+        week = course.weeks.first()
+
+        tasks = [
+            create_included_task(course=course, week=week, name=f'Task {i}', gradable=True)
+            for i in range(tasks_count)
+        ]
+
+        students = []
+        for i in range(students_count):
+            user = BaseUser.objects.create(email=f'benchmark-{i}-{faker.email()}', password=None)
+            student = Student.objects.create_from_user(user)
+            add_student(course=course, student=student)
+            students.append(student)
+
+        solutions = [
+            Solution(task=task, user=student, code=faker.text(), status=faker.random_element([Solution.OK,
+                                                                                             Solution.NOT_OK]))
+            for student in students
+            for task in tasks
+            for _ in range(solutions_count)
+        ]
+        Solution.objects.bulk_create(solutions, batch_size=5000)
+
+        return students
+
+    def measure(self, label, func):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        print(f'{label}: {elapsed:.3f}s')
+
+        return elapsed
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            print('Generating benchmark data...')
+            students = self.generate_course(
+                students_count=options['students'],
+                tasks_count=options['tasks'],
+                solutions_count=options['solutions'],
+            )
+
+            def per_student_summaries():
+                for student in students:
+                    summary = get_user_solution_summary(user=student)
+                    list(summary['completed_tasks'])
+
+            per_student = self.measure('Per-student summaries', per_student_summaries)
+            grouped = self.measure('Grouped summaries', lambda: get_solution_summaries_for_users(users=students))
+
+            print(f'Speedup: {per_student / grouped:.1f}x')
+
+            transaction.set_rollback(True)
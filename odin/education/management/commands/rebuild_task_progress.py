@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from odin.education.models import Course
+from odin.education.services import rebuild_student_task_progress
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the student task progress table from the existing solutions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', type=int, help='Rebuild only the progress for the course with this id')
+
+    def handle(self, *args, **options):
+        course = None
+
+        if options['course'] is not None:
+            course = Course.objects.get(id=options['course'])
+
+        created = rebuild_student_task_progress(course=course)
+
+        print(f'Rebuilt {created} progress records')
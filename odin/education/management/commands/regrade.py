@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from odin.education.models import Course, IncludedTask
+from odin.education.services import create_regrade_job
+
+
+class Command(BaseCommand):
+    help = 'Sends the latest solution of every user for a course or a single task to the grader again.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', type=int, required=True)
+        parser.add_argument('--task', type=int, help='Regrade only the solutions for the included task with this id')
+
+    def handle(self, *args, **options):
+        course = Course.objects.get(id=options['course'])
+        task = None
+
+        if options['task'] is not None:
+            task = IncludedTask.objects.get(id=options['task'])
+
+        job = create_regrade_job(course=course, task=task)
+
+        print(f'Started regrade job {job.id} for {job.solutions.count()} solutions')
@@ -1,3 +1,6 @@
+from typing import List
+
+from django.db import connections
 from django.db.models import Manager, Q
 from django.apps import apps
 from django.core.exceptions import ValidationError
@@ -29,9 +32,28 @@ class StudentManager(BaseEducationUserManager):
         student.__dict__.update(user.__dict__)
 
         student.save()
+        user.clear_roles()
 
         return Student.objects.get(id=student.id)
 
+    def bulk_create_from_users(self, users: List[BaseUser]) -> List[int]:
+        """
+        Creates the Student rows of all `users` that are not students yet with a single INSERT ... ON CONFLICT.
+        Returns the ids of the users that became students.
+        Unlike `create_from_user`, this neither activates the users nor sends signals.
+        """
+        table = self.model._meta.db_table
+        column = self.model._meta.pk.column
+
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} ({column}) SELECT unnest(%s::integer[]) '
+                f'ON CONFLICT DO NOTHING RETURNING {column}',
+                [[user.id for user in users]]
+            )
+
+            return [row[0] for row in cursor.fetchall()]
+
 
 class TeacherManager(BaseEducationUserManager):
     def create_from_user(self, user: BaseUser):
@@ -50,6 +72,7 @@ class TeacherManager(BaseEducationUserManager):
         student.__dict__.update(user.__dict__)
 
         student.save()
+        user.clear_roles()
 
         return Teacher.objects.get(id=student.id)
 
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('education', '0027_auto_20180411_0919'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentTaskProgress',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('passed', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='task_progress', to='education.Course')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress', to='education.IncludedTask')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_progress', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='studenttaskprogress',
+            unique_together=set([('user', 'task')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='studenttaskprogress',
+            index_together=set([('course', 'passed')]),
+        ),
+    ]
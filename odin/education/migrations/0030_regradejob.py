@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('education', '0029_solution_grading_timings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegradeJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('status', models.SmallIntegerField(choices=[(0, 'in_progress'), (1, 'done')], default=0)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='regrade_jobs', to='education.Course')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='regrade_jobs', to=settings.AUTH_USER_MODEL)),
+                ('solutions', models.ManyToManyField(related_name='regrade_jobs', to='education.Solution')),
+                ('task', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='regrade_jobs', to='education.IncludedTask')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
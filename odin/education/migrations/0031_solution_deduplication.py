@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0030_regradejob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='deduplicate_solutions',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='solution',
+            name='code_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='solution',
+            name='deduplicated_from',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='education.Solution'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0031_solution_deduplication'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='solution',
+            name='queued_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='solution',
+            name='submit_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='solution',
+            name='submit_retries',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='solution',
+            name='nonce_failures',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
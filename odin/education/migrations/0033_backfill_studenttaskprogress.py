@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+from django.db.models import Case, Count, IntegerField, Q, When
+
+# Solution.OK and Solution.SUBMITTED_WITHOUT_GRADING at the time of this migration
+OK = 2
+SUBMITTED_WITHOUT_GRADING = 6
+
+
+def backfill_student_task_progress(apps, schema_editor):
+    """
+    Same as `rebuild_student_task_progress`, written against the historical models.
+    The passing condition is copied here, so later changes to the app code do not change this migration.
+    """
+    passing = Q(task__gradable=True, status=OK) | Q(task__gradable=False, status=SUBMITTED_WITHOUT_GRADING)
+    Solution = apps.get_model('education', 'Solution')
+    StudentTaskProgress = apps.get_model('education', 'StudentTaskProgress')
+
+    rows = Solution.objects.order_by().values('user', 'task', 'task__course').annotate(
+        passing_count=Count(Case(When(passing, then=1), output_field=IntegerField()))
+    )
+
+    StudentTaskProgress.objects.all().delete()
+    StudentTaskProgress.objects.bulk_create(
+        [
+            StudentTaskProgress(
+                user_id=row['user'],
+                task_id=row['task'],
+                course_id=row['task__course'],
+                passed=row['passing_count'] > 0
+            )
+            for row in rows
+        ],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0032_solution_grading_stages'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_student_task_progress, migrations.RunPython.noop),
+    ]
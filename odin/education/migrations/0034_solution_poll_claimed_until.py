@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0033_backfill_studenttaskprogress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='solution',
+            name='poll_claimed_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+import odin.common.utils
+
+
+class Migration(migrations.Migration):
+    """
+    The column is added without a default, so existing rows are not rewritten.
+    They stay NULL and are left out of the enqueue stage.
+    """
+
+    dependencies = [
+        ('education', '0034_solution_poll_claimed_until'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='solution',
+            name='grading_requested_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='solution',
+            name='grading_requested_at',
+            field=models.DateTimeField(blank=True, default=odin.common.utils.get_now, null=True),
+        ),
+    ]
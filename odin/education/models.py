@@ -13,7 +13,7 @@ from odin.common.utils import get_now, json_field_default
 from odin.users.models import BaseUser
 
 from .managers import StudentManager, TeacherManager, CourseManager
-from .query import TaskQuerySet, SolutionQuerySet
+from .query import CourseAssignmentQuerySet, TaskQuerySet, SolutionQuerySet
 from .mixins import TestModelMixin
 
 
@@ -61,6 +61,9 @@ class Course(models.Model):
 
     generate_certificates_delta = models.DurationField(default=timedelta(days=15))
 
+    # Copy the grading result of an identical, already graded solution instead of grading it again
+    deduplicate_solutions = models.BooleanField(default=False)
+
     objects = CourseManager()
 
     def clean(self):
@@ -130,6 +133,8 @@ class CourseAssignment(models.Model):
 
     hidden = models.BooleanField(default=False)
 
+    objects = CourseAssignmentQuerySet.as_manager()
+
     class Meta:
         unique_together = (('teacher', 'course'), ('student', 'course'))
 
@@ -348,6 +353,7 @@ class Solution(UpdatedAtCreatedAtModelMixin, models.Model):
     SUBMITTED = 4
     MISSING = 5
     SUBMITTED_WITHOUT_GRADING = 6
+    TIMED_OUT = 7
 
     STATUS_CHOICE = (
         (PENDING, 'pending'),
@@ -357,6 +363,7 @@ class Solution(UpdatedAtCreatedAtModelMixin, models.Model):
         (SUBMITTED, 'submitted'),
         (MISSING, 'missing'),
         (SUBMITTED_WITHOUT_GRADING, 'submitted_without_grading'),
+        (TIMED_OUT, 'timed_out'),
     )
 
     task = models.ForeignKey(IncludedTask, related_name='solutions')
@@ -369,6 +376,23 @@ class Solution(UpdatedAtCreatedAtModelMixin, models.Model):
     test_output = JSONField(blank=True, null=True)
     return_code = models.IntegerField(blank=True, null=True)
     file = models.FileField(upload_to="solutions", blank=True, null=True)
+    # When the current grading run was requested, the submission or the start of a regrade
+    grading_requested_at = models.DateTimeField(default=get_now, blank=True, null=True)
+    queued_at = models.DateTimeField(blank=True, null=True)
+    submit_started_at = models.DateTimeField(blank=True, null=True)
+    grader_submitted_at = models.DateTimeField(blank=True, null=True)
+    graded_at = models.DateTimeField(blank=True, null=True)
+    poll_count = models.PositiveIntegerField(default=0)
+    poll_claimed_until = models.DateTimeField(blank=True, null=True)
+    submit_claimed_until = models.DateTimeField(blank=True, null=True)
+    submit_retries = models.PositiveIntegerField(default=0)
+    nonce_failures = models.PositiveIntegerField(default=0)
+    code_hash = models.CharField(max_length=64, blank=True, null=True, db_index=True)
+    deduplicated_from = models.ForeignKey('self',
+                                          on_delete=models.SET_NULL,
+                                          related_name='duplicates',
+                                          blank=True,
+                                          null=True)
 
     objects = SolutionQuerySet.as_manager()
 
@@ -376,9 +400,13 @@ class Solution(UpdatedAtCreatedAtModelMixin, models.Model):
     def verbose_status(self):
         return self.STATUS_CHOICE[self.status][1]
 
+    @property
+    def is_passing(self):
+        return self.task.gradable and self.status == self.OK or \
+            not self.task.gradable and self.status == self.SUBMITTED_WITHOUT_GRADING
+
     def pass_or_fail_status(self):
-        if self.task.gradable and self.status == self.OK or \
-                not self.task.gradable and self.status == self.SUBMITTED_WITHOUT_GRADING:
+        if self.is_passing:
             return "Passed"
         return "Failed"
 
@@ -389,6 +417,59 @@ class Solution(UpdatedAtCreatedAtModelMixin, models.Model):
         ordering = ['-id']
 
 
+class StudentTaskProgress(models.Model):
+    """
+    Denormalized best result of a user for a task.
+    Kept up to date by the Solution save and delete signals and by changes of `IncludedTask.gradable`.
+    Bulk writes of solutions skip the signals and must call `recompute_student_task_progress`.
+    Rebuilt from scratch with `manage.py rebuild_task_progress`.
+    """
+    user = models.ForeignKey(BaseUser, on_delete=models.CASCADE, related_name='task_progress')
+    task = models.ForeignKey(IncludedTask, on_delete=models.CASCADE, related_name='progress')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='task_progress', null=True)
+    passed = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = (('user', 'task'), )
+        index_together = (('course', 'passed'), )
+
+    def __str__(self):
+        return f'Progress of {self.user} for {self.task}'
+
+
+class RegradeJob(UpdatedAtCreatedAtModelMixin, models.Model):
+    """
+    Re-runs the latest solution of every user for a task or a whole course.
+    The solutions are handed to the grader at most GRADER_REGRADE_MAX_IN_FLIGHT at a time.
+    """
+    IN_PROGRESS = 0
+    DONE = 1
+
+    STATUS_CHOICE = (
+        (IN_PROGRESS, 'in_progress'),
+        (DONE, 'done'),
+    )
+
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='regrade_jobs')
+    task = models.ForeignKey(IncludedTask, on_delete=models.CASCADE, related_name='regrade_jobs', null=True, blank=True)
+    created_by = models.ForeignKey(BaseUser,
+                                   on_delete=models.SET_NULL,
+                                   related_name='regrade_jobs',
+                                   null=True,
+                                   blank=True)
+    status = models.SmallIntegerField(choices=STATUS_CHOICE, default=IN_PROGRESS)
+    solutions = models.ManyToManyField(Solution, related_name='regrade_jobs')
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def verbose_status(self):
+        return self.STATUS_CHOICE[self.status][1]
+
+    def __str__(self):
+        return f'Regrade of {self.task or self.course}'
+
+
 class SolutionComment(UpdatedAtCreatedAtModelMixin, models.Model):
     text = models.TextField()
     solution = models.ForeignKey(Solution, related_name='comments')
@@ -1,7 +1,35 @@
-from django.db import models
+from typing import List
+
+from django.db import connections, models
 from django.db.models import Q
 
 
+def get_passing_solution_q_expression():
+    return Q(task__gradable=True, status=2) | Q(task__gradable=False, status=6)
+
+
+class CourseAssignmentQuerySet(models.QuerySet):
+
+    def for_user(self, user):
+        return self.filter(Q(student_id=user.id) | Q(teacher_id=user.id))
+
+    def bulk_add_students(self, *, course_id: int, student_ids: List[int]) -> List[int]:
+        """
+        Assigns all students to the course with a single INSERT ... ON CONFLICT,
+        skipping the ones that are already assigned. Returns the ids of the newly assigned students.
+        """
+        table = self.model._meta.db_table
+
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} (student_id, course_id, hidden) SELECT unnest(%s::integer[]), %s, false '
+                'ON CONFLICT DO NOTHING RETURNING student_id',
+                [student_ids, course_id]
+            )
+
+            return [row[0] for row in cursor.fetchall()]
+
+
 class TaskQuerySet(models.QuerySet):
 
     def get_tasks_for(self, course):
@@ -13,8 +41,19 @@ class SolutionQuerySet(models.QuerySet):
     def get_solutions_for(self, user, task):
         return self.filter(student=user, task=task)
 
-    def get_solved_solutions_for_student_and_course(self, user, course):
-        q_expression = Q(task__gradable=True, status=2) | Q(task__gradable=False, status=6)
+    def passing(self):
+        return self.filter(get_passing_solution_q_expression())
 
+    def get_solved_solutions_for_student_and_course(self, user, course):
         filters = {'task__course': course, 'user': user}
-        return self.filter(q_expression, **filters).order_by('task', '-id').distinct('task')
+        return self.passing().filter(**filters).order_by('task', '-id').distinct('task')
+
+    def get_last_solutions_for(self, user, tasks):
+        """
+        Uses DISTINCT ON (task_id) to fetch the last solution of `user`
+        for every one of `tasks` in a single query.
+        """
+        return self.filter(user=user, task__in=tasks).order_by('task', '-id').distinct('task')
+
+    def get_latest_per_user_and_task(self):
+        return self.order_by('user', 'task', '-id').distinct('user', 'task')
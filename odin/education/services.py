@@ -1,12 +1,15 @@
 from datetime import datetime, timedelta, date
-from typing import Dict, BinaryIO
+from typing import Dict, BinaryIO, Iterable, List, Set, Tuple
 
 import requests
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
-from django.db.models import Q, Sum, When, Case, IntegerField, F
+from django.db.models import Sum, When, Case, IntegerField, F, Count
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
+from odin.common.utils import bulk_update
 from odin.users.models import BaseUser
 
 from .models import (
@@ -27,13 +30,75 @@ from .models import (
     StudentNote,
     Lecture,
     SolutionComment,
+    StudentTaskProgress,
+    RegradeJob,
 )
+from .query import get_passing_solution_q_expression
+
+
+def get_course_membership_cache_key(*, user_id: int) -> str:
+    return f'course_membership_{user_id}'
+
+
+def clear_user_course_membership_cache(*, user_id: int):
+    cache.delete(get_course_membership_cache_key(user_id=user_id))
+
+
+def get_user_course_ids(*, user: BaseUser) -> Set[int]:
+    """
+    Returns the ids of all courses where `user` is a student or a teacher.
+    The set is cached for COURSE_MEMBERSHIP_CACHE_TIMEOUT seconds
+    and cleared whenever one of the user's course assignments changes.
+    """
+    cache_key = get_course_membership_cache_key(user_id=user.id)
+    course_ids = cache.get(cache_key)
+
+    if course_ids is None:
+        course_ids = set(CourseAssignment.objects.for_user(user).values_list('course_id', flat=True))
+        cache.set(cache_key, course_ids, settings.COURSE_MEMBERSHIP_CACHE_TIMEOUT)
+
+    return course_ids
+
+
+def is_user_in_course(*, user: BaseUser, course_id: int) -> bool:
+    if settings.COURSE_MEMBERSHIP_CACHE_TIMEOUT:
+        return int(course_id) in get_user_course_ids(user=user)
+
+    return CourseAssignment.objects.for_user(user).filter(course_id=course_id).exists()
 
 
 def add_student(course: Course, student: Student) -> CourseAssignment:
     return CourseAssignment.objects.create(course=course, student=student)
 
 
+def enroll_students(*, course: Course, users: List[BaseUser]) -> Dict[str, int]:
+    """
+    Makes all `users` students of `course` with a constant number of queries,
+    skipping the ones that already are. As with Student.objects.create_from_user,
+    only the users that become students here are activated.
+    Returns how many students and course assignments were created.
+    """
+    user_ids = [user.id for user in users]
+
+    if not user_ids:
+        return {'created_students': 0, 'enrolled_students': 0}
+
+    with transaction.atomic():
+        created_student_ids = set(Student.objects.bulk_create_from_users(users))
+        BaseUser.objects.filter(id__in=created_student_ids, is_active=False).update(is_active=True)
+        enrolled_student_ids = CourseAssignment.objects.bulk_add_students(course_id=course.id, student_ids=user_ids)
+
+    # The inserts bypass post_save, so clear the caches the signal handlers would
+    for user in users:
+        if user.id in created_student_ids:
+            user.is_active = True
+            user.clear_roles()
+
+    cache.delete_many([get_course_membership_cache_key(user_id=user_id) for user_id in enrolled_student_ids])
+
+    return {'created_students': len(created_student_ids), 'enrolled_students': len(enrolled_student_ids)}
+
+
 def add_teacher(course: Course, teacher: Teacher, hidden: bool=False) -> CourseAssignment:
     return CourseAssignment.objects.create(course=course, teacher=teacher, hidden=hidden)
 
@@ -145,6 +210,11 @@ def create_included_task(
     return included_task
 
 
+def validate_gradable_file_size(*, file: BinaryIO):
+    if file is not None and file.size > settings.GRADER_MAX_FILE_SIZE:
+        raise ValidationError(f"File size cannot exceed {settings.GRADER_MAX_FILE_SIZE} bytes!")
+
+
 def create_test_for_task(
     *,
     existing_test: Test=None,
@@ -158,6 +228,7 @@ def create_test_for_task(
 
     new_test = IncludedTest(task=task)
     if existing_test is None:
+        validate_gradable_file_size(file=file)
         existing_test = Test(
             language=language,
             extra_options=extra_options,
@@ -192,6 +263,9 @@ def create_gradable_solution(
         raise ValidationError("Provide either code or a file, not both!")
     if code is None and file is None:
         raise ValidationError("Provide either code or a file!")
+
+    validate_gradable_file_size(file=file)
+
     if code is not None:
         new_solution = Solution.objects.create(
             task=task,
@@ -210,6 +284,52 @@ def create_gradable_solution(
     return new_solution
 
 
+def create_gradable_solutions(
+    *,
+    user: BaseUser,
+    solutions: List[Dict]
+) -> List[Solution]:
+    """
+    Validates and inserts many code solutions with a single query.
+    Every item of `solutions` is a dict with `task_id` and `code`.
+    """
+
+    if not solutions:
+        raise ValidationError("Provide at least one solution!")
+    if len(solutions) > settings.SOLUTIONS_BULK_SUBMIT_LIMIT:
+        raise ValidationError(f"Cannot submit more than {settings.SOLUTIONS_BULK_SUBMIT_LIMIT} solutions at once!")
+
+    tasks = IncludedTask.objects.in_bulk({solution['task_id'] for solution in solutions})
+    course_ids = get_user_course_ids(user=user)
+
+    new_solutions = []
+    for solution in solutions:
+        task = tasks.get(solution['task_id'])
+
+        if task is None or task.course_id not in course_ids:
+            raise ValidationError(f"Task {solution['task_id']} does not exist in your courses!")
+        if not task.gradable:
+            raise ValidationError(f"Task {task.id} is not gradable!")
+        if not solution.get('code'):
+            raise ValidationError(f"Provide code for task {task.id}!")
+
+        new_solutions.append(
+            Solution(
+                task=task,
+                user=user,
+                code=solution['code'],
+                status=Solution.SUBMITTED_WITHOUT_GRADING
+            )
+        )
+
+    created = Solution.objects.bulk_create(new_solutions)
+
+    # bulk_create does not send post_save
+    recompute_student_task_progress(user_task_pairs=[(user.id, solution.task_id) for solution in created])
+
+    return created
+
+
 def create_non_gradable_solution(
     *,
     task: IncludedTask,
@@ -238,7 +358,7 @@ def calculate_student_valid_solutions_for_course(
     total_tasks = IncludedTask.objects.filter(course=course).count()
     if not total_tasks:
         return 0
-    solved_tasks = Solution.objects.get_solved_solutions_for_student_and_course(user, course).count()
+    solved_tasks = StudentTaskProgress.objects.filter(user=user, course=course, passed=True).count()
 
     ratio = (solved_tasks/total_tasks) * 100
     return f'{ratio:.1f}'
@@ -253,17 +373,157 @@ def get_all_student_solution_statistics(
     course = task.course
     result['total_student_count'] = course.students.count()
 
-    filters = {'solutions__task': task, 'solutions__isnull': False}
-    result['students_with_a_submitted_solution_count'] = course.students.filter(**filters).distinct().count()
-    q_expression = Q(solutions__task__gradable=True, solutions__status=Solution.OK) \
-        | Q(solutions__task__gradable=False, solutions__status=Solution.SUBMITTED_WITHOUT_GRADING)
-    result['students_with_a_passing_solution_count'] = course.students.filter(
-        q_expression, solutions__task=task
-    ).distinct().count()
+    progress = StudentTaskProgress.objects.filter(task=task, user_id__in=course.students.values('id'))
+    result['students_with_a_submitted_solution_count'] = progress.count()
+    result['students_with_a_passing_solution_count'] = progress.filter(passed=True).count()
 
     return result
 
 
+def update_student_task_progress(
+    *,
+    solution: Solution
+) -> StudentTaskProgress:
+    """
+    Applies a single solution change to the user's progress for the solution's task.
+    Only a solution that stops passing requires looking at the other solutions for the task.
+    """
+
+    passed = solution.is_passing
+
+    progress, created = StudentTaskProgress.objects.get_or_create(
+        user_id=solution.user_id,
+        task_id=solution.task_id,
+        defaults={'course_id': solution.task.course_id, 'passed': passed}
+    )
+
+    if created or progress.passed == passed:
+        return progress
+
+    if not passed:
+        passed = Solution.objects.passing().filter(user_id=solution.user_id, task_id=solution.task_id).exists()
+
+    StudentTaskProgress.objects.filter(id=progress.id).update(passed=passed)
+    progress.passed = passed
+
+    return progress
+
+
+@transaction.atomic
+def recompute_student_task_progress(
+    *,
+    user_task_pairs: Iterable[Tuple[int, int]]
+) -> int:
+    """
+    Recomputes the progress of many (user id, task id) pairs with a constant number of queries.
+    Pairs that have no solutions left lose their progress row.
+
+    `update_student_task_progress` is called from the Solution signals, so code that writes
+    solutions with QuerySet.update, bulk_create or bulk_update must call this service itself.
+    Returns the number of progress rows that were created, updated or deleted.
+    """
+
+    pairs = set(user_task_pairs)
+
+    if not pairs:
+        return 0
+
+    user_ids = {user_id for user_id, _ in pairs}
+    task_ids = {task_id for _, task_id in pairs}
+
+    rows = Solution.objects.filter(user_id__in=user_ids, task_id__in=task_ids).order_by().values(
+        'user', 'task', 'task__course'
+    ).annotate(
+        passing_count=Count(Case(When(get_passing_solution_q_expression(), then=1), output_field=IntegerField()))
+    )
+    results = {
+        (row['user'], row['task']): (row['task__course'], row['passing_count'] > 0)
+        for row in rows
+        if (row['user'], row['task']) in pairs
+    }
+
+    existing = {
+        (progress.user_id, progress.task_id): progress
+        for progress in StudentTaskProgress.objects.filter(user_id__in=user_ids, task_id__in=task_ids)
+        if (progress.user_id, progress.task_id) in pairs
+    }
+
+    removed = [progress.id for pair, progress in existing.items() if pair not in results]
+    changed = []
+    created = []
+
+    for pair, (course_id, passed) in results.items():
+        progress = existing.get(pair)
+
+        if progress is None:
+            created.append(StudentTaskProgress(user_id=pair[0], task_id=pair[1], course_id=course_id, passed=passed))
+        elif progress.passed != passed:
+            progress.passed = passed
+            changed.append(progress)
+
+    if removed:
+        StudentTaskProgress.objects.filter(id__in=removed).delete()
+
+    bulk_update(objs=changed, fields=['passed'])
+    StudentTaskProgress.objects.bulk_create(created, batch_size=1000)
+
+    return len(removed) + len(changed) + len(created)
+
+
+def recompute_task_progress(
+    *,
+    task: IncludedTask
+) -> int:
+    """
+    Recomputes the progress of every user with a solution for `task`,
+    e.g. after its `gradable` flag changes which solutions are passing.
+    """
+
+    user_ids = set(StudentTaskProgress.objects.filter(task=task).values_list('user_id', flat=True))
+    user_ids.update(Solution.objects.filter(task=task).order_by().values_list('user_id', flat=True).distinct())
+
+    return recompute_student_task_progress(user_task_pairs=[(user_id, task.id) for user_id in user_ids])
+
+
+@transaction.atomic
+def rebuild_student_task_progress(
+    *,
+    course: Course=None
+) -> int:
+    """
+    Recomputes the progress table from scratch, for a single course or for all of them.
+    Returns the number of progress rows created.
+    """
+
+    solutions = Solution.objects.all()
+    progress = StudentTaskProgress.objects.all()
+
+    if course is not None:
+        solutions = solutions.filter(task__course=course)
+        progress = progress.filter(task__course=course)
+
+    rows = solutions.order_by().values('user', 'task', 'task__course').annotate(
+        passing_count=Count(Case(When(get_passing_solution_q_expression(), then=1), output_field=IntegerField()))
+    )
+
+    progress.delete()
+
+    created = StudentTaskProgress.objects.bulk_create(
+        [
+            StudentTaskProgress(
+                user_id=row['user'],
+                task_id=row['task'],
+                course_id=row['task__course'],
+                passed=row['passing_count'] > 0
+            )
+            for row in rows
+        ],
+        batch_size=1000
+    )
+
+    return len(created)
+
+
 def create_student_note(
     *,
     author: Teacher,
@@ -345,15 +605,17 @@ def get_gradable_tasks_for_course(
     user: BaseUser
 ):
 
-    tasks = []
+    tasks = list(
+        course.included_tasks.filter(gradable=True).select_related('week').order_by('week__number', 'task__id')
+    )
 
-    for task in course.included_tasks.order_by('week__number', 'task__id'):
-        if task.gradable:
-            task.last_solution = get_last_solution_for_task(
-                task=task,
-                user=user
-            )
-            tasks.append(task)
+    last_solutions = {
+        solution.task_id: solution
+        for solution in Solution.objects.get_last_solutions_for(user=user, tasks=tasks)
+    }
+
+    for task in tasks:
+        task.last_solution = last_solutions.get(task.id)
 
     return tasks
 
@@ -410,38 +672,83 @@ def create_included_task_with_test(
     return included_task
 
 
-def get_user_solution_summary(
-    user: BaseUser
-):
-
-    results = Solution.objects.aggregate(
-        OK=Sum(
+def _get_solution_summary_aggregates() -> Dict:
+    return {
+        'OK': Sum(
             Case(
-                When(Q(status__in=['2']) & Q(user=user), then=1),
+                When(status__in=['2'], then=1),
                 output_field=IntegerField()
             )
         ),
-        TOTAL=Sum(
+        'TOTAL': Sum(
             Case(
-                When(Q(status__range=(0, 6)) & Q(user=user), then=1),
+                When(status__range=(0, 6), then=1),
                 output_field=IntegerField()
             )
-        )
-    )
+        ),
+    }
+
 
-    completed_tasks = user.solutions.filter(status=2).annotate(
+def _get_completed_tasks(solutions):
+    return solutions.filter(status=2).annotate(
         name=F('task__name'),
         task_id=F('task'),
         solution_id=F('id'),
         solution_code=F('code'),
         test_result=F('test_output')
-    ).values('name', 'task_id', 'solution_code', 'test_result', 'solution_id')
+    )
+
+
+def get_user_solution_summary(
+    user: BaseUser
+):
+
+    results = Solution.objects.filter(user=user).aggregate(**_get_solution_summary_aggregates())
+
+    completed_tasks = _get_completed_tasks(user.solutions.all()).values(
+        'name', 'task_id', 'solution_code', 'test_result', 'solution_id'
+    )
 
     results['completed_tasks'] = completed_tasks
 
     return results
 
 
+def get_solution_summaries_for_users(
+    *,
+    users: List[BaseUser]
+) -> Dict[int, Dict]:
+    """
+    Builds the same summary as `get_user_solution_summary` for all `users` with two grouped queries.
+    Returns a map from user id to summary.
+    """
+
+    user_ids = [user.id for user in users]
+
+    summaries = {
+        user_id: {'OK': None, 'TOTAL': None, 'completed_tasks': []}
+        for user_id in user_ids
+    }
+
+    counts = Solution.objects.filter(
+        user_id__in=user_ids
+    ).order_by().values('user').annotate(**_get_solution_summary_aggregates())
+
+    for row in counts:
+        summaries[row['user']]['OK'] = row['OK']
+        summaries[row['user']]['TOTAL'] = row['TOTAL']
+
+    completed_tasks = _get_completed_tasks(Solution.objects.filter(user_id__in=user_ids)).values(
+        'user', 'name', 'task_id', 'solution_code', 'test_result', 'solution_id'
+    )
+
+    for completed_task in completed_tasks:
+        user_id = completed_task.pop('user')
+        summaries[user_id]['completed_tasks'].append(completed_task)
+
+    return summaries
+
+
 def get_user_avatar_url(
     user: BaseUser
 ):
@@ -450,3 +757,118 @@ def get_user_avatar_url(
         return None
 
     return str(user.profile.full_image.url)
+
+
+@transaction.atomic
+def create_regrade_job(
+    *,
+    course: Course,
+    task: IncludedTask=None,
+    created_by: BaseUser=None
+) -> RegradeJob:
+    """
+    Queues the latest solution of every user for `task` or for all gradable tasks of `course`.
+    The queued solutions are handed to the grader by the `dispatch_regrade_job` task.
+    """
+
+    from odin.education.tasks import dispatch_regrade_job
+
+    if task is not None and task.course_id != course.id:
+        raise ValidationError("Task does not belong to this course!")
+
+    tasks = course.included_tasks.filter(gradable=True)
+
+    if task is not None:
+        tasks = tasks.filter(id=task.id)
+
+    latest_solution_ids = Solution.objects.filter(
+        task__in=tasks
+    ).get_latest_per_user_and_task().values_list('id', flat=True)
+
+    # Solutions still waiting on the grader are left to finish their current run
+    solutions = list(
+        Solution.objects.filter(
+            id__in=list(latest_solution_ids)
+        ).exclude(
+            status__in=[Solution.PENDING, Solution.RUNNING]
+        ).values_list('id', 'user_id', 'task_id')
+    )
+    solution_ids = [solution_id for solution_id, _, _ in solutions]
+
+    if not solution_ids:
+        raise ValidationError("There are no solutions to regrade!")
+
+    job = RegradeJob.objects.create(course=course, task=task, created_by=created_by)
+    job.solutions.add(*solution_ids)
+
+    # The stage timings and counters of the previous run would skew the grading metrics
+    Solution.objects.filter(id__in=solution_ids).update(
+        status=Solution.SUBMITTED_WITHOUT_GRADING,
+        grading_requested_at=timezone.now(),
+        # Otherwise the batch sweeper and the grader callback still match the previous grader run
+        build_id=None,
+        check_status_location='',
+        queued_at=None,
+        submit_started_at=None,
+        grader_submitted_at=None,
+        graded_at=None,
+        poll_count=0,
+        submit_retries=0,
+        nonce_failures=0,
+    )
+
+    # The update skips post_save, so the old results stop counting right away
+    recompute_student_task_progress(user_task_pairs=[(user_id, task_id) for _, user_id, task_id in solutions])
+
+    transaction.on_commit(lambda: dispatch_regrade_job.delay(job.id))
+
+    return job
+
+
+def get_regrade_job_progress(*, job: RegradeJob) -> Dict[str, int]:
+    progress = job.solutions.aggregate(
+        total=Count('id'),
+        queued=Count(Case(When(status=Solution.SUBMITTED_WITHOUT_GRADING, then=1))),
+        grading=Count(Case(When(status__in=[Solution.PENDING, Solution.RUNNING], then=1))),
+    )
+    progress['done'] = progress['total'] - progress['queued'] - progress['grading']
+
+    return progress
+
+
+def dispatch_queued_regrade_solutions(*, job: RegradeJob) -> Dict[str, int]:
+    """
+    Tops up the solutions being graded to GRADER_REGRADE_MAX_IN_FLIGHT
+    and finishes the job once nothing is queued or being graded.
+    """
+
+    from odin.grading.services import start_bulk_grader_communication
+
+    progress = get_regrade_job_progress(job=job)
+
+    if progress['queued'] == 0 and progress['grading'] == 0:
+        job.status = RegradeJob.DONE
+        job.finished_at = timezone.now()
+        job.save()
+
+        return progress
+
+    free_slots = settings.GRADER_REGRADE_MAX_IN_FLIGHT - progress['grading']
+
+    if free_slots <= 0 or progress['queued'] == 0:
+        return progress
+
+    with transaction.atomic():
+        solution_ids = list(
+            job.solutions.filter(
+                status=Solution.SUBMITTED_WITHOUT_GRADING
+            ).order_by('id').values_list('id', flat=True)[:free_slots]
+        )
+        Solution.objects.filter(id__in=solution_ids).update(status=Solution.PENDING)
+
+        start_bulk_grader_communication(solution_ids=solution_ids, solution_model='education.Solution')
+
+    progress['queued'] -= len(solution_ids)
+    progress['grading'] += len(solution_ids)
+
+    return progress
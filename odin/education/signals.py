@@ -1,8 +1,16 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 
-from .models import Course, Teacher
-from .services import add_teacher
+from odin.grading.signals import solutions_graded
+
+from .models import Course, CourseAssignment, Student, Teacher, Solution, IncludedTask
+from .services import (
+    add_teacher,
+    clear_user_course_membership_cache,
+    update_student_task_progress,
+    recompute_student_task_progress,
+    recompute_task_progress,
+)
 
 
 @receiver(post_save, sender=Course)
@@ -11,3 +19,56 @@ def populate_course_teachers_with_superusers(sender, instance, created, **kwargs
         superusers = Teacher.objects.filter(is_superuser=True)
         for user in superusers:
             add_teacher(instance, user, hidden=True)
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_save, sender=Teacher)
+@receiver(post_delete, sender=Student)
+@receiver(post_delete, sender=Teacher)
+def clear_user_roles_on_role_change(sender, instance, **kwargs):
+    instance.clear_roles()
+
+
+@receiver(post_save, sender=CourseAssignment)
+@receiver(post_delete, sender=CourseAssignment)
+def clear_course_membership_on_assignment_change(sender, instance, **kwargs):
+    for user_id in (instance.student_id, instance.teacher_id):
+        if user_id is not None:
+            clear_user_course_membership_cache(user_id=user_id)
+
+
+# Only single Solution saves and deletes reach these handlers.
+# Code that writes solutions with QuerySet.update, bulk_create or bulk_update
+# must call `recompute_student_task_progress` for the affected (user, task) pairs,
+# or send `solutions_graded` when it lives outside the education app.
+@receiver(post_save, sender=Solution)
+def update_student_task_progress_on_solution_save(sender, instance, **kwargs):
+    update_student_task_progress(solution=instance)
+
+
+@receiver(solutions_graded, sender=Solution)
+def update_student_task_progress_on_solutions_graded(sender, solutions, **kwargs):
+    recompute_student_task_progress(user_task_pairs=[(solution.user_id, solution.task_id) for solution in solutions])
+
+
+@receiver(post_delete, sender=Solution)
+def update_student_task_progress_on_solution_delete(sender, instance, **kwargs):
+    recompute_student_task_progress(user_task_pairs=[(instance.user_id, instance.task_id)])
+
+
+@receiver(pre_save, sender=IncludedTask)
+def remember_included_task_gradable_change(sender, instance, **kwargs):
+    if instance.pk is None:
+        instance._gradable_changed = False
+        return
+
+    previous = IncludedTask.objects.filter(pk=instance.pk).values_list('gradable', flat=True).first()
+    instance._gradable_changed = previous is not None and previous != instance.gradable
+
+
+@receiver(post_save, sender=IncludedTask)
+def recompute_task_progress_on_gradable_change(sender, instance, **kwargs):
+    # `gradable` decides which solution statuses are passing
+    if getattr(instance, '_gradable_changed', False):
+        recompute_task_progress(task=instance)
+        instance._gradable_changed = False
@@ -0,0 +1,20 @@
+from __future__ import absolute_import, unicode_literals
+from celery import shared_task
+
+from django.conf import settings
+
+from .models import RegradeJob
+from .services import dispatch_queued_regrade_solutions
+
+
+@shared_task
+def dispatch_regrade_job(job_id):
+    job = RegradeJob.objects.get(id=job_id)
+
+    if job.status == RegradeJob.DONE:
+        return
+
+    dispatch_queued_regrade_solutions(job=job)
+
+    if job.status != RegradeJob.DONE:
+        dispatch_regrade_job.apply_async(args=(job_id,), countdown=settings.GRADER_REGRADE_DISPATCH_INTERVAL)
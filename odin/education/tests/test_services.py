@@ -2,9 +2,11 @@ from test_plus import TestCase
 
 from dateutil import parser
 from datetime import timedelta
+from unittest.mock import patch
 
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
 from django.utils import timezone
 from django.db.models import Q
 
@@ -16,6 +18,12 @@ from ..services import (
     create_gradable_solution,
     create_non_gradable_solution,
     create_lecture,
+    rebuild_student_task_progress,
+    recompute_student_task_progress,
+    create_regrade_job,
+    dispatch_queued_regrade_solutions,
+    enroll_students,
+    add_student,
 )
 from ..models import (
     Course,
@@ -26,7 +34,11 @@ from ..models import (
     IncludedTask,
     Solution,
     IncludedTest,
-    Lecture
+    StudentTaskProgress,
+    Lecture,
+    RegradeJob,
+    Student,
+    CourseAssignment,
 )
 from ..factories import (
     CourseFactory,
@@ -35,8 +47,11 @@ from ..factories import (
     ProgrammingLanguageFactory,
     StudentFactory,
     BaseUserFactory,
+    SolutionFactory,
 )
 
+from odin.users.models import BaseUser
+
 from odin.common.faker import faker
 
 
@@ -270,6 +285,13 @@ class TestCreateGradableSolution(TestCase):
         self.assertIsNone(solution.code)
         self.assertIsNone(solution.url)
 
+    @override_settings(GRADER_MAX_FILE_SIZE=10)
+    def test_create_gradable_solution_raises_validation_error_when_file_is_too_large(self):
+        with self.assertRaises(ValidationError):
+            create_gradable_solution(task=self.task,
+                                     user=self.user,
+                                     file=SimpleUploadedFile('solution.jar', b'x' * 11))
+
 
 class TestCreateNonGradableSolution(TestCase):
     def setUp(self):
@@ -314,3 +336,235 @@ class TestCreateLecture(TestCase):
         invalid_date = self.course.end_date + timezone.timedelta(days=faker.pyint())
         with self.assertRaises(ValidationError):
             create_lecture(date=invalid_date, course=self.course)
+
+
+class TestStudentTaskProgress(TestCase):
+    def setUp(self):
+        self.course = CourseFactory()
+        self.week = WeekFactory(course=self.course)
+        self.task = IncludedTaskFactory(course=self.course, week=self.week, gradable=True)
+        self.user = BaseUserFactory()
+
+    def get_progress(self):
+        return StudentTaskProgress.objects.get(user=self.user, task=self.task)
+
+    def test_saving_a_solution_creates_progress_for_the_task(self):
+        SolutionFactory(user=self.user, task=self.task, status=Solution.PENDING)
+
+        progress = self.get_progress()
+
+        self.assertEqual(self.course, progress.course)
+        self.assertFalse(progress.passed)
+
+    def test_progress_is_passed_once_a_solution_status_becomes_ok(self):
+        solution = SolutionFactory(user=self.user, task=self.task, status=Solution.PENDING)
+
+        solution.status = Solution.OK
+        solution.save()
+
+        self.assertTrue(self.get_progress().passed)
+
+    def test_failing_solution_after_passing_one_keeps_progress_passed(self):
+        SolutionFactory(user=self.user, task=self.task, status=Solution.OK)
+        SolutionFactory(user=self.user, task=self.task, status=Solution.NOT_OK)
+
+        self.assertTrue(self.get_progress().passed)
+
+    def test_progress_is_not_passed_when_the_only_passing_solution_fails(self):
+        solution = SolutionFactory(user=self.user, task=self.task, status=Solution.OK)
+
+        solution.status = Solution.NOT_OK
+        solution.save()
+
+        self.assertFalse(self.get_progress().passed)
+
+    def test_rebuild_recreates_progress_from_solutions(self):
+        SolutionFactory(user=self.user, task=self.task, status=Solution.NOT_OK)
+        SolutionFactory(user=self.user, task=self.task, status=Solution.OK)
+        StudentTaskProgress.objects.all().delete()
+
+        created = rebuild_student_task_progress(course=self.course)
+
+        self.assertEqual(1, created)
+        self.assertTrue(self.get_progress().passed)
+
+    def test_deleting_the_passing_solution_updates_progress(self):
+        SolutionFactory(user=self.user, task=self.task, status=Solution.NOT_OK)
+        solution = SolutionFactory(user=self.user, task=self.task, status=Solution.OK)
+
+        solution.delete()
+
+        self.assertFalse(self.get_progress().passed)
+
+    def test_deleting_the_last_solution_removes_progress(self):
+        solution = SolutionFactory(user=self.user, task=self.task, status=Solution.OK)
+
+        solution.delete()
+
+        self.assertFalse(StudentTaskProgress.objects.filter(user=self.user, task=self.task).exists())
+
+    def test_changing_gradable_recomputes_progress(self):
+        SolutionFactory(user=self.user, task=self.task, status=Solution.SUBMITTED_WITHOUT_GRADING)
+        self.assertFalse(self.get_progress().passed)
+
+        self.task.gradable = False
+        self.task.save()
+
+        self.assertTrue(self.get_progress().passed)
+
+    def test_recompute_after_queryset_update(self):
+        solution = SolutionFactory(user=self.user, task=self.task, status=Solution.NOT_OK)
+        Solution.objects.filter(id=solution.id).update(status=Solution.OK)
+
+        changed = recompute_student_task_progress(user_task_pairs=[(self.user.id, self.task.id)])
+
+        self.assertEqual(1, changed)
+        self.assertTrue(self.get_progress().passed)
+
+
+class TestRegradeJob(TestCase):
+    def setUp(self):
+        self.course = CourseFactory()
+        self.week = WeekFactory(course=self.course)
+        self.task = IncludedTaskFactory(course=self.course, week=self.week, gradable=True)
+
+    def create_solutions(self, users_count):
+        latest_solutions = []
+
+        for _ in range(users_count):
+            user = BaseUserFactory()
+            SolutionFactory(user=user, task=self.task, status=Solution.NOT_OK)
+            latest_solutions.append(SolutionFactory(user=user, task=self.task, status=Solution.OK))
+
+        return latest_solutions
+
+    def test_create_regrade_job_queues_only_the_latest_solution_per_user_and_task(self):
+        latest_solutions = self.create_solutions(3)
+
+        job = create_regrade_job(course=self.course, task=self.task)
+
+        self.assertEqual({solution.id for solution in latest_solutions},
+                         set(job.solutions.values_list('id', flat=True)))
+        self.assertFalse(job.solutions.exclude(status=Solution.SUBMITTED_WITHOUT_GRADING).exists())
+
+    def test_create_regrade_job_resets_the_timings_of_the_previous_run(self):
+        solution = self.create_solutions(1)[0]
+        Solution.objects.filter(id=solution.id).update(
+            queued_at=timezone.now(),
+            graded_at=timezone.now(),
+            poll_count=3
+        )
+        regrade_started_at = timezone.now()
+
+        create_regrade_job(course=self.course, task=self.task)
+
+        solution.refresh_from_db()
+        self.assertIsNone(solution.queued_at)
+        self.assertIsNone(solution.graded_at)
+        self.assertEqual(0, solution.poll_count)
+        self.assertGreaterEqual(solution.grading_requested_at, regrade_started_at)
+
+    @patch('odin.grading.tasks.get_grader_ready_data')
+    @patch('odin.grading.tasks.GraderClient')
+    def test_regraded_solution_is_submitted_to_the_grader_again(self, grader_client, get_grader_ready_data):
+        from odin.grading.tasks import submit_solution
+
+        create_test_for_task(task=self.task, language=ProgrammingLanguageFactory(), code=faker.text())
+        solution = self.create_solutions(1)[0]
+        Solution.objects.filter(id=solution.id).update(
+            build_id=1,
+            check_status_location='http://grader/check_result/1/',
+            grader_submitted_at=timezone.now(),
+            graded_at=timezone.now()
+        )
+        job = create_regrade_job(course=self.course, task=self.task)
+        dispatch_queued_regrade_solutions(job=job)
+
+        submit_solution.apply(args=(solution.id, 'education.Solution'))
+
+        solution.refresh_from_db()
+        self.assertIsNone(solution.build_id)
+        self.assertEqual('', solution.check_status_location)
+        grader_client.return_value.submit_request_to_grader.assert_called_once()
+
+    def test_create_regrade_job_leaves_out_solutions_waiting_on_the_grader(self):
+        latest_solutions = self.create_solutions(2)
+        in_flight = SolutionFactory(user=latest_solutions[0].user, task=self.task, status=Solution.PENDING)
+
+        job = create_regrade_job(course=self.course, task=self.task)
+
+        in_flight.refresh_from_db()
+        self.assertEqual({latest_solutions[1].id}, set(job.solutions.values_list('id', flat=True)))
+        self.assertEqual(Solution.PENDING, in_flight.status)
+
+    def test_create_regrade_job_recomputes_progress_of_the_queued_solutions(self):
+        solution = self.create_solutions(1)[0]
+
+        create_regrade_job(course=self.course, task=self.task)
+
+        self.assertFalse(StudentTaskProgress.objects.get(user=solution.user, task=self.task).passed)
+
+    def test_create_regrade_job_raises_validation_error_when_there_is_nothing_to_regrade(self):
+        with self.assertRaises(ValidationError):
+            create_regrade_job(course=self.course)
+
+    @override_settings(GRADER_REGRADE_MAX_IN_FLIGHT=2)
+    def test_dispatch_keeps_the_number_of_solutions_being_graded_under_the_ceiling(self):
+        self.create_solutions(3)
+        job = create_regrade_job(course=self.course)
+
+        progress = dispatch_queued_regrade_solutions(job=job)
+        self.assertEqual({'total': 3, 'queued': 1, 'grading': 2, 'done': 0}, progress)
+
+        progress = dispatch_queued_regrade_solutions(job=job)
+        self.assertEqual(2, progress['grading'])
+
+        job.solutions.update(status=Solution.OK)
+        dispatch_queued_regrade_solutions(job=job)
+
+        self.assertEqual(RegradeJob.DONE, job.status)
+        self.assertIsNotNone(job.finished_at)
+
+
+class TestEnrollStudents(TestCase):
+    def setUp(self):
+        self.course = CourseFactory()
+
+    def test_users_become_active_students_of_the_course(self):
+        users = BaseUserFactory.create_batch(3, is_active=False)
+
+        result = enroll_students(course=self.course, users=users)
+
+        self.assertEqual({'created_students': 3, 'enrolled_students': 3}, result)
+        self.assertEqual(3, Student.objects.filter(id__in=[user.id for user in users], is_active=True).count())
+        assignments = CourseAssignment.objects.filter(course=self.course, student_id__in=[user.id for user in users])
+        self.assertEqual(3, assignments.count())
+        self.assertTrue(all(user.is_student() for user in users))
+
+    def test_existing_students_and_assignments_are_skipped(self):
+        student = StudentFactory()
+        enrolled_student = StudentFactory()
+        add_student(course=self.course, student=enrolled_student)
+        user = BaseUserFactory()
+
+        result = enroll_students(course=self.course, users=[student.user, enrolled_student.user, user])
+
+        self.assertEqual({'created_students': 1, 'enrolled_students': 2}, result)
+        self.assertEqual(3, CourseAssignment.objects.filter(course=self.course, student__isnull=False).count())
+
+    def test_only_users_that_become_students_are_activated(self):
+        student = StudentFactory()
+        BaseUser.objects.filter(id=student.id).update(is_active=False)
+        user = BaseUserFactory(is_active=False)
+
+        enroll_students(course=self.course, users=[BaseUser.objects.get(id=student.id), user])
+
+        self.assertFalse(BaseUser.objects.get(id=student.id).is_active)
+        self.assertTrue(BaseUser.objects.get(id=user.id).is_active)
+
+    def test_query_count_does_not_grow_with_user_count(self):
+        users = BaseUserFactory.create_batch(20)
+
+        # student insert, update, assignment insert and the savepoint around them
+        with self.assertNumQueries(5):
+            enroll_students(course=self.course, users=users)
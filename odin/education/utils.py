@@ -1,9 +1,9 @@
 from typing import Dict, Set
 
-from django.db.models import Q
+from django.db.models import Count
 from django.conf import settings
 
-from .models import Solution, Course, Week
+from .models import Solution, Course, Week, StudentTaskProgress
 
 from odin.users.models import BaseUser
 
@@ -75,17 +75,8 @@ def map_lecture_dates_to_week_days(course: Course) -> (Set, Dict):
 
 
 def get_all_solved_student_solution_count_for_course(course: Course) -> Dict:
-    q_expression = Q(task__gradable=True, status=2) | Q(task__gradable=False, status=6)
-    all_passed_solutions = Solution.objects.filter(
-        q_expression, task__course=course
-    ).order_by('task').distinct('task').prefetch_related('user')
-
-    students_passed_solutions_count = {}
-    for solution in all_passed_solutions:
-        solutions_for_student = students_passed_solutions_count.get(solution.user.email)
-        if solutions_for_student:
-            students_passed_solutions_count[solution.user.email] += 1
-        else:
-            students_passed_solutions_count[solution.user.email] = 1
+    passed_tasks = StudentTaskProgress.objects.filter(
+        course=course, passed=True
+    ).order_by().values('user__email').annotate(count=Count('id'))
 
-    return students_passed_solutions_count
+    return {row['user__email']: row['count'] for row in passed_tasks}
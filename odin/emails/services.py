@@ -1,12 +1,13 @@
 import logging
 
 from django.conf import settings
-from django.core.mail import send_mail as django_send_mail
+from django.core.mail import send_mail as django_send_mail, send_mass_mail as django_send_mass_mail
 
-from .utils import serialize_context, filter_kwargs
+from .utils import serialize_context, filter_kwargs, get_recipient_batches
 from .tasks import (
     send_mail as celery_send_mail,
-    send_template_mail as celery_send_template_mail
+    send_template_mail as celery_send_template_mail,
+    send_batch_template_mail as celery_send_batch_template_mail
 )
 
 
@@ -88,3 +89,31 @@ def _send_django_mail(*,
         from_mail = settings.DEFAULT_FROM_EMAIL
 
     django_send_mail(subject, body, from_mail, recipients)
+
+
+def send_batch_template_mail(*,
+                             template_name,
+                             recipient_contexts,
+                             from_mail=None):
+    """
+    Sends the template to many recipients, each with its own context.
+    `recipient_contexts` is a list of (recipient, context) pairs.
+    With Mandrill, every batch of MANDRILL_BATCH_SIZE recipients is a single API call.
+    """
+    recipient_contexts = [(mail, serialize_context(context)) for mail, context in recipient_contexts]
+
+    if from_mail is None:
+        from_mail = settings.DEFAULT_FROM_EMAIL
+
+    if settings.USE_DJANGO_EMAIL_BACKEND:
+        subject = 'Subject was not provided. Possibly sending a template email.'
+        messages = [(subject, str(context), from_mail, [mail]) for mail, context in recipient_contexts]
+
+        return django_send_mass_mail(messages)
+
+    return [
+        celery_send_batch_template_mail.delay(template_name=template_name,
+                                              recipient_contexts=batch,
+                                              from_mail=from_mail)
+        for batch in get_recipient_batches(recipient_contexts, settings.MANDRILL_BATCH_SIZE)
+    ]
@@ -8,7 +8,7 @@ from celery.exceptions import SoftTimeLimitExceeded
 
 from django.conf import settings
 
-from .utils import get_mandrill_api_key, build_message
+from .utils import get_mandrill_api_key, build_message, build_batch_message
 
 
 logger = get_task_logger(__name__)
@@ -52,3 +52,21 @@ def send_template_mail(self, template_name, recipients, context, **kwargs):
     except mandrill.Error as e:
         logger.exception('A mandrill error occurred: %s - %s' % (e.__class__, e))
         self.retry(exc=e)
+
+
+@shared_task(bind=True, max_retries=settings.CELERY_TASK_MAX_RETRIES)
+def send_batch_template_mail(self, template_name, recipient_contexts, **kwargs):
+    api_key = get_mandrill_api_key()
+    client = mandrill.Mandrill(api_key)
+
+    message = build_batch_message(recipient_contexts)
+
+    try:
+        result = client.messages.send_template(template_name, [], message)
+        return result
+    except SoftTimeLimitExceeded as e:
+        logger.exception('Soft time limit exceeded when sending email')
+        self.retry(exc=e)
+    except mandrill.Error as e:
+        logger.exception('A mandrill error occurred: %s - %s' % (e.__class__, e))
+        self.retry(exc=e)
@@ -0,0 +1,29 @@
+from test_plus import TestCase
+
+from ..utils import build_batch_message, get_recipient_batches
+
+
+class TestRecipientBatches(TestCase):
+    def test_recipients_are_split_in_batches_of_batch_size(self):
+        recipient_contexts = [(f'user{i}@example.com', {'i': str(i)}) for i in range(5)]
+
+        batches = get_recipient_batches(recipient_contexts, 2)
+
+        self.assertEqual([2, 2, 1], [len(batch) for batch in batches])
+        self.assertEqual(recipient_contexts, [item for batch in batches for item in batch])
+
+    def test_recipient_appears_at_most_once_per_batch(self):
+        recipient_contexts = [('a@example.com', {}), ('a@example.com', {}), ('b@example.com', {})]
+
+        batches = get_recipient_batches(recipient_contexts, 10)
+
+        self.assertEqual([['a@example.com', 'b@example.com'], ['a@example.com']],
+                         [[mail for mail, _ in batch] for batch in batches])
+
+    def test_batch_message_has_merge_vars_per_recipient(self):
+        message = build_batch_message([('a@example.com', {'name': 'A'}), ('b@example.com', {'name': 'B'})])
+
+        self.assertFalse(message['preserve_recipients'])
+        self.assertEqual([{'email': 'a@example.com'}, {'email': 'b@example.com'}], message['to'])
+        self.assertEqual({'rcpt': 'b@example.com', 'vars': [{'name': 'name', 'content': 'B'}]},
+                         message['merge_vars'][1])
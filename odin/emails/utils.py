@@ -50,6 +50,48 @@ def build_message(recipients, context):
     return message
 
 
+def build_batch_message(recipient_contexts):
+    """
+    Builds one message for many recipients, each with its own merge vars.
+    `preserve_recipients` is off so that no recipient sees the others.
+    """
+    message = {
+        'to': [],
+        'merge_vars': [],
+        'preserve_recipients': False,
+    }
+
+    for mail, context in recipient_contexts:
+        message['to'].append({'email': mail})
+        message['merge_vars'].append({
+            'rcpt': mail,
+            'vars': [{'name': k, 'content': v} for k, v in context.items()]
+        })
+
+    return message
+
+
+def get_recipient_batches(recipient_contexts, batch_size):
+    """
+    Splits (recipient, context) pairs into batches of at most `batch_size`.
+    Merge vars are keyed by recipient, so a recipient appears at most once per batch.
+    """
+    batches = []
+
+    for mail, context in recipient_contexts:
+        for batch, recipients in batches:
+            if len(batch) < batch_size and mail not in recipients:
+                break
+        else:
+            batch, recipients = [], set()
+            batches.append((batch, recipients))
+
+        batch.append((mail, context))
+        recipients.add(mail)
+
+    return [batch for batch, _ in batches]
+
+
 def serialize_context(context):
     if context is None:
         context = {}
@@ -0,0 +1,66 @@
+import hmac
+
+from django.apps import apps
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils import timezone
+
+from rest_framework import serializers, status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+
+from odin.apis.mixins import ServiceExceptionHandlerMixin
+
+from .metrics import render_prometheus_metrics
+from .permissions import IsGraderPermission
+from .services import is_waiting_for_grader, save_grading_result
+
+
+class GraderCallbackApi(ServiceExceptionHandlerMixin, APIView):
+    authentication_classes = ()
+    permission_classes = (IsGraderPermission, )
+
+    class Serializer(serializers.Serializer):
+        run_id = serializers.IntegerField()
+        result_status = serializers.ChoiceField(choices=('ok', 'not_ok'))
+        output = serializers.JSONField()
+
+    def post(self, request):
+        serializer = self.Serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        solution_model = apps.get_model(settings.GRADER_SOLUTION_MODEL)
+        solution = solution_model.objects.filter(build_id=data['run_id']).order_by('-id').first()
+
+        if solution is None:
+            raise Http404
+
+        if is_waiting_for_grader(solution=solution):
+            save_grading_result(
+                solution=solution,
+                result_status=data['result_status'],
+                output=data['output']
+            )
+
+        return Response(status=status.HTTP_202_ACCEPTED)
+
+
+class GradingMetricsApi(APIView):
+    """
+    Prometheus scrape target for the solutions graded in the last GRADER_METRICS_WINDOW seconds.
+    Disabled unless GRADER_METRICS_TOKEN is set; scrapers send it as a bearer token.
+    """
+    authentication_classes = ()
+    permission_classes = ()
+
+    def get(self, request):
+        token = settings.GRADER_METRICS_TOKEN
+
+        if not token or not hmac.compare_digest(request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {token}'):
+            raise Http404
+
+        since = timezone.now() - timezone.timedelta(seconds=settings.GRADER_METRICS_WINDOW)
+        metrics = render_prometheus_metrics(solution_model=apps.get_model(settings.GRADER_SOLUTION_MODEL), since=since)
+
+        return HttpResponse(metrics, content_type='text/plain; version=0.0.4')
@@ -0,0 +1,412 @@
+import asyncio
+import functools
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import aiohttp
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Model, Q
+from django.utils import timezone
+
+from .deduplication import deduplicate_solution
+from .helper import get_grader_ready_data, iter_grader_payload
+from .models import GraderRequest
+from .polling import (
+    get_first_polling_countdown,
+    get_polling_countdown,
+    is_polling_deadline_exceeded,
+    mark_solution_timed_out,
+)
+from .services import (
+    get_grader_headers,
+    is_already_submitted,
+    is_waiting_for_grader,
+    save_grading_result,
+)
+
+NONCE_CHECK_FAILED = "Nonce check failed"
+
+logger = logging.getLogger(__name__)
+
+
+def call_with_db(func, *args, **kwargs):
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+def claim_queued_solutions(*, solution_model, limit: int, claim_seconds: float) -> List[int]:
+    """
+    Claims up to `limit` solutions queued by `start_grader_communication` for `claim_seconds`, oldest first.
+    A claim that expires before its solution is graded, e.g. because its dispatcher died,
+    can be taken again. `grade` then goes on polling when the submission already went out.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        solution_ids = list(
+            solution_model.objects.select_for_update(skip_locked=True).filter(
+                Q(submit_claimed_until__isnull=True, submit_started_at__isnull=True) | Q(submit_claimed_until__lt=now),
+                queued_at__isnull=False,
+                graded_at__isnull=True,
+                status__in=[solution_model.SUBMITTED_WITHOUT_GRADING, solution_model.PENDING, solution_model.RUNNING],
+            ).order_by('queued_at').values_list('id', flat=True)[:limit]
+        )
+        solution_model.objects.filter(id__in=solution_ids).update(
+            submit_claimed_until=now + timezone.timedelta(seconds=claim_seconds)
+        )
+
+    return solution_ids
+
+
+class GraderNonce:
+    """
+    Hands out the nonces of one request and resource to one request at a time.
+
+    As in GraderClient, the GraderRequest row stays locked until the response arrives,
+    so requests from this process and from the Celery workers reach the grader in nonce order.
+    The transaction lives on a dedicated thread, because Django connections are per thread.
+    """
+    def __init__(self, req_and_resource: str):
+        self.req_and_resource = req_and_resource
+        self.lock = asyncio.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.atomic = None
+
+    def begin(self) -> int:
+        self.atomic = transaction.atomic()
+        self.atomic.__enter__()
+
+        try:
+            return GraderRequest.objects.allocate_nonce(self.req_and_resource)
+        except Exception:
+            self.end()
+            raise
+
+    def end(self):
+        # The nonce may have reached the grader, so its allocation is committed even on errors
+        try:
+            self.atomic.__exit__(None, None, None)
+        finally:
+            self.atomic = None
+            close_old_connections()
+
+    async def __aenter__(self) -> int:
+        await self.lock.acquire()
+
+        try:
+            return await asyncio.get_event_loop().run_in_executor(self.executor, self.begin)
+        except BaseException:
+            self.lock.release()
+            raise
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            await asyncio.get_event_loop().run_in_executor(self.executor, self.end)
+        finally:
+            self.lock.release()
+
+    def close(self):
+        self.executor.shutdown()
+
+
+class AsyncGraderClient:
+    """
+    asyncio counterpart of GraderClient. The HTTP round trips share one aiohttp session,
+    while the ORM calls run in `executor` because the ORM is synchronous.
+    """
+    def __init__(self, *, solution_model_repr: str, session: aiohttp.ClientSession, executor: ThreadPoolExecutor):
+        self.solution_model = apps.get_model(solution_model_repr)
+        self.session = session
+        self.executor = executor
+        self.req_and_resource = {
+            'GET': f'GET {settings.GRADER_GRADE_PATH}',
+            'POST': f'POST {settings.GRADER_GRADE_PATH}',
+        }
+        self.nonces = {
+            method: GraderNonce(req_and_resource)
+            for method, req_and_resource in self.req_and_resource.items()
+        }
+
+    async def run_sync(self, func, *args, **kwargs):
+        loop = asyncio.get_event_loop()
+
+        return await loop.run_in_executor(self.executor, functools.partial(call_with_db, func, *args, **kwargs))
+
+    def close(self):
+        for nonce in self.nonces.values():
+            nonce.close()
+
+    async def refresh_nonce(self, req_and_resource: str):
+        url = settings.GRADER_ADDRESS + settings.GRADER_GET_NONCE_PATH
+        headers = {
+            'Request-Info': req_and_resource,
+            'X-USER-Key': settings.GRADER_API_KEY
+        }
+
+        async with self.session.get(url, headers=headers) as response:
+            nonce = (await response.json())['nonce']
+
+        await self.run_sync(GraderRequest.objects.sync_nonce, req_and_resource, nonce)
+
+    async def count_nonce_failure(self, solution: Model):
+        await self.run_sync(
+            self.solution_model.objects.filter(id=solution.id).update,
+            nonce_failures=F('nonce_failures') + 1
+        )
+        solution.nonce_failures += 1
+
+    async def submit(self, solution: Model) -> Model:
+        data = await self.run_sync(get_grader_ready_data, solution.id, self.solution_model)
+        body = await self.run_sync(lambda: b''.join(iter_grader_payload(data)))
+        url = settings.GRADER_ADDRESS + settings.GRADER_GRADE_PATH
+
+        while True:
+            async with self.nonces['POST'] as nonce:
+                headers = get_grader_headers(body_chunks=[body], nonce=str(nonce))
+                headers['Content-Type'] = 'application/json'
+
+                async with self.session.post(url, data=body, headers=headers) as response:
+                    status = response.status
+                    text = await response.text()
+                    location = response.headers.get('Location')
+
+            if status == 202:
+                solution.status = self.solution_model.PENDING
+                solution.build_id = json.loads(text)['run_id']
+                solution.check_status_location = location
+                solution.grader_submitted_at = timezone.now()
+                break
+            elif status == 403 and text == NONCE_CHECK_FAILED:
+                await self.count_nonce_failure(solution)
+                await self.refresh_nonce(self.req_and_resource['POST'])
+            else:
+                solution.status = self.solution_model.NOT_OK
+                break
+
+        await self.run_sync(solution.save)
+
+        return solution
+
+    async def poll(self, solution: Model) -> bool:
+        """
+        Returns True once the solution has a final result.
+        """
+        await self.run_sync(solution.refresh_from_db, fields=['status'])
+
+        if not is_waiting_for_grader(solution=solution):
+            return True
+
+        path = settings.GRADER_CHECK_PATH.format(build_id=solution.build_id)
+
+        async with self.nonces['GET'] as nonce:
+            headers = get_grader_headers(body_chunks=[path.encode('utf-8')], nonce=str(nonce))
+
+            async with self.session.get(solution.check_status_location, headers=headers) as response:
+                status = response.status
+                text = await response.text()
+
+        await self.run_sync(
+            self.solution_model.objects.filter(id=solution.id).update,
+            poll_count=F('poll_count') + 1
+        )
+        solution.poll_count += 1
+
+        if status == 200:
+            data = json.loads(text)
+            await self.run_sync(
+                save_grading_result,
+                solution=solution,
+                result_status=data['result_status'],
+                output=data['output']
+            )
+            return True
+
+        if status == 403 and text == NONCE_CHECK_FAILED:
+            await self.count_nonce_failure(solution)
+            await self.refresh_nonce(self.req_and_resource['GET'])
+
+        return False
+
+    async def submit_with_retries(self, solution: Model) -> Model:
+        for retries in range(settings.GRADER_CONNECT_RETRIES + 1):
+            try:
+                return await self.submit(solution)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if retries == settings.GRADER_CONNECT_RETRIES:
+                    raise
+
+                await asyncio.sleep(settings.GRADER_RESUBMIT_COUNTDOWN)
+
+    async def grade(self, solution_id: int) -> Model:
+        """
+        Submits the solution and polls it with the same schedule and deadline as the Celery tasks.
+        """
+        await self.run_sync(
+            self.solution_model.objects.filter(id=solution_id, submit_started_at__isnull=True).update,
+            submit_started_at=timezone.now()
+        )
+        solutions = self.solution_model.objects.select_related('task__test', 'task__course')
+        solution = await self.run_sync(solutions.get, id=solution_id)
+
+        # A solution claimed again after an expired claim may already be with the grader
+        if not is_already_submitted(solution=solution):
+            if await self.run_sync(deduplicate_solution, solution=solution):
+                return solution
+
+            solution = await self.submit_with_retries(solution)
+
+        if not is_waiting_for_grader(solution=solution):
+            return solution
+
+        countdown = await self.run_sync(get_first_polling_countdown, solution=solution)
+        retries = 0
+
+        while True:
+            await asyncio.sleep(countdown)
+
+            try:
+                if await self.poll(solution):
+                    return solution
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+
+            if is_polling_deadline_exceeded(solution=solution):
+                await self.run_sync(mark_solution_timed_out, solution=solution)
+                return solution
+
+            countdown = get_polling_countdown(retries=retries)
+            retries += 1
+
+
+class AsyncGradingDispatcher:
+    """
+    Keeps up to `max_in_flight` solutions in grading at once,
+    multiplexed over at most GRADER_POOL_MAXSIZE connections.
+    `run` grades a fixed list of solutions, `serve` keeps claiming queued ones until `stop` is called.
+    Run one dispatcher per process, since the nonces are serialised per process and per database row.
+    """
+    def __init__(self, *, solution_model_repr: str, max_in_flight: int=None, db_threads: int=None):
+        self.solution_model_repr = solution_model_repr
+        self.max_in_flight = max_in_flight or settings.GRADER_ASYNC_MAX_IN_FLIGHT
+        self.executor = ThreadPoolExecutor(max_workers=db_threads or settings.GRADER_ASYNC_DB_THREADS)
+        self.queue = None
+        self.in_flight = 0
+        self.stopping = False
+        self.keep_results = True
+        self.results = {}
+
+    def create_session(self) -> aiohttp.ClientSession:
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=settings.GRADER_POOL_MAXSIZE),
+            timeout=aiohttp.ClientTimeout(total=settings.GRADER_REQUEST_TIMEOUT),
+        )
+
+    def put(self, solution_id: int):
+        self.in_flight += 1
+        self.queue.put_nowait(solution_id)
+
+    async def worker(self, client: AsyncGraderClient):
+        while True:
+            solution_id = await self.queue.get()
+
+            try:
+                result = await client.grade(solution_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.exception('Grading solution %s failed', solution_id)
+                result = exc
+            finally:
+                self.in_flight -= 1
+                self.queue.task_done()
+
+            if self.keep_results:
+                self.results[solution_id] = result
+
+    async def grade_queue(self, feed=None):
+        """
+        Starts the workers, awaits `feed` if given and then waits until the queue is drained.
+        """
+        async with self.create_session() as session:
+            client = AsyncGraderClient(
+                solution_model_repr=self.solution_model_repr,
+                session=session,
+                executor=self.executor
+            )
+            workers = [asyncio.ensure_future(self.worker(client)) for _ in range(self.max_in_flight)]
+
+            try:
+                if feed is not None:
+                    await feed(client)
+
+                await self.queue.join()
+            finally:
+                for worker in workers:
+                    worker.cancel()
+
+                await asyncio.gather(*workers, return_exceptions=True)
+                client.close()
+
+    async def run(self, solution_ids: List[int]) -> Dict[int, object]:
+        """
+        Grades all `solution_ids` and returns the graded solution, or the raised exception, per id.
+        More ids can be added with `self.put` while it runs.
+        """
+        self.queue = asyncio.Queue()
+
+        for solution_id in solution_ids:
+            self.put(solution_id)
+
+        await self.grade_queue()
+
+        return self.results
+
+    async def serve(self, *, poll_interval: float=None):
+        """
+        Claims the solutions queued for grading every `poll_interval` seconds, as long as there is room in flight.
+        After `stop` the solutions already claimed are still graded.
+        """
+        poll_interval = poll_interval if poll_interval is not None else settings.GRADER_ASYNC_POLL_INTERVAL
+        solution_model = apps.get_model(self.solution_model_repr)
+        self.queue = asyncio.Queue()
+        self.keep_results = False
+
+        async def feed(client):
+            while not self.stopping:
+                limit = self.max_in_flight - self.in_flight
+
+                if limit > 0:
+                    solution_ids = await client.run_sync(
+                        claim_queued_solutions,
+                        solution_model=solution_model,
+                        limit=limit,
+                        claim_seconds=settings.GRADER_ASYNC_CLAIM_TIMEOUT
+                    )
+
+                    for solution_id in solution_ids:
+                        self.put(solution_id)
+
+                await asyncio.sleep(poll_interval)
+
+        await self.grade_queue(feed)
+
+    def stop(self):
+        self.stopping = True
+
+
+def grade_solutions_async(*, solution_ids: List[int], solution_model_repr: str, max_in_flight: int=None):
+    dispatcher = AsyncGradingDispatcher(solution_model_repr=solution_model_repr, max_in_flight=max_in_flight)
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(dispatcher.run(solution_ids))
+    finally:
+        loop.close()
+        dispatcher.executor.shutdown()
@@ -0,0 +1,156 @@
+import time
+from typing import Dict, List
+
+from requests import Response
+from requests.exceptions import Timeout, ConnectionError
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Model, Q
+from django.utils import timezone
+
+from odin.common.utils import bulk_update
+
+from .client import GraderClient
+from .polling import is_polling_deadline_exceeded
+from .services import apply_grading_result
+from .signals import solutions_graded
+
+GRADING_RESULT_FIELDS = ['status', 'test_output', 'graded_at']
+
+
+@transaction.atomic
+def claim_solutions_waiting_for_grader(*, solution_model, limit: int, claim_seconds: float) -> List[Model]:
+    """
+    Claims the oldest waiting solutions for `claim_seconds`, so overlapping sweeps poll different rows.
+    SKIP LOCKED lets concurrent sweeps pass over the rows another one is claiming.
+    The claim expires on its own if the sweep dies before releasing it.
+    """
+    now = timezone.now()
+
+    solution_ids = list(
+        solution_model.objects.select_for_update(skip_locked=True).filter(
+            Q(poll_claimed_until__isnull=True) | Q(poll_claimed_until__lt=now),
+            status__in=[solution_model.PENDING, solution_model.RUNNING],
+            check_status_location__gt='',
+        ).order_by('grader_submitted_at', 'id').values_list('id', flat=True)[:limit]
+    )
+
+    solution_model.objects.filter(id__in=solution_ids).update(
+        poll_claimed_until=now + timezone.timedelta(seconds=claim_seconds)
+    )
+
+    return list(solution_model.objects.filter(id__in=solution_ids).order_by('grader_submitted_at', 'id'))
+
+
+def send_poll_request(*, client: GraderClient, solution: Model):
+    """
+    Sends the request without holding a transaction or a row lock.
+    The poll is sequential within a sweep, and a nonce that loses a race
+    against another process is retried, as in `GraderClient.poll_grader`.
+    """
+    url, headers = client.generate_poll_request(solution)
+
+    try:
+        return client.session.get(url, headers=headers, timeout=client.timeout)
+    except (Timeout, ConnectionError) as exc:
+        return exc
+
+
+def is_nonce_failure(response) -> bool:
+    return isinstance(response, Response) and response.status_code == 403 and response.text == "Nonce check failed"
+
+
+@transaction.atomic
+def save_finished_solutions(*, solution_model, polled: List[Model], finished: List[Model], claimed: List[Model]):
+    """
+    Writes the poll counts, the finished results and the released claims in a few queries.
+    A result is dropped when its row stopped waiting for that grader run while it was polled,
+    e.g. because the grader callback saved it first or a regrade reset it.
+    """
+    solution_model.objects.filter(id__in=[solution.id for solution in polled]).update(
+        poll_count=F('poll_count') + 1
+    )
+
+    still_waiting = set(
+        solution_model.objects.select_for_update().filter(
+            id__in=[solution.id for solution in finished],
+            status__in=[solution_model.PENDING, solution_model.RUNNING],
+        ).values_list('id', 'check_status_location')
+    )
+    finished = [solution for solution in finished if (solution.id, solution.check_status_location) in still_waiting]
+
+    bulk_update(objs=finished, fields=GRADING_RESULT_FIELDS)
+
+    if finished:
+        solutions_graded.send(sender=solution_model, solutions=finished)
+
+    solution_model.objects.filter(id__in=[solution.id for solution in claimed]).update(poll_claimed_until=None)
+
+
+def poll_solutions_in_batch(*, solution_model_repr: str, batch_size: int=None) -> Dict[str, int]:
+    """
+    Polls the oldest waiting solutions one after another over the shared grader session.
+
+    The grader only accepts increasing nonces, so the requests are not sent concurrently.
+    Polling stops before any request, including a nonce retry, could run past CELERY_TASK_SOFT_TIME_LIMIT,
+    and the solutions left unpolled are released for the next sweep.
+    """
+    started = time.monotonic()
+    client = GraderClient(solution_model_repr=solution_model_repr, grader_ready_data={})
+    solution_model = client.solution_model
+
+    time_limit = float(settings.CELERY_TASK_SOFT_TIME_LIMIT)
+    solutions = claim_solutions_waiting_for_grader(
+        solution_model=solution_model,
+        limit=batch_size or settings.GRADER_BATCH_POLLING_SIZE,
+        claim_seconds=float(settings.CELERY_TASK_TIME_LIMIT)
+    )
+    stats = {'polled': 0, 'graded': 0, 'timed_out': 0, 'waiting': 0}
+
+    if not solutions:
+        return stats
+
+    polled = []
+    finished = []
+
+    def has_time_for(requests: int) -> bool:
+        return time.monotonic() - started + requests * client.timeout <= time_limit
+
+    for solution in solutions:
+        if not has_time_for(1):
+            break
+
+        response = send_poll_request(client=client, solution=solution)
+
+        if is_nonce_failure(response):
+            client._count_nonce_failure(solution)
+
+            # The nonce refresh and the second poll are two more requests
+            if not has_time_for(2):
+                break
+
+            client.refresh_poll_nonce()
+            response = send_poll_request(client=client, solution=solution)
+
+        polled.append(solution)
+        solution.poll_count += 1
+
+        if isinstance(response, Response) and response.status_code == 200:
+            data = response.json()
+            apply_grading_result(solution=solution, result_status=data['result_status'], output=data['output'])
+            finished.append(solution)
+            stats['graded'] += 1
+        elif is_polling_deadline_exceeded(solution=solution):
+            solution.status = solution.TIMED_OUT
+            solution.graded_at = timezone.now()
+            finished.append(solution)
+            stats['timed_out'] += 1
+        else:
+            stats['waiting'] += 1
+
+    stats['polled'] = len(polled)
+
+    save_finished_solutions(solution_model=solution_model, polled=polled, finished=finished, claimed=solutions)
+
+    return stats
@@ -0,0 +1,151 @@
+import contextlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List
+from unittest import mock
+
+from requests.exceptions import Timeout, ConnectionError
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .exceptions import PollingError
+from .metrics import summarize_latencies
+from .polling import get_polling_countdown
+from .tasks import poll_solution, submit_solution
+
+
+class FirstPollRecorder:
+    """
+    Stands in for `poll_solution.apply_async` and records the countdown of the first poll
+    of every solution instead of publishing it.
+    """
+    def __init__(self):
+        self.countdowns = {}
+
+    def apply_async(self, args, countdown=None, **kwargs):
+        self.countdowns[args[0]] = countdown
+
+
+@contextlib.contextmanager
+def recording_first_polls() -> Iterator[FirstPollRecorder]:
+    recorder = FirstPollRecorder()
+
+    with mock.patch.object(poll_solution, 'apply_async', recorder.apply_async):
+        yield recorder
+
+
+def grade_solution(*, solution_id: int, solution_model_repr: str, first_polls: FirstPollRecorder=None) -> Dict:
+    """
+    Runs the `submit_solution` and `poll_solution` tasks in the current thread,
+    sleeping the countdowns Celery would wait between them.
+    Stops polling at GRADER_POLLING_DEADLINE, even if the grader never finishes.
+    """
+    if first_polls is None:
+        with recording_first_polls() as recorder:
+            return grade_solution(
+                solution_id=solution_id,
+                solution_model_repr=solution_model_repr,
+                first_polls=recorder
+            )
+
+    started = time.monotonic()
+    deadline = started + settings.GRADER_POLLING_DEADLINE
+    polls = 0
+    error = False
+
+    with CaptureQueriesContext(connection) as queries:
+        try:
+            # Called directly, a task raises the original exception where it would retry
+            submit_solution(solution_id, solution_model_repr)
+            countdown = first_polls.countdowns.pop(solution_id, None)
+        except (Timeout, ConnectionError):
+            countdown = None
+            error = True
+
+        while countdown is not None:
+            if time.monotonic() + countdown > deadline:
+                error = True
+                break
+
+            time.sleep(countdown)
+
+            try:
+                poll_solution(solution_id, solution_model_repr)
+                countdown = None
+            except (PollingError, Timeout, ConnectionError):
+                countdown = get_polling_countdown(retries=polls)
+
+            polls += 1
+
+    return {
+        'latency': time.monotonic() - started,
+        'queries': len(queries),
+        'polls': polls,
+        'error': error,
+    }
+
+
+def run_grading_benchmark(*, solution_ids: List[int], solution_model_repr: str, concurrency: int) -> Dict:
+    def grade_in_thread(solution_id):
+        try:
+            return grade_solution(
+                solution_id=solution_id,
+                solution_model_repr=solution_model_repr,
+                first_polls=first_polls
+            )
+        finally:
+            connection.close()
+
+    started = time.monotonic()
+
+    with recording_first_polls() as first_polls, ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(grade_in_thread, solution_ids))
+
+    elapsed = time.monotonic() - started
+
+    return {
+        'solutions': len(results),
+        'errors': sum(result['error'] for result in results),
+        'elapsed': elapsed,
+        'throughput': len(results) / elapsed,
+        'latency': summarize_latencies([result['latency'] for result in results]),
+        'queries_per_solution': sum(result['queries'] for result in results) / len(results),
+        'polls_per_solution': sum(result['polls'] for result in results) / len(results),
+    }
+
+
+def run_async_grading_benchmark(*, solution_ids: List[int], solution_model_repr: str, max_in_flight: int) -> Dict:
+    """
+    Same as `run_grading_benchmark`, but all solutions are graded by one AsyncGradingDispatcher.
+    """
+    from .async_client import grade_solutions_async
+
+    started = time.monotonic()
+    results = grade_solutions_async(
+        solution_ids=solution_ids,
+        solution_model_repr=solution_model_repr,
+        max_in_flight=max_in_flight
+    )
+    elapsed = time.monotonic() - started
+
+    solution_model = apps.get_model(solution_model_repr)
+    solutions = solution_model.objects.filter(
+        id__in=solution_ids
+    ).values_list('submit_started_at', 'graded_at', 'poll_count')
+    latencies = [
+        (graded_at - started_at).total_seconds()
+        for started_at, graded_at, _ in solutions
+        if started_at is not None and graded_at is not None
+    ]
+
+    return {
+        'solutions': len(results),
+        'errors': sum(isinstance(result, Exception) for result in results.values()),
+        'elapsed': elapsed,
+        'throughput': len(results) / elapsed,
+        'latency': summarize_latencies(latencies),
+        'polls_per_solution': sum(poll_count for _, _, poll_count in solutions) / len(solution_ids),
+    }
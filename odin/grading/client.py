@@ -1,16 +1,20 @@
-import hashlib
-import hmac
-import json
-import requests
-import time
-from typing import Dict, Callable
+from typing import Dict, Callable, Iterable, Tuple
 
 from django.conf import settings
 from django.apps import apps
-from django.shortcuts import get_object_or_404
+from django.db.models import F
+from django.utils import timezone
 
 from .models import GraderRequest
-from.exceptions import PollingError
+from .exceptions import PollingError
+from .session import get_grader_session
+from .helper import GraderPayload, iter_grader_payload
+from .polling import GRADER_POLLING_MODE_TASK, get_first_polling_countdown
+from .services import (
+    get_grader_headers,
+    is_waiting_for_grader,
+    save_grading_result,
+)
 
 
 class GraderClient:
@@ -24,6 +28,8 @@ class GraderClient:
         self.solution_model_repr = solution_model_repr
         self.solution_model = apps.get_model(solution_model_repr)
         self.req_and_resource = self._generate_req_and_resource()
+        self.session = get_grader_session()
+        self.timeout = self.settings.GRADER_REQUEST_TIMEOUT
 
     def _generate_req_and_resource(self) -> Dict[str, str]:
         req_and_resource = {}
@@ -31,39 +37,19 @@ class GraderClient:
         req_and_resource['POST'] = f'POST {self.settings.GRADER_GRADE_PATH}'
         return req_and_resource
 
-    def _generate_grader_headers(self, body: Dict, req_and_resource: str) -> Dict:
-        nonce = self._get_and_update_req_nonce(req_and_resource)
-        date = time.strftime("%c")
-        msg = body + date + nonce
-        digest = hmac.new(bytearray(settings.GRADER_API_SECRET.encode('utf-8')),
-                          msg=msg.encode('utf-8'),
-                          digestmod=hashlib.sha256).hexdigest()
+    def _generate_grader_headers(self, body: str, req_and_resource: str) -> Dict:
+        return self._generate_streamed_grader_headers([body.encode('utf-8')], req_and_resource)
 
-        request_headers = {'Authentication': digest,
-                           'Date': date,
-                           'X-API-Key': settings.GRADER_API_KEY,
-                           'X-Nonce-Number': nonce}
+    def _generate_streamed_grader_headers(self, body_chunks: Iterable[bytes], req_and_resource: str) -> Dict:
+        nonce = self._get_and_update_req_nonce(req_and_resource)
 
-        return request_headers
+        return get_grader_headers(body_chunks=body_chunks, nonce=nonce)
 
     def _get_and_update_req_nonce(self, req_and_resource: str) -> str:
-        request = GraderRequest.objects.filter(request_info=req_and_resource).first()
-
-        if request is not None:
-            nonce = request.nonce
-            nonce += 1
-            request.nonce = nonce
-            request.save()
-            return str(nonce)
-
-        nonce = 1
-        GraderRequest.objects.create(nonce=nonce, request_info=req_and_resource)
-        return str(nonce)
+        return str(GraderRequest.objects.allocate_nonce(req_and_resource))
 
     def _update_req_and_resource_nonce(self, req_and_resource: str, nonce: int):
-        grader_request = get_object_or_404(GraderRequest, request_info=req_and_resource)
-        grader_request.nonce = nonce
-        grader_request.save()
+        GraderRequest.objects.sync_nonce(req_and_resource, nonce)
 
     def _get_valid_nonce(self, req_and_resource: str):
         get_nonce_url = settings.GRADER_ADDRESS + settings.GRADER_GET_NONCE_PATH
@@ -72,60 +58,90 @@ class GraderClient:
             'Request-Info': req_and_resource,
             'X-USER-Key': settings.GRADER_API_KEY
         }
-        response = requests.get(get_nonce_url, headers=headers)
+        response = self.session.get(get_nonce_url, headers=headers, timeout=self.timeout)
         nonce = response.json()["nonce"]
         self._update_req_and_resource_nonce(req_and_resource, nonce)
 
+    def _count_nonce_failure(self, solution):
+        self.solution_model.objects.filter(id=solution.id).update(nonce_failures=F('nonce_failures') + 1)
+        solution.nonce_failures += 1
+
     def submit_request_to_grader(self, solution_id: int, polling_task: Callable):
         """
         The task is waiting 202 status code. The infinite loop is to get right nonce.
         """
         solution = self.solution_model.objects.get(id=solution_id)
         url = self.settings.GRADER_ADDRESS + self.settings.GRADER_GRADE_PATH
-        body = json.dumps(self.data)
         while True:
-            headers = self._generate_grader_headers(body, self.req_and_resource['POST'])
+            headers = self._generate_streamed_grader_headers(
+                iter_grader_payload(self.data),
+                self.req_and_resource['POST']
+            )
+            headers['Content-Type'] = 'application/json'
+
+            # File contents are encoded while sending, so the body goes out with chunked transfer
+            body = GraderPayload(self.data)
+            if not self.settings.GRADER_CHUNKED_UPLOAD:
+                body = b''.join(body)
 
-            response = requests.post(url, json=self.data, headers=headers)
+            response = self.session.post(url, data=body, headers=headers, timeout=self.timeout)
 
             if response.status_code == 202:
                 solution.status = self.solution_model.PENDING
                 solution.build_id = response.json()['run_id']
                 solution.check_status_location = response.headers['Location']
+                solution.grader_submitted_at = timezone.now()
                 solution.save()
 
-                polling_task.delay(solution.id, self.solution_model_repr)
+                if self.settings.GRADER_POLLING_MODE == GRADER_POLLING_MODE_TASK:
+                    polling_task.apply_async(
+                        args=(solution.id, self.solution_model_repr),
+                        countdown=get_first_polling_countdown(solution=solution)
+                    )
                 break
             elif response.status_code == 403 and response.text == "Nonce check failed":
+                self._count_nonce_failure(solution)
                 self._get_valid_nonce(self.req_and_resource['POST'])
             else:
                 solution.status = self.solution_model.NOT_OK
                 solution.save()
                 break
 
+    def generate_poll_request(self, solution) -> Tuple[str, Dict]:
+        path = self.settings.GRADER_CHECK_PATH.format(build_id=solution.build_id)
+        headers = self._generate_grader_headers(path, self.req_and_resource['GET'])
+
+        return solution.check_status_location, headers
+
+    def refresh_poll_nonce(self):
+        self._get_valid_nonce(self.req_and_resource['GET'])
+
     def poll_grader(self, solution_id: int):
         solution = self.solution_model.objects.get(id=solution_id)
 
-        path = self.settings.GRADER_CHECK_PATH.format(build_id=solution.build_id)
-        url = solution.check_status_location
-        req_and_resource = self.req_and_resource['GET']
+        if not is_waiting_for_grader(solution=solution):
+            # The result has already been pushed through the grader callback
+            return
 
-        headers = self._generate_grader_headers(path, req_and_resource)
-        response = requests.get(url, headers=headers)
+        self.solution_model.objects.filter(id=solution.id).update(poll_count=F('poll_count') + 1)
+        solution.poll_count += 1
+
+        req_and_resource = self.req_and_resource['GET']
+        url, headers = self.generate_poll_request(solution)
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
         if response.status_code == 403 and response.text == "Nonce check failed":
+            self._count_nonce_failure(solution)
             self._get_valid_nonce(req_and_resource)
             raise PollingError(response.text)
 
         elif response.status_code == 200:
             data = response.json()
 
-            if data['result_status'] == 'ok':
-                solution.status = self.solution_model.OK
-            elif data['result_status'] == 'not_ok':
-                solution.status = self.solution_model.NOT_OK
-
-            solution.test_output = data['output']
-            solution.save()
+            save_grading_result(
+                solution=solution,
+                result_status=data['result_status'],
+                output=data['output']
+            )
         else:
             raise PollingError("Grading not finished yet")
 
@@ -0,0 +1,106 @@
+import hashlib
+import json
+from typing import Dict, Optional
+
+from django.db.models import Count, Model
+from django.utils import timezone
+
+
+def normalize_code(code: str) -> str:
+    return code.replace('\r\n', '\n').rstrip()
+
+
+def get_test_version(*, test: Model) -> str:
+    """
+    Hash of everything that decides the grading result, including the bytes of the test file,
+    so uploading a new file under the same name makes a new version.
+    """
+    digest = hashlib.sha256()
+
+    for part in (test.language.name, test.code, test.requirements, json.dumps(test.extra_options, sort_keys=True)):
+        digest.update((part or '').encode('UTF-8'))
+        digest.update(b'\0')
+
+    if test.file:
+        test.file.open('rb')
+        try:
+            for chunk in test.file.chunks():
+                digest.update(chunk)
+        finally:
+            test.file.close()
+
+    return digest.hexdigest()
+
+
+def get_solution_code_hash(*, solution: Model) -> str:
+    """
+    Hash of the normalized code or the file bytes together with the version of the task test,
+    so editing the test makes all earlier results unusable for deduplication.
+    """
+    digest = hashlib.sha256()
+    digest.update(get_test_version(test=solution.task.test).encode('UTF-8'))
+    digest.update(b'\0')
+
+    if solution.code is not None:
+        digest.update(normalize_code(solution.code).encode('UTF-8'))
+    elif solution.file:
+        for chunk in solution.file.chunks():
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def find_graded_duplicate(*, solution: Model) -> Optional[Model]:
+    return type(solution).objects.filter(
+        task_id=solution.task_id,
+        code_hash=solution.code_hash,
+        status__in=[solution.OK, solution.NOT_OK],
+    ).exclude(id=solution.id).order_by('-id').first()
+
+
+def deduplicate_solution(*, solution: Model) -> bool:
+    """
+    Stores the code hash of `solution` and, when its course allows it,
+    copies the result of an identical graded solution of the same task.
+    Solutions re-run by a regrade job are always sent to the grader,
+    since reusing an earlier result would defeat the regrade.
+    Returns True when the solution does not have to be sent to the grader.
+    """
+    solution.code_hash = get_solution_code_hash(solution=solution)
+    duplicate = None
+
+    if solution.task.course.deduplicate_solutions and not solution.regrade_jobs.exists():
+        duplicate = find_graded_duplicate(solution=solution)
+
+    if duplicate is None:
+        type(solution).objects.filter(id=solution.id).update(code_hash=solution.code_hash)
+        return False
+
+    solution.status = duplicate.status
+    solution.test_output = duplicate.test_output
+    solution.graded_at = timezone.now()
+    solution.deduplicated_from_id = duplicate.deduplicated_from_id or duplicate.id
+    solution.save()
+
+    return True
+
+
+def get_deduplication_statistics(*, solution_model, since=None) -> Dict[str, Dict]:
+    solutions = solution_model.objects.filter(code_hash__isnull=False)
+
+    if since is not None:
+        solutions = solutions.filter(created_at__gte=since)
+
+    rows = solutions.values('task__course__name').annotate(
+        submitted=Count('id'),
+        deduplicated=Count('deduplicated_from'),
+    ).order_by('task__course__name')
+
+    return {
+        row['task__course__name']: {
+            'submitted': row['submitted'],
+            'deduplicated': row['deduplicated'],
+            'hit_rate': row['deduplicated'] / row['submitted'],
+        }
+        for row in rows
+    }
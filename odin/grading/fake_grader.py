@@ -0,0 +1,246 @@
+import hashlib
+import hmac
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Dict, Optional
+
+
+class FakeGrader:
+    """
+    Local stand-in for the external grader, for tests and benchmarks.
+    Implements the nonce, grade and check endpoints with the same HMAC and nonce checks,
+    and grades every run as ok or not_ok after a configurable latency.
+    """
+    def __init__(self,
+                 *,
+                 api_key: str,
+                 api_secret: str,
+                 grading_latency: float=1.0,
+                 latency_jitter: float=0.0,
+                 response_delay: float=0.0,
+                 failure_rate: float=0.0,
+                 not_ok_rate: float=0.0,
+                 grade_path: str='/grade',
+                 check_path: str='/check_result/{build_id}/',
+                 nonce_path: str='/nonce'):
+
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.grading_latency = grading_latency
+        self.latency_jitter = latency_jitter
+        self.response_delay = response_delay
+        self.failure_rate = failure_rate
+        self.not_ok_rate = not_ok_rate
+        self.grade_path = grade_path
+        self.check_path = check_path
+        build_id_regex = re.escape(check_path).replace(r'\{build_id\}', r'(?P<build_id>\d+)')
+        self.check_path_regex = re.compile('^' + build_id_regex + '$')
+        self.nonce_path = nonce_path
+
+        self.lock = threading.Lock()
+        self.last_nonces = {}
+        self.runs = {}
+        self.run_ids = itertools.count(1)
+        self.stats = Counter()
+        self.server = None
+
+    @property
+    def address(self) -> str:
+        host, port = self.server.server_address
+
+        return f'http://{host}:{port}'
+
+    def start(self, host: str='127.0.0.1', port: int=0) -> str:
+        handler = type('FakeGraderRequestHandler', (FakeGraderRequestHandler, ), {'grader': self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+
+        return self.address
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def get_digest(self, *, body: bytes, date: str, nonce: str) -> str:
+        msg = body + date.encode('utf-8') + nonce.encode('utf-8')
+
+        return hmac.new(self.api_secret.encode('utf-8'), msg=msg, digestmod=hashlib.sha256).hexdigest()
+
+    def get_last_nonce(self, req_and_resource: str) -> int:
+        with self.lock:
+            return self.last_nonces.get(req_and_resource, 0)
+
+    def get_request_error(self, *, body: bytes, headers, req_and_resource: str) -> Optional[str]:
+        """
+        Returns the text of the 403 response the grader would send, or None for a valid request.
+        """
+        digest = headers.get('Authentication', '')
+        date = headers.get('Date', '')
+        nonce = headers.get('X-Nonce-Number', '')
+
+        if headers.get('X-API-Key') != self.api_key or \
+                not hmac.compare_digest(digest, self.get_digest(body=body, date=date, nonce=nonce)):
+            self.stats['invalid_signatures'] += 1
+            return 'Invalid signature'
+
+        # Like the real grader, every nonce must be greater than the last one it accepted
+        with self.lock:
+            if not nonce.isdigit() or int(nonce) <= self.last_nonces.get(req_and_resource, 0):
+                self.stats['nonce_failures'] += 1
+                return 'Nonce check failed'
+
+            self.last_nonces[req_and_resource] = int(nonce)
+
+        return None
+
+    def create_run(self) -> int:
+        latency = self.grading_latency + random.uniform(0, self.latency_jitter)
+        result_status = 'not_ok' if random.random() < self.not_ok_rate else 'ok'
+
+        with self.lock:
+            run_id = next(self.run_ids)
+            self.runs[run_id] = (time.monotonic() + latency, result_status)
+            self.stats['submissions'] += 1
+
+        return run_id
+
+    def get_result(self, run_id: int) -> Dict:
+        with self.lock:
+            self.stats['checks'] += 1
+            ready_at, result_status = self.runs[run_id]
+
+        if time.monotonic() < ready_at:
+            return None
+
+        return {
+            'run_id': run_id,
+            'result_status': result_status,
+            'output': {'test_status': result_status, 'test_output': 'Graded by the fake grader'},
+        }
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class FakeGraderRequestHandler(BaseHTTPRequestHandler):
+    grader = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status_code: int, data=None, headers: Dict=None):
+        body = json.dumps(data).encode('utf-8') if data is not None else b''
+
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_text(self, status_code: int, text: str):
+        body = text.encode('utf-8')
+
+        self.send_response(status_code)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self) -> bytes:
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            chunks = []
+
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                chunk = self.rfile.read(size)
+                self.rfile.readline()
+
+                if size == 0:
+                    break
+
+                chunks.append(chunk)
+
+            return b''.join(chunks)
+
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def is_failing(self) -> bool:
+        time.sleep(self.grader.response_delay)
+
+        if random.random() < self.grader.failure_rate:
+            self.grader.stats['failures'] += 1
+            self.send_text(500, 'Internal Server Error')
+            return True
+
+        return False
+
+    def do_GET(self):
+        grader = self.grader
+
+        if self.path == grader.nonce_path:
+            nonce = grader.get_last_nonce(self.headers.get('Request-Info', ''))
+            self.send_json(200, {'nonce': nonce})
+            return
+
+        match = grader.check_path_regex.match(self.path)
+
+        if match is None:
+            self.send_text(404, 'Not Found')
+            return
+
+        if self.is_failing():
+            return
+
+        req_and_resource = f'GET {grader.grade_path}'
+
+        error = grader.get_request_error(body=self.path.encode('utf-8'),
+                                         headers=self.headers,
+                                         req_and_resource=req_and_resource)
+        if error is not None:
+            self.send_text(403, error)
+            return
+
+        result = grader.get_result(int(match.group('build_id')))
+
+        if result is None:
+            self.send_json(204)
+        else:
+            self.send_json(200, result)
+
+    def do_POST(self):
+        grader = self.grader
+        body = self.read_body()
+
+        if self.path != grader.grade_path:
+            self.send_text(404, 'Not Found')
+            return
+
+        if self.is_failing():
+            return
+
+        error = grader.get_request_error(body=body,
+                                         headers=self.headers,
+                                         req_and_resource=f'POST {grader.grade_path}')
+        if error is not None:
+            self.send_text(403, error)
+            return
+
+        run_id = grader.create_run()
+        location = grader.address + grader.check_path.format(build_id=run_id)
+
+        self.send_json(202, {'run_id': run_id}, headers={'Location': location})
@@ -1,10 +1,15 @@
 import base64
-import tempfile
-import os
+import hashlib
+import io
+import json
 import tarfile
+import time
 
-from typing import Dict, List
+from typing import Dict, Iterator, Union
 
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
 from django.db.models import Model
 
 from .validators import run_create_grader_ready_data_validation
@@ -29,45 +34,140 @@ def encode_solution_or_test_code(code: str):
     return base64.b64encode(code.encode('UTF-8')).decode('ascii')
 
 
-def generate_test_file(*, test: IncludedTest, path: str, ):
-    with open(f'{path}/{test.language.test_format}', 'w', encoding='UTF-8') as testfile:
-            testfile.write(test.code)
+def encode_file_in_chunks(*, file: File, chunk_size: int) -> Iterator[bytes]:
+    """
+    Chunks are re-aligned to multiples of 3 bytes, so the encoded parts concatenate
+    to the same output as encoding the whole file at once.
+    """
+    remainder = b''
 
+    # File.open returns None before Django 2.0, so it cannot be used as a context manager here
+    file.open('rb')
 
-def generate_dependency_file(*, test: IncludedTest, path: str):
-    with open(f'{path}/{test.language.requirements_format}', 'w', encoding='UTF-8') as requirements:
-            requirements.write(test.requirements)
+    try:
+        for chunk in file.chunks(chunk_size):
+            chunk = remainder + chunk
+            aligned_length = len(chunk) - len(chunk) % 3
+            remainder = chunk[aligned_length:]
 
+            if aligned_length:
+                yield base64.b64encode(chunk[:aligned_length])
 
-def generate_tar_file_for_tests(*, test_files: List[str], path: str):
-    with tarfile.open(name=f'{path}/tests.tar.gz', mode='w:gz') as tar:
-            for file in test_files:
-                tar.add(f'{path}/{file}', arcname=file)
+        if remainder:
+            yield base64.b64encode(remainder)
+    finally:
+        file.close()
 
-    return tar.name
 
+class StreamedFile:
+    """
+    Placeholder for a file in the grader payload.
+    It is base64 encoded chunk by chunk while the payload is being signed or sent.
+    """
+    def __init__(self, file: File):
+        self.file = file
 
-def encode_tests_archive(*, tar_filename: str):
-    with open(tar_filename, 'rb') as tar_binary:
-            encoded_archive = base64.b64encode(tar_binary.read())
+    def iter_encoded(self) -> Iterator[bytes]:
+        return encode_file_in_chunks(file=self.file, chunk_size=settings.GRADER_ENCODING_CHUNK_SIZE)
 
-    return encoded_archive
 
+class GraderPayload:
+    """
+    Streamed request body that starts over on every iteration,
+    so a retried send transmits the whole payload again instead of what the generator has left.
+    """
+    def __init__(self, data: Dict):
+        self.data = data
 
-def generate_test_resource(*, test: IncludedTest):
+    def __iter__(self) -> Iterator[bytes]:
+        return iter_grader_payload(self.data)
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        generate_test_file(test=test, path=tmpdir)
 
-        generate_dependency_file(test=test, path=tmpdir)
+def iter_grader_payload(data: Dict) -> Iterator[bytes]:
+    """
+    Serializes the payload the same way as json.dumps,
+    without ever holding a whole encoded file in memory.
+    """
+    yield b'{'
 
-        test_files = os.listdir(tmpdir)
+    for index, (key, value) in enumerate(data.items()):
+        if index:
+            yield b', '
 
-        encoded = encode_tests_archive(
-            tar_filename=generate_tar_file_for_tests(test_files=test_files, path=tmpdir)
-        )
+        yield json.dumps(key).encode('UTF-8') + b': '
 
-    return encoded.decode('ascii')
+        if isinstance(value, StreamedFile):
+            yield b'"'
+            yield from value.iter_encoded()
+            yield b'"'
+        else:
+            yield json.dumps(value).encode('UTF-8')
+
+    yield b'}'
+
+
+def get_test_files(*, test: IncludedTest) -> Dict[str, str]:
+    return {
+        test.language.test_format: test.code,
+        test.language.requirements_format: test.requirements,
+    }
+
+
+def generate_tests_archive(*, files: Dict[str, Union[str, bytes]]) -> bytes:
+    """
+    Builds a gzipped tarball in memory. `files` maps archive paths to their contents,
+    so a test can consist of any number of files.
+    """
+    buffer = io.BytesIO()
+    mtime = time.time()
+
+    with tarfile.open(fileobj=buffer, mode='w:gz') as tar:
+        for name, content in sorted(files.items()):
+            if content is None:
+                continue
+
+            if isinstance(content, str):
+                content = content.encode('UTF-8')
+
+            file_info = tarfile.TarInfo(name=name)
+            file_info.size = len(content)
+            file_info.mode = 0o644
+            file_info.mtime = mtime
+
+            tar.addfile(file_info, io.BytesIO(content))
+
+    return buffer.getvalue()
+
+
+def generate_test_resource(*, test: IncludedTest) -> str:
+    archive = generate_tests_archive(files=get_test_files(test=test))
+
+    return base64.b64encode(archive).decode('ascii')
+
+
+def get_test_resource_cache_key(*, test: IncludedTest) -> str:
+    """
+    The key is a hash of everything that goes into the archive,
+    so editing the test or its language points to a new entry and the old one expires.
+    """
+    digest = hashlib.sha256()
+
+    for part in (test.code, test.requirements, test.language.test_format, test.language.requirements_format):
+        digest.update((part or '').encode('UTF-8'))
+        digest.update(b'\0')
+
+    return f'grader_test_resource_{digest.hexdigest()}'
+
+
+def get_test_resource(*, test: IncludedTest) -> str:
+    cache_key = get_test_resource_cache_key(test=test)
+    test_resource = cache.get(cache_key)
+
+    if test_resource is None:
+        test_resource = generate_test_resource(test=test)
+        cache.set(cache_key, test_resource, settings.GRADER_TEST_RESOURCE_CACHE_TIMEOUT)
+
+    return test_resource
 
 
 def get_grader_ready_data(solution_id: int, solution_model: Model) -> Dict:
@@ -87,14 +187,14 @@ def get_grader_ready_data(solution_id: int, solution_model: Model) -> Dict:
         if not test.requirements:
             test_resource = encode_solution_or_test_code(code=test.code)
         else:
-            test_resource = generate_test_resource(test=test)
+            test_resource = get_test_resource(test=test)
 
             test.extra_options['archive_test_type'] = True
             test.extra_options['time_limit'] = 20
 
     if solution.file:
-        solution_code = encode_solution_or_test_code(code=solution.file.read())
-        test_resource = encode_solution_or_test_code(code=test.file.read())
+        solution_code = StreamedFile(solution.file)
+        test_resource = StreamedFile(test.file)
 
     data = {
         'language': test.language.name,
@@ -108,6 +208,9 @@ def get_grader_ready_data(solution_id: int, solution_model: Model) -> Dict:
     if not test.is_source():
         data['test_type'] = TEST_TYPES['OUTPUT_CHECKING']
 
+    if settings.GRADER_CALLBACK_URL:
+        data['callback_url'] = settings.GRADER_CALLBACK_URL
+
     run_create_grader_ready_data_validation(
         language=test.language.name,
         test_type=data['test_type'],
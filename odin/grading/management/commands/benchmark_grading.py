@@ -0,0 +1,102 @@
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from odin.common.faker import faker
+from odin.users.models import BaseUser
+
+from odin.education.models import ProgrammingLanguage, Solution
+from odin.education.services import create_course, create_included_task, create_test_for_task
+
+from odin.grading.benchmark import run_async_grading_benchmark, run_grading_benchmark
+from odin.grading.fake_grader import FakeGrader
+from odin.grading.polling import GRADER_POLLING_MODE_TASK
+from odin.grading.session import reset_grader_session
+
+
+class Command(BaseCommand):
+    help = 'Grades generated solutions concurrently against the fake grader and reports throughput and latency. ' \
+           'The generated course, users and solutions are deleted afterwards.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--solutions', type=int, default=100)
+        parser.add_argument('--concurrency', type=int, default=10)
+        parser.add_argument('--latency', type=float, default=1.0)
+        parser.add_argument('--jitter', type=float, default=0.5)
+        parser.add_argument('--failure-rate', type=float, default=0.0)
+        parser.add_argument('--async', action='store_true', dest='use_async',
+                            help='Grade with the asyncio dispatcher, keeping `--concurrency` solutions in flight.')
+
+    def generate_solutions(self, count):
+        start_date = timezone.now().date()
+        course = create_course(
+            name=f'benchmark-{faker.uuid4()}',
+            start_date=start_date,
+            end_date=start_date + timezone.timedelta(days=30),
+            repository=faker.url(),
+            slug_url=f'benchmark-{faker.uuid4()}',
+        )
+        task = create_included_task(course=course, week=course.weeks.first(), name='Benchmark', gradable=True)
+        language, _ = ProgrammingLanguage.objects.get_or_create(
+            name='python',
+            defaults={'test_format': 'tests.py', 'requirements_format': 'requirements.txt'}
+        )
+        create_test_for_task(task=task, language=language, code=faker.text())
+
+        user = BaseUser.objects.create(email=f'benchmark-{faker.email()}', password=None)
+        solutions = Solution.objects.bulk_create([
+            Solution(task=task, user=user, code=faker.text(), status=Solution.SUBMITTED_WITHOUT_GRADING)
+            for _ in range(count)
+        ])
+
+        return course, user, [solution.id for solution in solutions]
+
+    def handle(self, *args, **options):
+        grader = FakeGrader(
+            api_key='benchmark-key',
+            api_secret='benchmark-secret',
+            grading_latency=options['latency'],
+            latency_jitter=options['jitter'],
+            failure_rate=options['failure_rate'],
+        )
+        address = grader.start()
+        course, user, solution_ids = self.generate_solutions(options['solutions'])
+
+        try:
+            with override_settings(GRADER_ADDRESS=address,
+                                   GRADER_API_KEY='benchmark-key',
+                                   GRADER_API_SECRET='benchmark-secret',
+                                   GRADER_CALLBACK_URL='',
+                                   GRADER_POLLING_MODE=GRADER_POLLING_MODE_TASK,
+                                   GRADER_POOL_MAXSIZE=options['concurrency']):
+                reset_grader_session()
+
+                if options['use_async']:
+                    report = run_async_grading_benchmark(
+                        solution_ids=solution_ids,
+                        solution_model_repr='education.Solution',
+                        max_in_flight=options['concurrency']
+                    )
+                else:
+                    report = run_grading_benchmark(
+                        solution_ids=solution_ids,
+                        solution_model_repr='education.Solution',
+                        concurrency=options['concurrency']
+                    )
+        finally:
+            reset_grader_session()
+            grader.stop()
+            course.delete()
+            user.delete()
+
+        latency = report['latency']
+        print(f'Graded {report["solutions"]} solutions in {report["elapsed"]:.2f}s '
+              f'({report["throughput"]:.1f} solutions/s)')
+        print(f'End-to-end latency p50 / p95 / p99: '
+              f'{latency["p50"]:.2f}s / {latency["p95"]:.2f}s / {latency["p99"]:.2f}s')
+        if 'queries_per_solution' in report:
+            print(f'{report["queries_per_solution"]:.1f} queries per solution')
+        if 'errors' in report:
+            print(f'{report["errors"]} solutions failed')
+        print(f'{report["polls_per_solution"]:.1f} polls per solution')
+        print(f'Fake grader: {dict(grader.stats)}')
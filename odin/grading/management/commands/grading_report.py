@@ -0,0 +1,48 @@
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from odin.grading.deduplication import get_deduplication_statistics
+from odin.grading.metrics import GRADING_STAGES, REPORT_GROUPS, get_grading_counters, get_latency_report
+from odin.grading.polling import get_polling_statistics
+
+
+class Command(BaseCommand):
+    help = 'Prints grading stage latencies, polling and deduplication statistics.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help='Only include solutions from the last N days')
+
+    def handle(self, *args, **options):
+        solution_model = apps.get_model(settings.GRADER_SOLUTION_MODEL)
+        since = timezone.now() - timezone.timedelta(days=options['days'])
+
+        for group_by in REPORT_GROUPS:
+            print(f'Stage latency per {group_by} (p50 / p95 / p99 seconds):')
+
+            for group, stages in get_latency_report(solution_model=solution_model,
+                                                    since=since,
+                                                    group_by=group_by).items():
+                print(f'  {group}:')
+
+                for stage, _, _ in GRADING_STAGES:
+                    summary = stages[stage]
+
+                    if summary['count']:
+                        print(f'    {stage}: {summary["p50"]:.2f} / {summary["p95"]:.2f} / {summary["p99"]:.2f} '
+                              f'({summary["count"]} solutions)')
+
+        counters = get_grading_counters(solution_model=solution_model, since=since)
+        print(f'Counters: {counters["solutions"]} graded, {counters["polls"]} polls, '
+              f'{counters["submit_retries"]} submit retries, {counters["nonce_failures"]} nonce failures')
+
+        print('Polling:')
+        for key, stats in get_polling_statistics(solution_model=solution_model, since=since).items():
+            print(f'  {key}: {stats["count"]} graded, {stats["timed_out"]} timed out, '
+                  f'latency median {stats["latency_median"]:.1f}s / max {stats["latency_max"]:.1f}s, '
+                  f'polls median {stats["polls_median"]} / max {stats["polls_max"]}')
+
+        print('Deduplication:')
+        for course, stats in get_deduplication_statistics(solution_model=solution_model, since=since).items():
+            print(f'  {course}: {stats["deduplicated"]} of {stats["submitted"]} reused ({stats["hit_rate"]:.1%})')
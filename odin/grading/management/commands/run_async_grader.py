@@ -0,0 +1,39 @@
+import asyncio
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from odin.grading.async_client import AsyncGradingDispatcher
+
+
+class Command(BaseCommand):
+    help = 'Grades the solutions queued for grading with one long-lived asyncio dispatcher until SIGINT or SIGTERM. ' \
+           'Requires GRADER_ASYNC_DISPATCH, so the submissions are not published to Celery as well.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-in-flight', type=int, default=None)
+        parser.add_argument('--poll-interval', type=float, default=None,
+                            help='Seconds between two claims of queued solutions')
+
+    def handle(self, *args, **options):
+        if not settings.GRADER_ASYNC_DISPATCH:
+            raise CommandError('Set GRADER_ASYNC_DISPATCH, otherwise the solutions are graded by Celery.')
+
+        dispatcher = AsyncGradingDispatcher(
+            solution_model_repr=settings.GRADER_SOLUTION_MODEL,
+            max_in_flight=options['max_in_flight']
+        )
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, dispatcher.stop)
+
+        print(f'Grading with up to {dispatcher.max_in_flight} solutions in flight')
+
+        try:
+            loop.run_until_complete(dispatcher.serve(poll_interval=options['poll_interval']))
+        finally:
+            loop.close()
+            dispatcher.executor.shutdown()
@@ -0,0 +1,43 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from odin.grading.fake_grader import FakeGrader
+
+
+class Command(BaseCommand):
+    help = 'Runs a local stand-in for the grader, signed with GRADER_API_KEY and GRADER_API_SECRET.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8010)
+        parser.add_argument('--latency', type=float, default=1.0, help='Seconds until a run is graded')
+        parser.add_argument('--jitter', type=float, default=0.0, help='Random extra grading seconds')
+        parser.add_argument('--response-delay', type=float, default=0.0, help='Seconds before every response')
+        parser.add_argument('--failure-rate', type=float, default=0.0, help='Share of requests answered with 500')
+        parser.add_argument('--not-ok-rate', type=float, default=0.0, help='Share of runs graded as not_ok')
+
+    def handle(self, *args, **options):
+        grader = FakeGrader(
+            api_key=settings.GRADER_API_KEY,
+            api_secret=settings.GRADER_API_SECRET,
+            grading_latency=options['latency'],
+            latency_jitter=options['jitter'],
+            response_delay=options['response_delay'],
+            failure_rate=options['failure_rate'],
+            not_ok_rate=options['not_ok_rate'],
+            grade_path=settings.GRADER_GRADE_PATH,
+            check_path=settings.GRADER_CHECK_PATH,
+            nonce_path=settings.GRADER_GET_NONCE_PATH,
+        )
+        address = grader.start(host=options['host'], port=options['port'])
+
+        print(f'Fake grader listening on {address}, set GRADER_ADDRESS={address} to use it')
+
+        try:
+            while True:
+                time.sleep(60)
+                print(dict(grader.stats))
+        except KeyboardInterrupt:
+            grader.stop()
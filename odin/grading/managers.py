@@ -0,0 +1,49 @@
+from django.db import connections, models
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+
+class GraderRequestManager(models.Manager):
+    def allocate_nonce(self, request_info: str) -> int:
+        """
+        Increments and returns the nonce for `request_info` with a single upsert,
+        so concurrent workers never get the same nonce.
+        """
+        table = self.model._meta.db_table
+
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} (request_info, nonce) VALUES (%s, 1) '
+                f'ON CONFLICT (request_info) DO UPDATE SET nonce = {table}.nonce + 1 '
+                'RETURNING nonce',
+                [request_info]
+            )
+
+            return cursor.fetchone()[0]
+
+    def consume_nonce(self, request_info: str, nonce: int) -> bool:
+        """
+        Stores `nonce` as the last one seen for `request_info`.
+        Returns False when it is not greater than the stored one, i.e. the request is a replay.
+        """
+        table = self.model._meta.db_table
+
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} (request_info, nonce) VALUES (%s, %s) '
+                f'ON CONFLICT (request_info) DO UPDATE SET nonce = EXCLUDED.nonce '
+                f'WHERE {table}.nonce < EXCLUDED.nonce '
+                'RETURNING nonce',
+                [request_info, nonce]
+            )
+
+            return cursor.fetchone() is not None
+
+    def sync_nonce(self, request_info: str, nonce: int):
+        """
+        Moves the stored nonce forward to the one reported by the grader, never backwards.
+        """
+        updated = self.filter(request_info=request_info).update(nonce=Greatest(F('nonce'), nonce))
+
+        if not updated:
+            self.get_or_create(request_info=request_info, defaults={'nonce': nonce})
@@ -0,0 +1,117 @@
+import math
+from typing import Dict, List
+
+from django.db.models import Count, Model, Sum
+
+# (stage, start field, end field) of the grading pipeline
+GRADING_STAGES = (
+    ('enqueue', 'grading_requested_at', 'queued_at'),
+    ('queue_wait', 'queued_at', 'submit_started_at'),
+    ('submit', 'submit_started_at', 'grader_submitted_at'),
+    ('grading', 'grader_submitted_at', 'graded_at'),
+    ('total', 'queued_at', 'graded_at'),
+)
+
+REPORT_GROUPS = {
+    'language': 'task__test__language__name',
+    'course': 'task__course__name',
+}
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def get_percentile(values: List[float], quantile: float) -> float:
+    """
+    Nearest-rank percentile of already sorted `values`.
+    """
+    rank = max(math.ceil(quantile * len(values)), 1)
+
+    return values[rank - 1]
+
+
+def summarize_latencies(latencies: List[float]) -> Dict[str, float]:
+    latencies = sorted(latencies)
+    summary = {'count': len(latencies)}
+
+    for quantile in QUANTILES:
+        summary[f'p{int(quantile * 100)}'] = get_percentile(latencies, quantile) if latencies else None
+
+    return summary
+
+
+def get_graded_solutions_since(*, solution_model, since):
+    return solution_model.objects.filter(graded_at__gte=since, queued_at__isnull=False)
+
+
+def get_stage_latencies(*, solution_model, since, group_by: str=None) -> Dict[str, Dict[str, List[float]]]:
+    """
+    Seconds spent in every stage by the solutions graded since `since`, optionally grouped by a field lookup.
+    Stages that a solution skipped, e.g. the grader round trip of a deduplicated one, are left out,
+    and so are negative intervals, which mix timestamps of two grading runs.
+    """
+    fields = sorted({field for _, start, end in GRADING_STAGES for field in (start, end)})
+    group_field = group_by or 'id'
+
+    rows = get_graded_solutions_since(solution_model=solution_model, since=since).values(group_field, *fields)
+    grouped = {}
+
+    for row in rows:
+        group = str(row[group_field]) if group_by else 'all'
+        stages = grouped.setdefault(group, {stage: [] for stage, _, _ in GRADING_STAGES})
+
+        for stage, start, end in GRADING_STAGES:
+            if row[start] is None or row[end] is None or row[end] < row[start]:
+                continue
+
+            stages[stage].append((row[end] - row[start]).total_seconds())
+
+    return grouped
+
+
+def get_latency_report(*, solution_model, since, group_by: str) -> Dict[str, Dict[str, Dict]]:
+    grouped = get_stage_latencies(solution_model=solution_model, since=since, group_by=REPORT_GROUPS[group_by])
+
+    return {
+        group: {stage: summarize_latencies(latencies) for stage, latencies in stages.items()}
+        for group, stages in grouped.items()
+    }
+
+
+def get_grading_counters(*, solution_model, since) -> Dict[str, int]:
+    counters = get_graded_solutions_since(solution_model=solution_model, since=since).aggregate(
+        solutions=Count('id'),
+        polls=Sum('poll_count'),
+        submit_retries=Sum('submit_retries'),
+        nonce_failures=Sum('nonce_failures'),
+    )
+
+    return {key: value or 0 for key, value in counters.items()}
+
+
+def render_prometheus_metrics(*, solution_model: Model, since) -> str:
+    """
+    Text exposition format of the stage latency quantiles and counters for the solutions graded since `since`.
+    """
+    lines = [
+        '# HELP odin_grading_stage_seconds Time spent by solutions in each grading stage.',
+        '# TYPE odin_grading_stage_seconds summary',
+    ]
+
+    stages = get_stage_latencies(solution_model=solution_model, since=since).get('all', {})
+
+    for stage, _, _ in GRADING_STAGES:
+        latencies = sorted(stages.get(stage, []))
+
+        for quantile in QUANTILES:
+            if latencies:
+                value = get_percentile(latencies, quantile)
+                lines.append(f'odin_grading_stage_seconds{{stage="{stage}",quantile="{quantile}"}} {value}')
+
+        lines.append(f'odin_grading_stage_seconds_sum{{stage="{stage}"}} {sum(latencies)}')
+        lines.append(f'odin_grading_stage_seconds_count{{stage="{stage}"}} {len(latencies)}')
+
+    for name, value in get_grading_counters(solution_model=solution_model, since=since).items():
+        lines.append(f'# TYPE odin_grading_{name} gauge')
+        lines.append(f'odin_grading_{name} {value}')
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+def remove_duplicate_request_infos(apps, schema_editor):
+    GraderRequest = apps.get_model('grading', 'GraderRequest')
+    duplicates = GraderRequest.objects.values('request_info').annotate(
+        count=models.Count('id')
+    ).filter(count__gt=1)
+
+    for duplicate in duplicates:
+        requests = GraderRequest.objects.filter(request_info=duplicate['request_info']).order_by('-nonce', 'id')
+        kept = requests.first()
+        requests.exclude(id=kept.id).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grading', '0006_auto_20180418_1158'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_request_infos, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='graderrequest',
+            name='request_info',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+    ]
@@ -1,6 +1,10 @@
 from django.db import models
 
+from .managers import GraderRequestManager
+
 
 class GraderRequest(models.Model):
-    request_info = models.CharField(max_length=255)
+    request_info = models.CharField(max_length=255, unique=True)
     nonce = models.BigIntegerField(db_index=True)
+
+    objects = GraderRequestManager()
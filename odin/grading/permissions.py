@@ -0,0 +1,17 @@
+from rest_framework.permissions import BasePermission
+
+from .services import is_valid_grader_request
+
+
+class IsGraderPermission(BasePermission):
+    def has_permission(self, request, view):
+        meta = request.META
+
+        return is_valid_grader_request(
+            body=request.body,
+            req_and_resource=f'{request.method} {request.path}',
+            digest=meta.get('HTTP_AUTHENTICATION', ''),
+            date=meta.get('HTTP_DATE', ''),
+            api_key=meta.get('HTTP_X_API_KEY', ''),
+            nonce=meta.get('HTTP_X_NONCE_NUMBER', ''),
+        )
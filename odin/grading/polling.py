@@ -0,0 +1,152 @@
+from statistics import median
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import DurationField, ExpressionWrapper, F, Model, Q
+from django.utils import timezone
+
+from .helper import TEST_TYPES
+
+GRADER_POLLING_MODE_TASK = 'task'
+GRADER_POLLING_MODE_BATCH = 'batch'
+
+
+def get_solution_test_type(*, solution: Model) -> str:
+    if solution.task.test.is_source():
+        return TEST_TYPES['UNITTEST']
+
+    return TEST_TYPES['OUTPUT_CHECKING']
+
+
+def get_grading_duration_expression():
+    return ExpressionWrapper(F('graded_at') - F('grader_submitted_at'), output_field=DurationField())
+
+
+def get_graded_solutions(*, solution_model, language_id: int, test_type: str):
+    source_tests = Q(task__test__code__gt='')
+
+    if test_type == TEST_TYPES['UNITTEST']:
+        solutions = solution_model.objects.filter(source_tests)
+    else:
+        solutions = solution_model.objects.exclude(source_tests)
+
+    return solutions.filter(
+        task__test__language_id=language_id,
+        grader_submitted_at__isnull=False,
+        graded_at__isnull=False,
+    )
+
+
+def get_expected_grading_seconds(*, solution: Model) -> Optional[float]:
+    """
+    Median grading time of the last GRADER_EXPECTED_TIME_SAMPLE_SIZE solutions
+    with the same programming language and test type. Cached per language and test type.
+    """
+    language_id = solution.task.test.language_id
+    test_type = get_solution_test_type(solution=solution)
+    cache_key = f'expected_grading_seconds_{language_id}_{test_type}'
+
+    expected = cache.get(cache_key)
+
+    if expected is None:
+        durations = get_graded_solutions(
+            solution_model=type(solution),
+            language_id=language_id,
+            test_type=test_type
+        ).annotate(
+            duration=get_grading_duration_expression()
+        ).order_by('-id').values_list('duration', flat=True)[:settings.GRADER_EXPECTED_TIME_SAMPLE_SIZE]
+
+        durations = [duration.total_seconds() for duration in durations]
+        expected = median(durations) if durations else 0
+
+        cache.set(cache_key, expected, settings.GRADER_EXPECTED_TIME_CACHE_TIMEOUT)
+
+    return expected or None
+
+
+def get_first_polling_countdown(*, solution: Model) -> int:
+    """
+    Schedules the first poll close to the time solutions like this one usually take to grade.
+    """
+    if settings.GRADER_CALLBACK_URL:
+        return settings.GRADER_FALLBACK_POLLING_COUNTDOWN
+
+    expected = get_expected_grading_seconds(solution=solution)
+
+    if expected is None:
+        return settings.GRADER_POLLING_COUNTDOWN
+
+    return min(max(int(expected), 1), settings.GRADER_POLLING_MAX_COUNTDOWN)
+
+
+def get_polling_countdown(*, retries: int) -> int:
+    """
+    Exponential backoff after the first poll, capped at GRADER_POLLING_MAX_COUNTDOWN.
+    With the grader callback enabled, polling is only a fallback for lost callbacks.
+    """
+    if settings.GRADER_CALLBACK_URL:
+        return settings.GRADER_FALLBACK_POLLING_COUNTDOWN
+
+    countdown = settings.GRADER_POLLING_COUNTDOWN * 2 ** retries
+
+    return min(countdown, settings.GRADER_POLLING_MAX_COUNTDOWN)
+
+
+def is_polling_deadline_exceeded(*, solution: Model) -> bool:
+    if solution.grader_submitted_at is None:
+        return False
+
+    deadline = solution.grader_submitted_at + timezone.timedelta(seconds=settings.GRADER_POLLING_DEADLINE)
+
+    return timezone.now() > deadline
+
+
+def mark_solution_timed_out(*, solution: Model) -> Model:
+    solution.status = solution.TIMED_OUT
+    solution.graded_at = timezone.now()
+    solution.save()
+
+    return solution
+
+
+def get_polling_statistics(*, solution_model, since=None) -> Dict[str, Dict]:
+    """
+    Grading latency and poll count distributions per programming language and test type.
+    """
+    solutions = solution_model.objects.filter(
+        grader_submitted_at__isnull=False,
+        graded_at__isnull=False,
+    )
+
+    if since is not None:
+        solutions = solutions.filter(graded_at__gte=since)
+
+    rows = solutions.annotate(
+        duration=get_grading_duration_expression(),
+        language=F('task__test__language__name'),
+        test_code=F('task__test__code'),
+    ).values_list('language', 'test_code', 'duration', 'poll_count', 'status')
+
+    grouped = {}
+
+    for language, test_code, duration, poll_count, status in rows:
+        test_type = TEST_TYPES['UNITTEST'] if test_code else TEST_TYPES['OUTPUT_CHECKING']
+        group = grouped.setdefault(f'{language}/{test_type}', {'latencies': [], 'polls': [], 'timed_out': 0})
+
+        group['latencies'].append(duration.total_seconds())
+        group['polls'].append(poll_count)
+        group['timed_out'] += status == solution_model.TIMED_OUT
+
+    return {
+        key: {
+            'count': len(group['latencies']),
+            'timed_out': group['timed_out'],
+            'latency_median': median(group['latencies']),
+            'latency_max': max(group['latencies']),
+            'polls_median': median(group['polls']),
+            'polls_max': max(group['polls']),
+        }
+        for key, group in grouped.items()
+    }
@@ -1,11 +1,177 @@
+import hashlib
+import hmac
+import time
+from typing import Dict, Iterable, List, Optional
+
+from django.apps import apps
+from django.conf import settings
 from django.db import transaction
+from django.db.models import Model
+from django.utils import timezone
+
+from .models import GraderRequest
+
+
+def get_submission_priority(*, solution: Model) -> Optional[int]:
+    """
+    The sooner the week of the task ends, the higher the priority in the submit queue.
+    """
+    if solution.task.week is None:
+        return None
+
+    days_left = (solution.task.week.end_date - timezone.now().date()).days
+    max_priority = settings.CELERY_GRADING_MAX_PRIORITY
+
+    return min(max(max_priority - 1 - days_left, 1), max_priority)
+
+
+def mark_solutions_queued(*, solution_ids: List[int], solution_model: str):
+    """
+    Starts the stage timings of a (re)submission. Runs right before the submit tasks are published.
+    """
+    apps.get_model(solution_model).objects.filter(id__in=solution_ids).update(
+        queued_at=timezone.now(),
+        submit_started_at=None,
+        submit_claimed_until=None
+    )
 
 
 def start_grader_communication(*,
                                solution_id: int,
-                               solution_model: str
+                               solution_model: str,
+                               priority: int=None
                                ):
 
     from odin.grading.tasks import submit_solution
 
-    transaction.on_commit(lambda: submit_solution.delay(solution_id, solution_model))
+    def submit():
+        mark_solutions_queued(solution_ids=[solution_id], solution_model=solution_model)
+
+        if not settings.GRADER_ASYNC_DISPATCH:
+            submit_solution.apply_async(args=(solution_id, solution_model), priority=priority)
+
+    transaction.on_commit(submit)
+
+
+def start_bulk_grader_communication(*,
+                                    solution_ids: List[int],
+                                    solution_model: str
+                                    ):
+    """
+    Publishes all submissions as one group, so each solution still keeps its own retries.
+    They go to the bulk queue to keep interactive submissions fast.
+    With GRADER_ASYNC_DISPATCH the solutions are only marked as queued for the async dispatcher.
+    """
+
+    from celery import group
+
+    from odin.grading.tasks import submit_solution
+
+    submissions = group(
+        submit_solution.s(solution_id, solution_model).set(queue='grading_bulk')
+        for solution_id in solution_ids
+    )
+
+    def submit():
+        mark_solutions_queued(solution_ids=solution_ids, solution_model=solution_model)
+
+        if not settings.GRADER_ASYNC_DISPATCH:
+            submissions.apply_async()
+
+    transaction.on_commit(submit)
+
+
+def generate_grader_digest(*, body: str, date: str, nonce: str) -> str:
+    return generate_streamed_grader_digest(chunks=[body.encode('utf-8')], date=date, nonce=nonce)
+
+
+def generate_streamed_grader_digest(*, chunks: Iterable[bytes], date: str, nonce: str) -> str:
+    digest = hmac.new(bytearray(settings.GRADER_API_SECRET.encode('utf-8')), digestmod=hashlib.sha256)
+
+    for chunk in chunks:
+        digest.update(chunk)
+
+    digest.update((date + nonce).encode('utf-8'))
+
+    return digest.hexdigest()
+
+
+def get_grader_headers(*, body_chunks: Iterable[bytes], nonce: str) -> Dict[str, str]:
+    date = time.strftime("%c")
+    digest = generate_streamed_grader_digest(chunks=body_chunks, date=date, nonce=nonce)
+
+    return {
+        'Authentication': digest,
+        'Date': date,
+        'X-API-Key': settings.GRADER_API_KEY,
+        'X-Nonce-Number': nonce,
+    }
+
+
+def is_waiting_for_grader(*, solution: Model) -> bool:
+    return solution.status in (solution.PENDING, solution.RUNNING)
+
+
+def is_already_submitted(*, solution: Model) -> bool:
+    """
+    True when the current grading run was already accepted by the grader or graded,
+    e.g. for a submit task that is delivered again after its worker was lost.
+    """
+    return solution.grader_submitted_at is not None or solution.graded_at is not None
+
+
+def apply_grading_result(*,
+                         solution: Model,
+                         result_status: str,
+                         output) -> Model:
+
+    if result_status == 'ok':
+        solution.status = solution.OK
+    elif result_status == 'not_ok':
+        solution.status = solution.NOT_OK
+
+    solution.test_output = output
+    solution.graded_at = timezone.now()
+
+    return solution
+
+
+def save_grading_result(*,
+                        solution: Model,
+                        result_status: str,
+                        output) -> Model:
+
+    apply_grading_result(solution=solution, result_status=result_status, output=output)
+    solution.save()
+
+    return solution
+
+
+def is_valid_grader_request(*,
+                            body: bytes,
+                            req_and_resource: str,
+                            digest: str,
+                            date: str,
+                            api_key: str,
+                            nonce: str) -> bool:
+    """
+    Verifies a request sent by the grader with the same HMAC scheme we use towards it.
+    Every nonce is accepted only once and must be greater than the last accepted one.
+    """
+    if not settings.GRADER_API_SECRET or not all([digest, date, api_key, nonce]):
+        return False
+
+    if not hmac.compare_digest(api_key, settings.GRADER_API_KEY):
+        return False
+
+    expected_digest = generate_grader_digest(body=body.decode('utf-8'), date=date, nonce=nonce)
+
+    if not hmac.compare_digest(digest, expected_digest):
+        return False
+
+    try:
+        nonce = int(nonce)
+    except ValueError:
+        return False
+
+    return GraderRequest.objects.consume_nonce(req_and_resource, nonce)
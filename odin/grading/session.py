@@ -0,0 +1,96 @@
+import os
+import threading
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from django.conf import settings
+
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def _create_grader_session() -> requests.Session:
+    """
+    Only connection errors are retried - the request has not reached the grader then.
+    Resending a request that did reach it would reuse an already consumed nonce.
+    """
+    retries = Retry(
+        total=settings.GRADER_CONNECT_RETRIES,
+        connect=settings.GRADER_CONNECT_RETRIES,
+        read=0,
+        status=0,
+        backoff_factor=0.1,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=settings.GRADER_POOL_CONNECTIONS,
+        pool_maxsize=settings.GRADER_POOL_MAXSIZE,
+        max_retries=retries,
+    )
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    return session
+
+
+def get_grader_session() -> requests.Session:
+    """
+    Returns the keep-alive session shared by every GraderClient in the current process.
+    A new session is created after a fork, so worker processes never share sockets.
+    """
+    global _session, _session_pid
+
+    pid = os.getpid()
+
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = _create_grader_session()
+                _session_pid = pid
+
+    return _session
+
+
+def reset_grader_session():
+    global _session, _session_pid
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+
+        _session = None
+        _session_pid = None
+
+
+def get_grader_session_stats() -> Dict[str, int]:
+    """
+    Connection pool metrics of the current process, used for sizing the grading workers.
+    """
+    stats = {
+        'pools': 0,
+        'pool_maxsize': settings.GRADER_POOL_MAXSIZE,
+        'connections_opened': 0,
+        'requests_sent': 0,
+        'idle_connections': 0,
+    }
+
+    if _session is None or _session_pid != os.getpid():
+        return stats
+
+    for adapter in set(_session.adapters.values()):
+        for key in adapter.poolmanager.pools.keys():
+            pool = adapter.poolmanager.pools[key]
+
+            stats['pools'] += 1
+            stats['connections_opened'] += pool.num_connections
+            stats['requests_sent'] += pool.num_requests
+            stats['idle_connections'] += pool.pool.qsize() if pool.pool is not None else 0
+
+    return stats
@@ -0,0 +1,4 @@
+from django.dispatch import Signal
+
+# Sent with the solutions whose results were written with bulk updates, which skip post_save
+solutions_graded = Signal(providing_args=['solutions'])
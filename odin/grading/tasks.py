@@ -5,27 +5,59 @@ from requests.exceptions import Timeout, ConnectionError
 
 from django.conf import settings
 from django.apps import apps
+from django.db.models import F
+from django.utils import timezone
 
 from .client import GraderClient
 from .helper import get_grader_ready_data
+from .batch import poll_solutions_in_batch
+from .deduplication import deduplicate_solution
 from .exceptions import PollingError
+from .services import is_already_submitted
+from .polling import (
+    GRADER_POLLING_MODE_BATCH,
+    get_polling_countdown,
+    is_polling_deadline_exceeded,
+    mark_solution_timed_out,
+)
 
 
-@shared_task(bind=True, max_retries=None)
+# Only the grading tasks ack late. They are safe to run again when a lost worker's message is redelivered.
+@shared_task(bind=True, max_retries=None, acks_late=True)
 def poll_solution(self, solution_id, solution_model):
     grader_client = GraderClient(solution_model_repr=solution_model,
                                  settings_module=settings,
                                  grader_ready_data={})
     try:
         grader_client.poll_grader(solution_id)
-    except PollingError as exc:
-        raise self.retry(exc=exc, countdown=settings.GRADER_POLLING_COUNTDOWN)
+    except (PollingError, Timeout, ConnectionError) as exc:
+        solution = apps.get_model(solution_model).objects.get(id=solution_id)
 
+        if is_polling_deadline_exceeded(solution=solution):
+            mark_solution_timed_out(solution=solution)
+            return
 
-@shared_task(bind=True, max_retries=None)
+        raise self.retry(exc=exc, countdown=get_polling_countdown(retries=self.request.retries))
+
+
+@shared_task(bind=True, max_retries=None, acks_late=True)
 def submit_solution(self, solution_id, solution_model):
     solution_model_repr = solution_model
     solution_model = apps.get_model(solution_model)
+
+    solution_model.objects.filter(id=solution_id, submit_started_at__isnull=True).update(
+        submit_started_at=timezone.now()
+    )
+    solution = solution_model.objects.get(id=solution_id)
+
+    # A redelivered message must not start a second poll chain,
+    # the submission that went out to the grader has already scheduled one
+    if is_already_submitted(solution=solution):
+        return
+
+    if deduplicate_solution(solution=solution):
+        return
+
     grader_ready_data = get_grader_ready_data(solution_id, solution_model)
     grader_client = GraderClient(solution_model_repr=solution_model_repr,
                                  settings_module=settings,
@@ -33,4 +65,13 @@ def submit_solution(self, solution_id, solution_model):
     try:
         grader_client.submit_request_to_grader(solution_id, poll_solution)
     except (Timeout, ConnectionError) as exc:
+        solution_model.objects.filter(id=solution_id).update(submit_retries=F('submit_retries') + 1)
         raise self.retry(exc=exc, countdown=settings.GRADER_RESUBMIT_COUNTDOWN)
+
+
+@shared_task(acks_late=True)
+def poll_waiting_solutions(solution_model=None):
+    if settings.GRADER_POLLING_MODE != GRADER_POLLING_MODE_BATCH:
+        return
+
+    return poll_solutions_in_batch(solution_model_repr=solution_model or settings.GRADER_SOLUTION_MODEL)
@@ -0,0 +1,77 @@
+import json
+import time
+
+from django.test import TestCase, Client, override_settings
+from django.shortcuts import reverse
+
+from odin.common.faker import faker
+
+from odin.education.factories import SolutionFactory
+from odin.education.models import Solution
+
+from odin.grading.services import generate_grader_digest
+
+client = Client()
+
+
+@override_settings(GRADER_API_KEY='grader-key', GRADER_API_SECRET='grader-secret')
+class GraderCallbackApiTests(TestCase):
+    def setUp(self):
+        self.url = reverse('api:grading:callback')
+        self.solution = SolutionFactory(status=Solution.PENDING, build_id=faker.pyint())
+        self.nonce = 1
+
+    def post_result(self, data, *, secret_body=None, nonce=None):
+        body = json.dumps(data)
+        date = time.strftime("%c")
+        nonce = str(nonce or self.nonce)
+        digest = generate_grader_digest(body=secret_body or body, date=date, nonce=nonce)
+
+        return client.post(
+            self.url,
+            data=body,
+            content_type='application/json',
+            HTTP_AUTHENTICATION=digest,
+            HTTP_DATE=date,
+            HTTP_X_API_KEY='grader-key',
+            HTTP_X_NONCE_NUMBER=nonce,
+        )
+
+    def get_result_data(self, result_status='ok'):
+        return {
+            'run_id': self.solution.build_id,
+            'result_status': result_status,
+            'output': {'test_status': faker.word()},
+        }
+
+    def test_signed_callback_saves_grading_result(self):
+        response = self.post_result(self.get_result_data())
+
+        self.solution.refresh_from_db()
+        self.assertEqual(202, response.status_code)
+        self.assertEqual(Solution.OK, self.solution.status)
+
+    def test_callback_with_invalid_signature_is_rejected(self):
+        response = self.post_result(self.get_result_data(), secret_body='tampered')
+
+        self.solution.refresh_from_db()
+        self.assertEqual(403, response.status_code)
+        self.assertEqual(Solution.PENDING, self.solution.status)
+
+    def test_replayed_callback_nonce_is_rejected(self):
+        self.post_result(self.get_result_data(), nonce=5)
+        response = self.post_result(self.get_result_data('not_ok'), nonce=5)
+
+        self.solution.refresh_from_db()
+        self.assertEqual(403, response.status_code)
+        self.assertEqual(Solution.OK, self.solution.status)
+
+    def test_callback_does_not_overwrite_finished_solution(self):
+        self.solution.status = Solution.NOT_OK
+        self.solution.save()
+
+        response = self.post_result(self.get_result_data())
+
+        self.solution.refresh_from_db()
+        self.assertEqual(202, response.status_code)
+        self.assertEqual(Solution.NOT_OK, self.solution.status)
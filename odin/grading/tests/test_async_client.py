@@ -0,0 +1,121 @@
+import asyncio
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from odin.education.factories import (
+    SolutionFactory,
+    IncludedTaskFactory,
+    SourceCodeTestFactory,
+    ProgrammingLanguageFactory,
+)
+from odin.education.models import IncludedTask, Solution
+
+from odin.grading.async_client import (
+    AsyncGradingDispatcher,
+    call_with_db,
+    claim_queued_solutions,
+    grade_solutions_async,
+)
+from odin.grading.fake_grader import FakeGrader
+from odin.grading.services import mark_solutions_queued
+
+
+class AsyncGradingDispatcherTests(TransactionTestCase):
+    """
+    The ORM calls of the dispatcher run in a thread pool, on connections that
+    cannot see the data of a TestCase transaction.
+    """
+    def setUp(self):
+        self.grader = FakeGrader(api_key='fake-key', api_secret='fake-secret', grading_latency=0)
+        self.address = self.grader.start()
+
+        task = IncludedTaskFactory(gradable=True)
+        SourceCodeTestFactory._create(IncludedTask, task=task, language=ProgrammingLanguageFactory(name='python'))
+        self.solutions = SolutionFactory.create_batch(5, task=task, status=Solution.SUBMITTED_WITHOUT_GRADING)
+
+    def tearDown(self):
+        self.grader.stop()
+
+    def grader_settings(self):
+        return override_settings(GRADER_ADDRESS=self.address,
+                                 GRADER_API_KEY='fake-key',
+                                 GRADER_API_SECRET='fake-secret',
+                                 GRADER_CALLBACK_URL='',
+                                 GRADER_POLLING_COUNTDOWN=0)
+
+    def test_all_solutions_are_graded_through_the_fake_grader(self):
+        with self.grader_settings():
+            results = grade_solutions_async(
+                solution_ids=[solution.id for solution in self.solutions],
+                solution_model_repr='education.Solution',
+                max_in_flight=2
+            )
+
+        self.assertEqual({solution.id for solution in self.solutions}, set(results))
+        self.assertFalse([result for result in results.values() if isinstance(result, Exception)])
+        self.assertEqual(5, Solution.objects.filter(status=Solution.OK).count())
+        self.assertEqual(5, self.grader.stats['submissions'])
+        self.assertEqual(0, self.grader.stats['invalid_signatures'])
+        self.assertEqual(0, self.grader.stats['nonce_failures'])
+
+    def test_serve_grades_queued_solutions_until_stopped(self):
+        solution_ids = [solution.id for solution in self.solutions]
+        mark_solutions_queued(solution_ids=solution_ids, solution_model='education.Solution')
+        dispatcher = AsyncGradingDispatcher(solution_model_repr='education.Solution', max_in_flight=2)
+        loop = asyncio.new_event_loop()
+
+        def count_graded():
+            return call_with_db(Solution.objects.filter(status=Solution.OK).count)
+
+        async def stop_when_graded():
+            while await asyncio.get_event_loop().run_in_executor(dispatcher.executor, count_graded) < 5:
+                await asyncio.sleep(0.05)
+
+            dispatcher.stop()
+
+        with self.grader_settings():
+            try:
+                loop.run_until_complete(asyncio.wait_for(
+                    asyncio.gather(dispatcher.serve(poll_interval=0.05), stop_when_graded()),
+                    timeout=30
+                ))
+            finally:
+                loop.close()
+                dispatcher.executor.shutdown()
+
+        self.assertEqual(5, self.grader.stats['submissions'])
+        self.assertEqual(0, self.grader.stats['nonce_failures'])
+        self.assertFalse(Solution.objects.filter(id__in=solution_ids, submit_started_at__isnull=True).exists())
+
+
+class ClaimQueuedSolutionsTests(TestCase):
+    def setUp(self):
+        self.solution = SolutionFactory(status=Solution.SUBMITTED_WITHOUT_GRADING)
+        mark_solutions_queued(solution_ids=[self.solution.id], solution_model='education.Solution')
+
+    def claim(self):
+        return claim_queued_solutions(solution_model=Solution, limit=10, claim_seconds=60)
+
+    def test_claimed_solution_is_not_claimed_again_before_the_claim_expires(self):
+        self.assertEqual([self.solution.id], self.claim())
+        self.assertEqual([], self.claim())
+
+    def test_solution_of_an_expired_claim_is_claimed_again(self):
+        self.claim()
+        Solution.objects.filter(id=self.solution.id).update(
+            submit_started_at=timezone.now(),
+            submit_claimed_until=timezone.now() - timezone.timedelta(seconds=1)
+        )
+
+        self.assertEqual([self.solution.id], self.claim())
+
+    def test_graded_solution_is_not_claimed_again_after_the_claim_expires(self):
+        self.claim()
+        Solution.objects.filter(id=self.solution.id).update(
+            status=Solution.OK,
+            graded_at=timezone.now(),
+            submit_claimed_until=timezone.now() - timezone.timedelta(seconds=1)
+        )
+
+        self.assertEqual([], self.claim())
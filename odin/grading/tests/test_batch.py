@@ -0,0 +1,165 @@
+import json
+from unittest import mock
+
+from requests import Response
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from odin.common.faker import faker
+
+from odin.education.factories import SolutionFactory
+from odin.education.models import Solution, StudentTaskProgress
+
+from odin.grading.batch import poll_solutions_in_batch
+from odin.grading.fake_grader import FakeGrader
+from odin.grading.session import get_grader_session, reset_grader_session
+
+
+def make_response(status_code, data=None):
+    response = Response()
+    response.status_code = status_code
+    response._content = json.dumps(data or {}).encode('utf-8')
+
+    return response
+
+
+@override_settings(GRADER_POLLING_DEADLINE=600)
+class PollSolutionsInBatchTests(TestCase):
+    def create_waiting_solution(self, submitted_seconds_ago=10):
+        return SolutionFactory(
+            status=Solution.PENDING,
+            check_status_location=f'https://grader.example.com/check_result/{faker.pyint()}/',
+            grader_submitted_at=timezone.now() - timezone.timedelta(seconds=submitted_seconds_ago),
+        )
+
+    def poll(self, responses_by_url):
+        with mock.patch.object(get_grader_session(), 'get', side_effect=lambda url, **kwargs: responses_by_url[url]):
+            return poll_solutions_in_batch(solution_model_repr='education.Solution')
+
+    def test_finished_solutions_are_saved_and_the_rest_keep_waiting(self):
+        graded = self.create_waiting_solution()
+        waiting = self.create_waiting_solution()
+
+        stats = self.poll({
+            graded.check_status_location: make_response(200, {'result_status': 'ok', 'output': {'test': 'ok'}}),
+            waiting.check_status_location: make_response(204),
+        })
+
+        graded.refresh_from_db()
+        waiting.refresh_from_db()
+        self.assertEqual({'polled': 2, 'graded': 1, 'timed_out': 0, 'waiting': 1}, stats)
+        self.assertEqual(Solution.OK, graded.status)
+        self.assertEqual({'test': 'ok'}, graded.test_output)
+        self.assertIsNotNone(graded.graded_at)
+        self.assertEqual(Solution.PENDING, waiting.status)
+        self.assertEqual(1, waiting.poll_count)
+
+    def test_finished_solutions_update_student_task_progress(self):
+        solution = self.create_waiting_solution()
+
+        self.poll({
+            solution.check_status_location: make_response(200, {'result_status': 'ok', 'output': {}}),
+        })
+
+        self.assertTrue(StudentTaskProgress.objects.get(user=solution.user, task=solution.task).passed)
+
+    def test_solutions_past_the_deadline_are_timed_out(self):
+        solution = self.create_waiting_solution(submitted_seconds_ago=601)
+
+        stats = self.poll({solution.check_status_location: make_response(204)})
+
+        solution.refresh_from_db()
+        self.assertEqual(1, stats['timed_out'])
+        self.assertEqual(Solution.TIMED_OUT, solution.status)
+
+    def test_claimed_solutions_are_skipped_by_overlapping_sweeps(self):
+        claimed = self.create_waiting_solution()
+        Solution.objects.filter(id=claimed.id).update(poll_claimed_until=timezone.now() + timezone.timedelta(minutes=1))
+
+        stats = self.poll({})
+
+        claimed.refresh_from_db()
+        self.assertEqual(0, stats['polled'])
+        self.assertEqual(0, claimed.poll_count)
+
+    def test_claims_are_released_after_the_sweep(self):
+        solution = self.create_waiting_solution()
+
+        self.poll({solution.check_status_location: make_response(204)})
+
+        solution.refresh_from_db()
+        self.assertIsNone(solution.poll_claimed_until)
+
+    def test_result_is_dropped_when_the_solution_stopped_waiting_while_it_was_polled(self):
+        solution = self.create_waiting_solution()
+
+        def graded_by_the_callback_meanwhile(url, **kwargs):
+            Solution.objects.filter(id=solution.id).update(status=Solution.NOT_OK, test_output={'from': 'callback'})
+            return make_response(200, {'result_status': 'ok', 'output': {'from': 'poll'}})
+
+        with mock.patch.object(get_grader_session(), 'get', side_effect=graded_by_the_callback_meanwhile):
+            poll_solutions_in_batch(solution_model_repr='education.Solution')
+
+        solution.refresh_from_db()
+        self.assertEqual(Solution.NOT_OK, solution.status)
+        self.assertEqual({'from': 'callback'}, solution.test_output)
+
+    @override_settings(CELERY_TASK_SOFT_TIME_LIMIT=15, GRADER_REQUEST_TIMEOUT=10)
+    def test_nonce_retry_is_not_sent_when_it_could_exceed_the_time_limit(self):
+        solution = self.create_waiting_solution()
+        nonce_failure = make_response(403)
+        nonce_failure._content = b'Nonce check failed'
+
+        with mock.patch.object(get_grader_session(), 'get', return_value=nonce_failure) as get:
+            stats = poll_solutions_in_batch(solution_model_repr='education.Solution')
+
+        solution.refresh_from_db()
+        self.assertEqual(1, get.call_count)
+        self.assertEqual(0, stats['polled'])
+        self.assertEqual(1, solution.nonce_failures)
+        self.assertIsNone(solution.poll_claimed_until)
+
+    @override_settings(CELERY_TASK_SOFT_TIME_LIMIT=5, GRADER_REQUEST_TIMEOUT=10)
+    def test_nothing_is_sent_when_a_request_could_exceed_the_time_limit(self):
+        solution = self.create_waiting_solution()
+
+        stats = self.poll({solution.check_status_location: make_response(204)})
+
+        solution.refresh_from_db()
+        self.assertEqual(0, stats['polled'])
+        self.assertIsNone(solution.poll_claimed_until)
+
+
+@override_settings(GRADER_POLLING_DEADLINE=600,
+                   GRADER_API_KEY='fake-key',
+                   GRADER_API_SECRET='fake-secret',
+                   GRADER_CALLBACK_URL='')
+class PollSolutionsInBatchWithFakeGraderTests(TestCase):
+    def setUp(self):
+        self.grader = FakeGrader(api_key='fake-key', api_secret='fake-secret', grading_latency=0)
+        self.address = self.grader.start()
+        reset_grader_session()
+
+    def tearDown(self):
+        self.grader.stop()
+        reset_grader_session()
+
+    def test_every_poll_of_the_batch_passes_the_increasing_nonce_check(self):
+        solutions = []
+
+        for _ in range(10):
+            run_id = self.grader.create_run()
+            solutions.append(SolutionFactory(
+                status=Solution.PENDING,
+                build_id=run_id,
+                check_status_location=self.address + f'/check_result/{run_id}/',
+                grader_submitted_at=timezone.now(),
+            ))
+
+        with override_settings(GRADER_ADDRESS=self.address):
+            stats = poll_solutions_in_batch(solution_model_repr='education.Solution')
+
+        self.assertEqual(10, stats['graded'])
+        self.assertEqual(0, self.grader.stats['nonce_failures'])
+        self.assertEqual(10, Solution.objects.filter(id__in=[s.id for s in solutions], status=Solution.OK).count())
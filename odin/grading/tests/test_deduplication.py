@@ -0,0 +1,115 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+
+from odin.common.faker import faker
+
+from odin.education.factories import (
+    SolutionFactory,
+    IncludedTaskFactory,
+    SourceCodeTestFactory,
+    ProgrammingLanguageFactory,
+)
+from odin.education.models import IncludedTask, RegradeJob, Solution
+from odin.education.services import create_test_for_task
+
+from odin.grading.deduplication import (
+    deduplicate_solution,
+    find_graded_duplicate,
+    get_solution_code_hash,
+    get_test_version,
+)
+
+
+class DeduplicateSolutionTests(TestCase):
+    def setUp(self):
+        self.task = IncludedTaskFactory(gradable=True)
+        self.task.course.deduplicate_solutions = True
+        self.task.course.save()
+        self.test = SourceCodeTestFactory._create(
+            IncludedTask,
+            task=self.task,
+            language=ProgrammingLanguageFactory(name='python')
+        )
+        self.code = faker.text()
+
+    def create_graded_solution(self):
+        solution = SolutionFactory(task=self.task, code=self.code, status=Solution.OK, test_output={'ok': True})
+        solution.code_hash = get_solution_code_hash(solution=solution)
+        solution.save()
+
+        return solution
+
+    def test_identical_solution_copies_the_graded_result(self):
+        graded = self.create_graded_solution()
+        solution = SolutionFactory(task=self.task, code=f'{self.code}\r\n', status=Solution.PENDING)
+
+        self.assertTrue(deduplicate_solution(solution=solution))
+
+        solution.refresh_from_db()
+        self.assertEqual(Solution.OK, solution.status)
+        self.assertEqual({'ok': True}, solution.test_output)
+        self.assertEqual(graded, solution.deduplicated_from)
+
+    def test_solution_is_graded_when_the_course_does_not_deduplicate(self):
+        self.task.course.deduplicate_solutions = False
+        self.task.course.save()
+        self.create_graded_solution()
+        solution = SolutionFactory(task=self.task, code=self.code, status=Solution.PENDING)
+
+        self.assertFalse(deduplicate_solution(solution=solution))
+
+        solution.refresh_from_db()
+        self.assertEqual(Solution.PENDING, solution.status)
+        self.assertIsNotNone(solution.code_hash)
+
+    def test_results_for_an_older_test_version_are_not_reused(self):
+        self.create_graded_solution()
+        self.test.code = faker.text()
+        self.test.save()
+        solution = SolutionFactory(task=self.task, code=self.code, status=Solution.PENDING)
+
+        self.assertFalse(deduplicate_solution(solution=solution))
+
+    def test_graded_solution_of_another_task_is_not_a_duplicate(self):
+        graded = self.create_graded_solution()
+        other_task = IncludedTaskFactory(course=self.task.course, gradable=True)
+        solution = SolutionFactory(task=other_task, code=self.code, status=Solution.PENDING)
+        solution.code_hash = graded.code_hash
+
+        self.assertIsNone(find_graded_duplicate(solution=solution))
+
+    def test_solution_in_a_regrade_job_is_always_graded(self):
+        self.create_graded_solution()
+        solution = SolutionFactory(task=self.task, code=self.code, status=Solution.PENDING)
+        RegradeJob.objects.create(course=self.task.course, task=self.task).solutions.add(solution)
+
+        self.assertFalse(deduplicate_solution(solution=solution))
+
+        solution.refresh_from_db()
+        self.assertEqual(Solution.PENDING, solution.status)
+        self.assertIsNone(solution.deduplicated_from)
+
+
+class GetTestVersionTests(TestCase):
+    def setUp(self):
+        self.language = ProgrammingLanguageFactory(name='java')
+        self.content = faker.text().encode('utf-8')
+
+    def create_file_test(self, *, content):
+        return create_test_for_task(
+            task=IncludedTaskFactory(),
+            language=self.language,
+            file=SimpleUploadedFile('file.jar', content)
+        )
+
+    def test_files_with_the_same_content_make_the_same_version(self):
+        test = self.create_file_test(content=self.content)
+        other_test = self.create_file_test(content=self.content)
+
+        self.assertEqual(get_test_version(test=test), get_test_version(test=other_test))
+
+    def test_new_file_under_the_same_name_makes_a_new_version(self):
+        test = self.create_file_test(content=self.content)
+        other_test = self.create_file_test(content=self.content + b'\0')
+
+        self.assertNotEqual(get_test_version(test=test), get_test_version(test=other_test))
@@ -0,0 +1,76 @@
+from django.test import TestCase, override_settings
+
+from odin.education.factories import (
+    SolutionFactory,
+    IncludedTaskFactory,
+    SourceCodeTestFactory,
+    ProgrammingLanguageFactory,
+)
+from odin.education.models import IncludedTask, Solution
+
+from odin.grading.benchmark import grade_solution
+from odin.grading.fake_grader import FakeGrader
+from odin.grading.session import reset_grader_session
+
+
+class FakeGraderTests(TestCase):
+    def setUp(self):
+        self.grader = FakeGrader(api_key='fake-key', api_secret='fake-secret', grading_latency=0)
+        self.address = self.grader.start()
+        reset_grader_session()
+
+        task = IncludedTaskFactory(gradable=True)
+        SourceCodeTestFactory._create(IncludedTask, task=task, language=ProgrammingLanguageFactory(name='python'))
+        self.solution = SolutionFactory(task=task, status=Solution.SUBMITTED_WITHOUT_GRADING)
+
+    def tearDown(self):
+        self.grader.stop()
+        reset_grader_session()
+
+    def test_solution_is_graded_through_the_fake_grader(self):
+        with override_settings(GRADER_ADDRESS=self.address,
+                               GRADER_API_KEY='fake-key',
+                               GRADER_API_SECRET='fake-secret',
+                               GRADER_CALLBACK_URL='',
+                               GRADER_POLLING_MODE='task',
+                               GRADER_POLLING_COUNTDOWN=0):
+            result = grade_solution(solution_id=self.solution.id, solution_model_repr='education.Solution')
+
+        self.solution.refresh_from_db()
+        self.assertEqual(Solution.OK, self.solution.status)
+        self.assertEqual(1, result['polls'])
+        self.assertFalse(result['error'])
+        self.assertEqual(1, self.grader.stats['submissions'])
+        self.assertEqual(0, self.grader.stats['invalid_signatures'])
+
+    def test_polling_stops_at_the_deadline_when_the_grader_never_finishes(self):
+        self.grader.grading_latency = 60
+
+        with override_settings(GRADER_ADDRESS=self.address,
+                               GRADER_API_KEY='fake-key',
+                               GRADER_API_SECRET='fake-secret',
+                               GRADER_CALLBACK_URL='',
+                               GRADER_POLLING_MODE='task',
+                               GRADER_POLLING_COUNTDOWN=1,
+                               GRADER_POLLING_DEADLINE=0):
+            result = grade_solution(solution_id=self.solution.id, solution_model_repr='education.Solution')
+
+        self.assertTrue(result['error'])
+        self.assertEqual(0, result['polls'])
+
+    def test_nonces_must_be_strictly_increasing(self):
+        def get_error(nonce):
+            headers = {
+                'X-API-Key': 'fake-key',
+                'Date': 'today',
+                'X-Nonce-Number': str(nonce),
+                'Authentication': self.grader.get_digest(body=b'{}', date='today', nonce=str(nonce)),
+            }
+
+            return self.grader.get_request_error(body=b'{}', headers=headers, req_and_resource='POST /grade')
+
+        self.assertIsNone(get_error(5))
+        self.assertEqual('Nonce check failed', get_error(3))
+        self.assertEqual('Nonce check failed', get_error(5))
+        self.assertIsNone(get_error(6))
+        self.assertEqual(6, self.grader.get_last_nonce('POST /grade'))
@@ -1,4 +1,11 @@
-from django.test import TestCase
+import base64
+import io
+import json
+import tarfile
+
+from django.test import TestCase, override_settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
 
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.exceptions import ValidationError
@@ -20,7 +27,16 @@ from odin.education.models import (
     Solution,
 )
 
-from odin.grading.helper import get_grader_ready_data
+from odin.grading.helper import (
+    get_grader_ready_data,
+    get_test_resource,
+    generate_tests_archive,
+    generate_test_resource,
+    encode_file_in_chunks,
+    iter_grader_payload,
+    GraderPayload,
+    StreamedFile,
+)
 
 
 class GradingHelperTests(TestCase):
@@ -181,3 +197,95 @@ class GradingHelperTests(TestCase):
 
         self.assertIsInstance(data, dict)
         self.assertFalse(data['extra_options'] == {})
+
+
+class GradingTestResourceCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.task = IncludedTaskFactory(gradable=True)
+        self.test = SourceCodeTestFactory._create(
+            IncludedTask,
+            task=self.task,
+            language=ProgrammingLanguageFactory(name='python')
+        )
+        self.test.requirements = 'Faker==0.8.12'
+        self.test.save()
+
+    @patch('odin.grading.helper.generate_test_resource', return_value='archive')
+    def test_test_resource_is_generated_once_for_the_same_test_content(self, generate_test_resource_mock):
+        for _ in range(3):
+            self.assertEqual('archive', get_test_resource(test=self.test))
+
+        self.assertEqual(1, generate_test_resource_mock.call_count)
+
+    @patch('odin.grading.helper.generate_test_resource', return_value='archive')
+    def test_test_resource_is_generated_again_when_the_test_changes(self, generate_test_resource_mock):
+        get_test_resource(test=self.test)
+
+        self.test.code = faker.text()
+        self.test.save()
+        get_test_resource(test=self.test)
+
+        self.assertEqual(2, generate_test_resource_mock.call_count)
+
+
+class GradingTestsArchiveTests(TestCase):
+    def read_archive(self, archive):
+        with tarfile.open(fileobj=io.BytesIO(archive), mode='r:gz') as tar:
+            return {member.name: tar.extractfile(member).read() for member in tar.getmembers()}
+
+    def test_generate_tests_archive_contains_all_files(self):
+        files = {
+            'tests.py': faker.text(),
+            'fixtures/data.bin': faker.binary(length=64),
+            'requirements.txt': None,
+        }
+
+        contents = self.read_archive(generate_tests_archive(files=files))
+
+        self.assertEqual({'tests.py', 'fixtures/data.bin'}, set(contents))
+        self.assertEqual(files['tests.py'].encode('UTF-8'), contents['tests.py'])
+        self.assertEqual(files['fixtures/data.bin'], contents['fixtures/data.bin'])
+
+    def test_generate_test_resource_encodes_test_and_requirements(self):
+        task = IncludedTaskFactory(gradable=True)
+        language = ProgrammingLanguageFactory(name='python')
+        test = SourceCodeTestFactory._create(IncludedTask, task=task, language=language)
+        test.requirements = 'Faker==0.8.12'
+        test.save()
+
+        contents = self.read_archive(base64.b64decode(generate_test_resource(test=test)))
+
+        self.assertEqual(test.code.encode('UTF-8'), contents[language.test_format])
+        self.assertEqual(b'Faker==0.8.12', contents[language.requirements_format])
+
+
+@override_settings(GRADER_ENCODING_CHUNK_SIZE=4)
+class GradingStreamedPayloadTests(TestCase):
+    def setUp(self):
+        self.content = faker.binary(length=1000)
+
+    def test_file_encoded_in_chunks_matches_encoding_it_at_once(self):
+        for chunk_size in (1, 4, 7, 999, 2048):
+            encoded = b''.join(encode_file_in_chunks(file=ContentFile(self.content), chunk_size=chunk_size))
+
+            self.assertEqual(base64.b64encode(self.content), encoded)
+
+    def test_streamed_payload_matches_json_dumps_of_the_encoded_data(self):
+        data = {'language': 'java', 'solution': StreamedFile(ContentFile(self.content)), 'extra_options': {}}
+        expected = json.dumps({**data, 'solution': base64.b64encode(self.content).decode('ascii')})
+
+        self.assertEqual(expected.encode('UTF-8'), b''.join(iter_grader_payload(data)))
+
+    def test_file_is_closed_once_it_is_encoded(self):
+        file = ContentFile(self.content)
+
+        with patch.object(file, 'close') as close:
+            b''.join(encode_file_in_chunks(file=file, chunk_size=64))
+
+        close.assert_called_once_with()
+
+    def test_grader_payload_streams_the_whole_body_on_every_iteration(self):
+        payload = GraderPayload({'solution': StreamedFile(ContentFile(self.content)), 'extra_options': {}})
+
+        self.assertEqual(b''.join(payload), b''.join(payload))
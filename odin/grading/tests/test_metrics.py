@@ -0,0 +1,76 @@
+from django.test import TestCase, Client, override_settings
+from django.shortcuts import reverse
+from django.utils import timezone
+
+from odin.education.factories import SolutionFactory
+from odin.education.models import Solution
+
+from odin.grading.metrics import get_latency_report, get_percentile
+
+client = Client()
+
+
+class GradingMetricsTests(TestCase):
+    def create_graded_solution(self, *, queue_wait, grading):
+        queued_at = timezone.now() - timezone.timedelta(minutes=5)
+        submit_started_at = queued_at + timezone.timedelta(seconds=queue_wait)
+        grader_submitted_at = submit_started_at + timezone.timedelta(seconds=1)
+
+        return SolutionFactory(
+            status=Solution.OK,
+            grading_requested_at=queued_at - timezone.timedelta(seconds=1),
+            queued_at=queued_at,
+            submit_started_at=submit_started_at,
+            grader_submitted_at=grader_submitted_at,
+            graded_at=grader_submitted_at + timezone.timedelta(seconds=grading),
+            nonce_failures=1,
+        )
+
+    def test_get_percentile_uses_nearest_rank(self):
+        values = list(range(1, 101))
+
+        self.assertEqual([50, 95, 99], [get_percentile(values, quantile) for quantile in (0.5, 0.95, 0.99)])
+
+    def test_latency_report_summarizes_every_stage_per_course(self):
+        solution = self.create_graded_solution(queue_wait=2, grading=10)
+        since = timezone.now() - timezone.timedelta(hours=1)
+
+        report = get_latency_report(solution_model=Solution, since=since, group_by='course')
+        stages = report[solution.task.course.name]
+
+        self.assertEqual(2, stages['queue_wait']['p50'])
+        self.assertEqual(10, stages['grading']['p99'])
+        self.assertEqual(1, stages['enqueue']['p50'])
+        self.assertEqual(13, stages['total']['p95'])
+
+    def test_negative_and_missing_intervals_are_left_out(self):
+        solution = self.create_graded_solution(queue_wait=2, grading=10)
+        Solution.objects.filter(id=solution.id).update(
+            grading_requested_at=None,
+            queued_at=solution.graded_at + timezone.timedelta(minutes=1)
+        )
+        since = timezone.now() - timezone.timedelta(hours=1)
+
+        stages = get_latency_report(solution_model=Solution, since=since, group_by='course')[solution.task.course.name]
+
+        self.assertEqual(0, stages['enqueue']['count'])
+        self.assertEqual(0, stages['queue_wait']['count'])
+        self.assertEqual(0, stages['total']['count'])
+        self.assertEqual(10, stages['grading']['p50'])
+
+    @override_settings(GRADER_METRICS_TOKEN='metrics-token')
+    def test_metrics_endpoint_exports_stage_quantiles_and_counters(self):
+        self.create_graded_solution(queue_wait=2, grading=10)
+
+        response = client.get(reverse('api:grading:metrics'), HTTP_AUTHORIZATION='Bearer metrics-token')
+        content = response.content.decode('utf-8')
+
+        self.assertEqual(200, response.status_code)
+        self.assertIn('odin_grading_stage_seconds{stage="grading",quantile="0.5"} 10.0', content)
+        self.assertIn('odin_grading_nonce_failures 1', content)
+
+    @override_settings(GRADER_METRICS_TOKEN='metrics-token')
+    def test_metrics_endpoint_requires_the_token(self):
+        response = client.get(reverse('api:grading:metrics'))
+
+        self.assertEqual(404, response.status_code)
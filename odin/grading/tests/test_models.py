@@ -0,0 +1,66 @@
+import threading
+
+from django.db import connection
+from django.test import TransactionTestCase
+
+from odin.grading.models import GraderRequest
+
+
+class GraderRequestNonceTests(TransactionTestCase):
+    def setUp(self):
+        self.request_info = 'POST /grade'
+
+    def test_allocate_nonce_creates_request_info_with_first_nonce(self):
+        nonce = GraderRequest.objects.allocate_nonce(self.request_info)
+
+        self.assertEqual(1, nonce)
+        self.assertEqual(1, GraderRequest.objects.get(request_info=self.request_info).nonce)
+
+    def test_allocate_nonce_increments_existing_nonce(self):
+        GraderRequest.objects.create(request_info=self.request_info, nonce=41)
+
+        self.assertEqual(42, GraderRequest.objects.allocate_nonce(self.request_info))
+
+    def test_sync_nonce_never_moves_nonce_backwards(self):
+        GraderRequest.objects.create(request_info=self.request_info, nonce=10)
+
+        GraderRequest.objects.sync_nonce(self.request_info, 5)
+        self.assertEqual(10, GraderRequest.objects.get(request_info=self.request_info).nonce)
+
+        GraderRequest.objects.sync_nonce(self.request_info, 20)
+        self.assertEqual(20, GraderRequest.objects.get(request_info=self.request_info).nonce)
+
+    def test_concurrent_allocations_never_return_duplicate_nonces(self):
+        threads_count = 10
+        allocations_per_thread = 20
+        nonces = []
+        errors = []
+        lock = threading.Lock()
+
+        def allocate():
+            try:
+                allocated = [
+                    GraderRequest.objects.allocate_nonce(self.request_info)
+                    for _ in range(allocations_per_thread)
+                ]
+                with lock:
+                    nonces.extend(allocated)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=allocate) for _ in range(threads_count)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], errors)
+        self.assertEqual(threads_count * allocations_per_thread, len(set(nonces)))
+        self.assertEqual(
+            threads_count * allocations_per_thread,
+            GraderRequest.objects.get(request_info=self.request_info).nonce
+        )
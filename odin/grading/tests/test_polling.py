@@ -0,0 +1,68 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from odin.education.factories import (
+    SolutionFactory,
+    IncludedTaskFactory,
+    SourceCodeTestFactory,
+    ProgrammingLanguageFactory,
+)
+from odin.education.models import IncludedTask, Solution
+
+from odin.grading.polling import (
+    get_expected_grading_seconds,
+    get_first_polling_countdown,
+    get_polling_countdown,
+    is_polling_deadline_exceeded,
+)
+
+
+@override_settings(
+    GRADER_CALLBACK_URL='',
+    GRADER_POLLING_COUNTDOWN=2,
+    GRADER_POLLING_MAX_COUNTDOWN=30,
+    GRADER_POLLING_DEADLINE=600,
+)
+class PollingSchedulerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.task = IncludedTaskFactory(gradable=True)
+        self.language = ProgrammingLanguageFactory(name='python')
+        SourceCodeTestFactory._create(IncludedTask, task=self.task, language=self.language)
+
+    def create_graded_solution(self, seconds):
+        submitted_at = timezone.now() - timezone.timedelta(hours=1)
+
+        return SolutionFactory(
+            task=self.task,
+            status=Solution.OK,
+            grader_submitted_at=submitted_at,
+            graded_at=submitted_at + timezone.timedelta(seconds=seconds)
+        )
+
+    def test_polling_countdown_backs_off_exponentially_up_to_the_cap(self):
+        countdowns = [get_polling_countdown(retries=retries) for retries in range(6)]
+
+        self.assertEqual([2, 4, 8, 16, 30, 30], countdowns)
+
+    def test_first_polling_countdown_is_the_default_without_history(self):
+        solution = SolutionFactory(task=self.task, status=Solution.PENDING)
+
+        self.assertEqual(2, get_first_polling_countdown(solution=solution))
+
+    def test_first_polling_countdown_uses_median_grading_time_for_language_and_test_type(self):
+        for seconds in (5, 7, 100):
+            self.create_graded_solution(seconds)
+
+        solution = SolutionFactory(task=self.task, status=Solution.PENDING)
+
+        self.assertEqual(7, get_expected_grading_seconds(solution=solution))
+        self.assertEqual(7, get_first_polling_countdown(solution=solution))
+
+    def test_polling_deadline_is_exceeded_only_after_configured_time(self):
+        solution = SolutionFactory(task=self.task, status=Solution.PENDING, grader_submitted_at=timezone.now())
+        self.assertFalse(is_polling_deadline_exceeded(solution=solution))
+
+        solution.grader_submitted_at = timezone.now() - timezone.timedelta(seconds=601)
+        self.assertTrue(is_polling_deadline_exceeded(solution=solution))
@@ -0,0 +1,22 @@
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from odin.education.factories import SolutionFactory, IncludedTaskFactory, WeekFactory
+
+from odin.grading.services import get_submission_priority
+
+
+@override_settings(CELERY_GRADING_MAX_PRIORITY=10)
+class SubmissionPriorityTests(TestCase):
+    def get_priority_for_week_ending_in(self, days):
+        today = timezone.now().date()
+        week = WeekFactory(start_date=today - timezone.timedelta(days=7),
+                           end_date=today + timezone.timedelta(days=days))
+        solution = SolutionFactory(task=IncludedTaskFactory(week=week, course=week.course))
+
+        return get_submission_priority(solution=solution)
+
+    def test_solutions_for_weeks_ending_sooner_get_higher_priority(self):
+        priorities = [self.get_priority_for_week_ending_in(days) for days in (-2, 0, 3, 30)]
+
+        self.assertEqual([10, 9, 6, 1], priorities)
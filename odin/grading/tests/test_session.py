@@ -0,0 +1,34 @@
+from django.test import TestCase, override_settings
+
+from odin.grading.session import (
+    get_grader_session,
+    get_grader_session_stats,
+    reset_grader_session,
+)
+
+
+class GraderSessionTests(TestCase):
+    def setUp(self):
+        reset_grader_session()
+
+    def tearDown(self):
+        reset_grader_session()
+
+    def test_get_grader_session_returns_the_same_session_in_one_process(self):
+        self.assertIs(get_grader_session(), get_grader_session())
+
+    @override_settings(GRADER_POOL_MAXSIZE=25, GRADER_CONNECT_RETRIES=2)
+    def test_grader_session_adapters_use_configured_pool_and_retries(self):
+        adapter = get_grader_session().get_adapter('https://grader.example.com')
+
+        self.assertEqual(25, adapter._pool_maxsize)
+        self.assertEqual(2, adapter.max_retries.connect)
+        self.assertEqual(0, adapter.max_retries.read)
+
+    def test_stats_are_empty_before_any_request(self):
+        get_grader_session()
+
+        stats = get_grader_session_stats()
+
+        self.assertEqual(0, stats['pools'])
+        self.assertEqual(0, stats['requests_sent'])
@@ -0,0 +1,33 @@
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from odin.education.factories import SolutionFactory
+from odin.education.models import Solution
+
+from odin.grading.polling import GRADER_POLLING_MODE_TASK
+from odin.grading.tasks import submit_solution
+
+
+@override_settings(GRADER_POLLING_MODE=GRADER_POLLING_MODE_TASK)
+class SubmitSolutionRedeliveryTests(TestCase):
+    @patch('odin.grading.tasks.poll_solution.apply_async')
+    @patch('odin.grading.tasks.GraderClient')
+    def test_redelivered_submit_does_not_schedule_another_poll_chain(self, grader_client, apply_async):
+        solution = SolutionFactory(status=Solution.PENDING, grader_submitted_at=timezone.now())
+
+        submit_solution.apply(args=(solution.id, 'education.Solution'))
+
+        grader_client.assert_not_called()
+        apply_async.assert_not_called()
+
+    @patch('odin.grading.tasks.poll_solution.apply_async')
+    @patch('odin.grading.tasks.GraderClient')
+    def test_redelivered_submit_of_a_graded_solution_does_nothing(self, grader_client, apply_async):
+        solution = SolutionFactory(status=Solution.OK, graded_at=timezone.now())
+
+        submit_solution.apply(args=(solution.id, 'education.Solution'))
+
+        grader_client.assert_not_called()
+        apply_async.assert_not_called()
@@ -0,0 +1,17 @@
+from django.conf.urls import url
+
+from odin.grading.apis import GraderCallbackApi, GradingMetricsApi
+
+
+urlpatterns = [
+    url(
+        regex='^callback/$',
+        view=GraderCallbackApi.as_view(),
+        name='callback'
+    ),
+    url(
+        regex='^metrics/$',
+        view=GradingMetricsApi.as_view(),
+        name='metrics'
+    ),
+]
@@ -0,0 +1,48 @@
+from rest_framework import serializers
+from rest_framework.views import APIView
+from rest_framework.response import Response
+
+from odin.apis.mixins import ServiceExceptionHandlerMixin
+
+from .models import Interviewer, InterviewerFreeTime
+from .permissions import InterviewerAuthenticationMixin
+from .services import create_interviewer_free_times
+
+
+class BulkInterviewerFreeTimeCreateApi(
+    ServiceExceptionHandlerMixin,
+    InterviewerAuthenticationMixin,
+    APIView
+):
+
+    class Serializer(serializers.Serializer):
+        class FreeTimeSerializer(serializers.Serializer):
+            date = serializers.DateField()
+            start_time = serializers.TimeField()
+            end_time = serializers.TimeField()
+            interview_time_length = serializers.ChoiceField(choices=InterviewerFreeTime.INTERVIEW_TIME_CHOICES,
+                                                            default=20)
+            break_time = serializers.ChoiceField(choices=InterviewerFreeTime.BREAK_TIME_CHOICES, default=5)
+
+        free_times = FreeTimeSerializer(many=True, allow_empty=False)
+
+    def post(self, request):
+        serializer = self.Serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        free_times = create_interviewer_free_times(
+            interviewer=request.user.downcast(Interviewer),
+            free_times=serializer.validated_data['free_times']
+        )
+
+        data = [
+            {
+                'id': free_time.id,
+                'date': free_time.date,
+                'start_time': free_time.start_time,
+                'end_time': free_time.end_time,
+            }
+            for free_time in free_times
+        ]
+
+        return Response(data)
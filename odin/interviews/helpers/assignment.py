@@ -0,0 +1,87 @@
+import heapq
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+def assign_interview_slots(*,
+                           applications: Iterable[Tuple[int, int]],
+                           slots: Iterable[Tuple[int, int]],
+                           eligibility: Dict[int, Set[int]]) -> Dict[int, int]:
+    """
+    Pairs applications with free interview slots in a single greedy pass.
+
+    `applications` are (application id, application info id) pairs,
+    `slots` are (slot id, interviewer id) pairs ordered by time and
+    `eligibility` maps an application info id to the ids of the interviewers for its course.
+
+    Every application gets the earliest free slot of the least loaded eligible interviewer,
+    which keeps the number of interviews per interviewer as even as the eligibility allows.
+    Application infos with the fewest eligible slots are handled first, so the interviewers
+    they depend on are not used up by the courses that have alternatives.
+
+    Returns the slot id for every application that could be assigned.
+    """
+    free_slots = defaultdict(list)
+
+    for slot_id, interviewer_id in slots:
+        free_slots[interviewer_id].append(slot_id)
+
+    for interviewer_slots in free_slots.values():
+        interviewer_slots.reverse()
+
+    applications_by_info = defaultdict(list)
+
+    for application_id, application_info_id in applications:
+        applications_by_info[application_info_id].append(application_id)
+
+    def get_capacity(application_info_id):
+        return sum(len(free_slots[interviewer_id]) for interviewer_id in eligibility.get(application_info_id, ()))
+
+    load = defaultdict(int)
+    assignments = {}
+
+    for application_info_id in sorted(applications_by_info, key=get_capacity):
+        heap = [
+            (load[interviewer_id], interviewer_id)
+            for interviewer_id in eligibility.get(application_info_id, ())
+            if free_slots[interviewer_id]
+        ]
+        heapq.heapify(heap)
+
+        for application_id in applications_by_info[application_info_id]:
+            interviewer_id = None
+
+            while heap:
+                interviewer_load, candidate_id = heapq.heappop(heap)
+
+                if not free_slots[candidate_id]:
+                    continue
+
+                # The interviewer got more interviews from another course since it was pushed
+                if interviewer_load != load[candidate_id]:
+                    heapq.heappush(heap, (load[candidate_id], candidate_id))
+                    continue
+
+                interviewer_id = candidate_id
+                break
+
+            if interviewer_id is None:
+                break
+
+            assignments[application_id] = free_slots[interviewer_id].pop()
+            load[interviewer_id] += 1
+
+            if free_slots[interviewer_id]:
+                heapq.heappush(heap, (load[interviewer_id], interviewer_id))
+
+    return assignments
+
+
+def get_interviewer_loads(*, assignments: Dict[int, int], slots: Iterable[Tuple[int, int]]) -> List[int]:
+    interviewers = dict(slots)
+    load = defaultdict(int)
+
+    for slot_id in assignments.values():
+        load[interviewers[slot_id]] += 1
+
+    return sorted(load.values())
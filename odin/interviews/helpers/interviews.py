@@ -1,99 +1,134 @@
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta
+
+from django.db import transaction
+
+from odin.common.utils import bulk_update
 from odin.applications.models import Application
-from odin.interviews.models import InterviewerFreeTime, Interview
-from .groups_generator import cycle_groups
+from odin.interviews.models import Interviewer, InterviewerFreeTime, Interview
+from .assignment import assign_interview_slots
+
+
+def get_slot_start_times(*, date, start_time, end_time, interview_time_length, break_time):
+    """
+    Start times of the interviews that fit in the free time window, each followed by a break.
+    """
+    window_start = datetime.combine(date, start_time)
+    window_end = datetime.combine(date, end_time)
+    step = timedelta(minutes=interview_time_length + break_time)
+    interview_length = timedelta(minutes=interview_time_length)
+
+    slot_start_times = []
+    interview_start = window_start
+
+    while interview_start + interview_length <= window_end:
+        slot_start_times.append(interview_start.time())
+        interview_start += step
+
+    return slot_start_times
 
 
 class GenerateInterviewSlots:
     def __init__(self):
         self.__slots_generated = 0
 
-    def __inc_slots_generated(self):
-        self.__slots_generated += 1
+    def build_interview_slots(self, free_time_slots):
+        interviews = []
 
-    def __calculate_diff_in_time(self, start_time, end_time):
-        start_delta = timedelta(
-            hours=start_time.hour, minutes=start_time.minute, seconds=start_time.second)
-        end_delta = timedelta(
-            hours=end_time.hour, minutes=end_time.minute, seconds=end_time.second)
-        return (end_delta - start_delta).seconds / 60
+        for slot in free_time_slots:
+            for start_time in get_slot_start_times(date=slot.date,
+                                                   start_time=slot.start_time,
+                                                   end_time=slot.end_time,
+                                                   interview_time_length=slot.interview_time_length,
+                                                   break_time=slot.break_time):
+                end_time = (datetime.combine(slot.date, start_time) +
+                            timedelta(minutes=slot.interview_time_length)).time()
 
-    def generate_interview_slots(self):
-        teacher_time_slots = InterviewerFreeTime.objects.all().order_by('date')
-
-        for slot in teacher_time_slots:
-            # Check if slots are already generated for that time_slot
-            # check if date for interview is before today
-            # (by a previous invocation of manage.py generate_slots)
-            today = datetime.now()
-            if slot.has_generated_slots() or slot.date < datetime.date(today):
-                continue
-
-            # summarized free time of the interviewer
-            free_time = self.__calculate_diff_in_time(slot.start_time, slot.end_time)
-            # starting time of the first interview
-            interview_start_time = slot.start_time
-
-            while free_time >= slot.interview_time_length:
-                Interview.objects.create(
-                    interviewer=slot.interviewer,
+                interviews.append(Interview(
+                    interviewer_id=slot.interviewer_id,
                     interviewer_time_slot=slot,
                     date=slot.date,
-                    start_time=interview_start_time
-                )
+                    start_time=start_time,
+                    end_time=end_time
+                ))
 
-                self.__inc_slots_generated()
+        return interviews
 
-                # Decrease the free time and change the starting time of the next interview
-                free_time -= (slot.interview_time_length + slot.break_time)
-                next_interview_date_and_time = datetime.combine(
-                        slot.date, interview_start_time) + timedelta(
-                        minutes=(slot.interview_time_length + slot.break_time))
-                interview_start_time = next_interview_date_and_time.time()
+    def generate_interview_slots(self):
+        with transaction.atomic():
+            # Free time in the past or with slots from a previous run is skipped
+            free_time_ids = list(
+                InterviewerFreeTime.objects.upcoming().without_generated_slots().values_list('id', flat=True)
+            )
+            # A concurrent run waits for the lock and then sees the slots the first one committed
+            locked_ids = list(
+                InterviewerFreeTime.objects.select_for_update().filter(id__in=free_time_ids)
+                .order_by('id').values_list('id', flat=True)
+            )
+            free_time_slots = InterviewerFreeTime.objects.filter(
+                id__in=locked_ids
+            ).without_generated_slots().order_by('date')
+
+            interviews = self.build_interview_slots(free_time_slots)
+            Interview.objects.bulk_create(interviews)
+
+        self.__slots_generated += len(interviews)
 
     def get_generated_slots(self):
         return self.__slots_generated
 
 
 class GenerateInterviews:
-    def __init__(self, application_info):
-        self.__generated_interviews = 0
-        self.application_info = application_info
+    def __init__(self, application_infos):
+        self.__generated_interviews = Counter()
+        self.application_infos = list(application_infos)
+
+    def get_eligibility(self):
+        eligibility = defaultdict(set)
+        interviewer_courses = Interviewer.courses_to_interview.through.objects.filter(
+            applicationinfo__in=self.application_infos
+        ).values_list('applicationinfo_id', 'interviewer_id')
+
+        for application_info_id, interviewer_id in interviewer_courses:
+            eligibility[application_info_id].add(interviewer_id)
 
-    def __inc_generated_interviews(self):
-        self.__generated_interviews += 1
+        return eligibility
 
     def generate_interviews(self):
-        applications = iter(Application.objects.without_interviews_for(
-                            application_info=self.application_info))
+        if not self.application_infos:
+            return
 
-        interviews = Interview.objects.free_slots_for(self.application_info)
-        free_interview_slots = cycle_groups(interviews, key=lambda x: x.interviewer)
+        applications = list(Application.objects.without_interviews().filter(
+            application_info__in=self.application_infos
+        ).order_by('id').values_list('id', 'application_info_id'))
 
-        today = datetime.now()
+        eligibility = self.get_eligibility()
+        interviewer_ids = set().union(*eligibility.values())
 
-        for slot in free_interview_slots:
-            if slot.interviewer_time_slot.date < datetime.date(today):
-                continue
+        slots = Interview.objects.get_free_slots().upcoming().filter(
+            interviewer_id__in=interviewer_ids
+        ).order_by('date', 'start_time', 'id').values_list('id', 'interviewer_id')
 
-            try:
-                application = next(applications)
-            except StopIteration:
-                break
+        assignments = assign_interview_slots(applications=applications, slots=slots, eligibility=eligibility)
 
-            slot.application = application
-            slot.save()
+        with transaction.atomic():
+            bulk_update(
+                objs=[Interview(id=slot_id, application_id=application_id)
+                      for application_id, slot_id in assignments.items()],
+                fields=['application']
+            )
+            Application.objects.filter(id__in=assignments).update(has_interview_date=True)
 
-            application.has_interview_date = True
-            application.save()
+        application_infos = dict(applications)
 
-            self.__inc_generated_interviews()
+        for application_id in assignments:
+            self.__generated_interviews[application_infos[application_id]] += 1
 
-    def get_applications_without_interviews(self):
-        return Application.objects.without_interviews_for(self.application_info).count()
+    def get_applications_without_interviews(self, application_info):
+        return Application.objects.without_interviews_for(application_info=application_info).count()
 
-    def get_free_interview_slots(self):
-        return Interview.objects.free_slots_for(self.application_info).count()
+    def get_free_interview_slots(self, application_info):
+        return Interview.objects.free_slots_for(application_info).upcoming().count()
 
-    def get_generated_interviews_count(self):
-        return self.__generated_interviews
+    def get_generated_interviews_count(self, application_info):
+        return self.__generated_interviews[application_info.id]
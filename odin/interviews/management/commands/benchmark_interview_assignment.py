@@ -0,0 +1,84 @@
+import random
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from odin.interviews.helpers.assignment import assign_interview_slots, get_interviewer_loads
+from odin.interviews.helpers.groups_generator import cycle_groups
+
+
+class Command(BaseCommand):
+    help = 'Compares the round-robin and the load balancing interview assignment on generated, in-memory data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--applications', type=int, default=5000)
+        parser.add_argument('--interviewers', type=int, default=100)
+        parser.add_argument('--slots', type=int, default=60, help='Free slots per interviewer')
+        parser.add_argument('--courses', type=int, default=5)
+        parser.add_argument('--courses-per-interviewer', type=int, default=2)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def generate_data(self, options):
+        rng = random.Random(options['seed'])
+        courses = range(options['courses'])
+
+        eligibility = defaultdict(set)
+        for interviewer_id in range(options['interviewers']):
+            for course in rng.sample(courses, min(options['courses_per_interviewer'], len(courses))):
+                eligibility[course].add(interviewer_id)
+
+        slots = [
+            (slot_id, rng.randrange(options['interviewers']))
+            for slot_id in range(options['interviewers'] * options['slots'])
+        ]
+        applications = [
+            (application_id, rng.choice(courses))
+            for application_id in range(options['applications'])
+        ]
+
+        return applications, slots, eligibility
+
+    def assign_round_robin(self, *, applications, slots, eligibility):
+        """
+        The previous assignment: one round-robin pass over the free slots of every course, grouped by interviewer.
+        """
+        interviewers = dict(slots)
+        taken = set()
+        assignments = {}
+
+        applications_by_course = defaultdict(list)
+        for application_id, course in applications:
+            applications_by_course[course].append(application_id)
+
+        for course, course_applications in applications_by_course.items():
+            course_slots = sorted(
+                (slot_id for slot_id, interviewer_id in slots if interviewer_id in eligibility[course]),
+                key=lambda slot_id: interviewers[slot_id]
+            )
+            free_slots = (slot_id for slot_id in cycle_groups(course_slots, key=lambda slot_id: interviewers[slot_id])
+                          if slot_id not in taken)
+
+            for application_id, slot_id in zip(course_applications, free_slots):
+                assignments[application_id] = slot_id
+                taken.add(slot_id)
+
+        return assignments
+
+    def report(self, name, assign, data):
+        applications, slots, eligibility = data
+
+        started = time.monotonic()
+        assignments = assign(applications=applications, slots=slots, eligibility=eligibility)
+        elapsed = time.monotonic() - started
+
+        loads = get_interviewer_loads(assignments=assignments, slots=slots)
+
+        print(f'{name}: assigned {len(assignments)} of {len(applications)} applications in {elapsed:.3f}s, '
+              f'interviews per interviewer min / max: {loads[0] if loads else 0} / {loads[-1] if loads else 0}')
+
+    def handle(self, *args, **options):
+        data = self.generate_data(options)
+
+        self.report('Round robin', self.assign_round_robin, data)
+        self.report('Load balancing', assign_interview_slots, data)
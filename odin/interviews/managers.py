@@ -24,6 +24,7 @@ class InterviewerManager(models.Manager):
         interviewer.is_staff = True
 
         interviewer.save()
+        user.clear_roles()
 
         return Interviewer.objects.get(id=interviewer.id)
 
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.contrib.postgres.operations import CreateExtension
+from django.db import migrations
+
+DELETE_UNUSED_DUPLICATES = """
+    DELETE FROM interviews_interviewerfreetime duplicate
+    USING interviews_interviewerfreetime original
+    WHERE duplicate.interviewer_id = original.interviewer_id
+      AND duplicate.date = original.date
+      AND duplicate.start_time = original.start_time
+      AND duplicate.end_time = original.end_time
+      AND duplicate.id > original.id
+      AND NOT EXISTS (
+          SELECT 1 FROM interviews_interview interview WHERE interview.interviewer_time_slot_id = duplicate.id
+      );
+"""
+
+FIND_INVALID_RANGES = """
+    SELECT id FROM interviews_interviewerfreetime
+    WHERE date IS NOT NULL AND start_time > end_time
+    ORDER BY id;
+"""
+
+# Same rows and range as the constraint below
+FIND_OVERLAPS = """
+    SELECT earlier.id, later.id
+    FROM interviews_interviewerfreetime earlier
+    JOIN interviews_interviewerfreetime later
+      ON later.interviewer_id = earlier.interviewer_id AND later.id > earlier.id
+    WHERE earlier.date IS NOT NULL AND earlier.start_time <= earlier.end_time
+      AND later.date IS NOT NULL AND later.start_time <= later.end_time
+      AND tsrange(earlier.date + earlier.start_time, earlier.date + earlier.end_time, '[]')
+          && tsrange(later.date + later.start_time, later.date + later.end_time, '[]')
+    ORDER BY earlier.id, later.id;
+"""
+
+
+def remove_or_report_overlapping_free_time(apps, schema_editor):
+    """
+    Free time saved before the constraint may already overlap.
+    Exact duplicates without interview slots are removed, anything else has to be fixed by hand,
+    because deleting a free time also deletes its interviews.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(DELETE_UNUSED_DUPLICATES)
+
+        cursor.execute(FIND_INVALID_RANGES)
+        invalid = [row[0] for row in cursor.fetchall()]
+
+        cursor.execute(FIND_OVERLAPS)
+        overlapping = cursor.fetchall()
+
+    if invalid or overlapping:
+        raise ValueError(
+            'Fix these InterviewerFreeTime rows before adding the no-overlap constraint. '
+            f'Start time after end time: {invalid}. Overlapping pairs: {overlapping}.'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0003_auto_20170822_1357'),
+    ]
+
+    operations = [
+        CreateExtension('btree_gist'),
+        migrations.RunPython(remove_or_report_overlapping_free_time, migrations.RunPython.noop),
+        migrations.RunSQL(
+            sql="""
+                ALTER TABLE interviews_interviewerfreetime
+                ADD CONSTRAINT interviews_interviewerfreetime_no_overlap
+                EXCLUDE USING gist (
+                    interviewer_id WITH =,
+                    tsrange(date + start_time, date + end_time, '[]') WITH &&
+                )
+                WHERE (date IS NOT NULL AND start_time IS NOT NULL AND end_time IS NOT NULL);
+            """,
+            reverse_sql="""
+                ALTER TABLE interviews_interviewerfreetime
+                DROP CONSTRAINT interviews_interviewerfreetime_no_overlap;
+            """
+        ),
+    ]
@@ -1,6 +1,6 @@
 import uuid
 
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
@@ -9,7 +9,7 @@ from odin.users.models import BaseUser
 from odin.applications.models import ApplicationInfo, Application
 
 from .managers import InterviewerManager, InterviewManager
-from .query import InterviewQuerySet
+from .query import InterviewerFreeTimeQuerySet, InterviewQuerySet
 
 
 class Interviewer(BaseUser):
@@ -43,6 +43,12 @@ class InterviewerFreeTime(models.Model):
     break_time = models.SmallIntegerField(choices=BREAK_TIME_CHOICES,
                                           default=5)
 
+    # Exclusion constraint over the interviewer and the date and time range, see migration 0004
+    OVERLAP_CONSTRAINT = 'interviews_interviewerfreetime_no_overlap'
+    OVERLAPPING_ERROR = "Times are overlapping with an already existing Free Time Slot"
+
+    objects = InterviewerFreeTimeQuerySet.as_manager()
+
     def __str__(self):
         return f'On {self.date} - from {self.start_time} to {self.end_time}'
 
@@ -55,17 +61,24 @@ class InterviewerFreeTime(models.Model):
         if self.start_time >= self.end_time:
             raise ValidationError("The start time can not be the same or after the end time")
 
-        user_timeslots_for_date = InterviewerFreeTime.objects.filter(interviewer=self.interviewer, date=self.date)
-        if not user_timeslots_for_date.exists():
-            return
-        for slot in user_timeslots_for_date:
-            if max(slot.start_time, self.start_time) <= min(slot.end_time, self.end_time):
-                raise ValidationError("Times are overlapping with an already existing Free Time Slot")
+        overlapping = InterviewerFreeTime.objects.overlapping(interviewer=self.interviewer,
+                                                             date=self.date,
+                                                             start_time=self.start_time,
+                                                             end_time=self.end_time)
+        if overlapping.exclude(id=self.id).exists():
+            raise ValidationError(self.OVERLAPPING_ERROR)
 
     def save(self, *args, **kwargs):
         self.full_clean()
 
-        return super().save(*args, **kwargs)
+        # The exclusion constraint catches the overlaps that clean() misses under concurrent saves
+        try:
+            with transaction.atomic():
+                return super().save(*args, **kwargs)
+        except IntegrityError as exc:
+            if self.OVERLAP_CONSTRAINT in str(exc):
+                raise ValidationError(self.OVERLAPPING_ERROR)
+            raise
 
 
 class Interview(models.Model):
@@ -0,0 +1,13 @@
+from rest_framework.permissions import BasePermission
+
+from odin.authentication.permissions import JSONWebTokenAuthenticationMixin
+
+
+class IsInterviewerPermission(BasePermission):
+    def has_permission(self, request, view):
+        return request.user.is_interviewer()
+
+
+class InterviewerAuthenticationMixin(JSONWebTokenAuthenticationMixin):
+    def get_permissions(self):
+        return super().get_permissions() + [IsInterviewerPermission()]
@@ -1,4 +1,23 @@
 from django.db import models
+from django.utils import timezone
+
+
+class InterviewerFreeTimeQuerySet(models.QuerySet):
+
+    def upcoming(self):
+        return self.filter(date__gte=timezone.now().date())
+
+    def without_generated_slots(self):
+        return self.filter(interviews__isnull=True)
+
+    def overlapping(self, *, interviewer, date, start_time, end_time):
+        """
+        Touching intervals count as overlapping, the same as in the database constraint.
+        """
+        return self.filter(interviewer=interviewer,
+                           date=date,
+                           start_time__lte=end_time,
+                           end_time__gte=start_time)
 
 
 class InterviewQuerySet(models.QuerySet):
@@ -6,6 +25,9 @@ class InterviewQuerySet(models.QuerySet):
     def get_free_slots(self):
         return self.filter(application__isnull=True)
 
+    def upcoming(self):
+        return self.filter(interviewer_time_slot__date__gte=timezone.now().date())
+
     def free_slots_for(self, application_info):
         return self.get_free_slots().filter(
                 interviewer__courses_to_interview__in=[application_info])
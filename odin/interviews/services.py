@@ -1,18 +1,21 @@
+from collections import defaultdict
 from datetime import date, time
-from typing import Dict
+from typing import Dict, List
 
 from django.conf import settings
 from django.contrib.sites.models import Site
 from django.urls import reverse
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 from django.db.models import QuerySet
+from django.utils import timezone
 
-from odin.common.services import send_email
+from odin.emails.services import send_batch_template_mail
 from odin.applications.models import Application, ApplicationInfo
-from odin.education.models import Course, Student, CourseAssignment
+from odin.education.models import Course
 from .models import Interview, Interviewer, InterviewerFreeTime
 from .helpers.interviews import GenerateInterviews, GenerateInterviewSlots
-from odin.education.services import add_student
+from odin.education.services import enroll_students
 
 
 def create_new_interview_for_application(*,
@@ -50,6 +53,76 @@ def create_interviewer_free_time(*,
                                               break_time=break_time)
 
 
+def get_free_time_errors(*,
+                         interviewer: Interviewer,
+                         free_times: List[Dict]) -> Dict[str, List[str]]:
+    """
+    Validates all `free_times` of the interviewer together and returns the errors by their index.
+    Existing free time is loaded with one query for all dates and the windows are compared per date after sorting.
+    """
+    errors = defaultdict(list)
+    today = timezone.now().date()
+
+    for index, free_time in enumerate(free_times):
+        if free_time['date'] < today:
+            errors[str(index)].append("Your free time slot can not be in the past")
+        if free_time['start_time'] >= free_time['end_time']:
+            errors[str(index)].append("The start time can not be the same or after the end time")
+
+    windows_by_date = defaultdict(list)
+    existing = InterviewerFreeTime.objects.filter(
+        interviewer=interviewer,
+        date__in={free_time['date'] for free_time in free_times}
+    ).values_list('date', 'start_time', 'end_time')
+
+    for free_time_date, start_time, end_time in existing:
+        windows_by_date[free_time_date].append((start_time, end_time, None))
+
+    for index, free_time in enumerate(free_times):
+        windows_by_date[free_time['date']].append((free_time['start_time'], free_time['end_time'], index))
+
+    for free_time_date, windows in windows_by_date.items():
+        windows.sort(key=lambda window: window[:2])
+        latest = None
+
+        for start_time, end_time, index in windows:
+            if latest is not None and start_time <= latest[1]:
+                for conflicting, other in ((index, latest), (latest[2], (start_time, end_time))):
+                    if conflicting is not None:
+                        errors[str(conflicting)].append(
+                            f"Times are overlapping with {free_time_date} {other[0]:%H:%M}-{other[1]:%H:%M}"
+                        )
+
+            if latest is None or end_time > latest[1]:
+                latest = (start_time, end_time, index)
+
+    return dict(errors)
+
+
+def create_interviewer_free_times(*,
+                                  interviewer: Interviewer,
+                                  free_times: List[Dict]) -> List[InterviewerFreeTime]:
+    """
+    Creates all `free_times` of the interviewer or none of them.
+    Raises a ValidationError with every conflict, keyed by the index of the free time.
+    """
+    errors = get_free_time_errors(interviewer=interviewer, free_times=free_times)
+
+    if errors:
+        raise ValidationError(errors)
+
+    try:
+        with transaction.atomic():
+            return InterviewerFreeTime.objects.bulk_create([
+                InterviewerFreeTime(interviewer=interviewer, **free_time)
+                for free_time in free_times
+            ])
+    except IntegrityError as exc:
+        if InterviewerFreeTime.OVERLAP_CONSTRAINT in str(exc):
+            raise ValidationError(InterviewerFreeTime.OVERLAPPING_ERROR)
+        raise
+
+
 def add_course_to_interviewer_courses(*,
                                       interviewer: Interviewer,
                                       course: Course) -> QuerySet:
@@ -94,67 +167,94 @@ def generate_interview_slots() -> Dict:
         context['log'].append('There are no open for interview courses!\n')
         context['log'].append('No interviews will be generated.')
 
+    application_infos = []
+
     for info in courses_to_interview:
         context['log'].append("Generate interviews for {0}".format(info.course.name))
-        interview_generator = GenerateInterviews(application_info=info)
-        app_without_interviews = interview_generator.get_applications_without_interviews()
-        free_interview_slots = interview_generator.get_free_interview_slots()
+        app_without_interviews = Application.objects.without_interviews_for(info).count()
+        free_interview_slots = Interview.objects.free_slots_for(info).upcoming().count()
         if app_without_interviews > free_interview_slots:
             context['log'].append("Not enough free slots - {0}".format(app_without_interviews - free_interview_slots))
             continue
 
-        interview_generator.generate_interviews()
-
-        free_interview_slots = interview_generator.get_free_interview_slots()
-        context['log'].append('Generated interviews: {0}'.format(
-            interview_generator.get_generated_interviews_count()))
-        context['log'].append('Applications without interviews: {0} '.format(
-            interview_generator.get_applications_without_interviews()))
-        context['log'].append('All free interview slots: {0}'.format(free_interview_slots))
-
-    return context
-
+        application_infos.append(info)
 
-def send_interview_confirmation_emails():
-    interviews = Interview.objects.with_application().without_received_email()
-    for interview in interviews:
-        application = interview.application
-        user = application.user
-        confirm_url_kwargs = {"application_id": application.id,
-                              "interview_token": str(interview.uuid)}
-        context = {
-            'protocol': 'http',
-            'full_name': user.get_full_name(),
-            'course_name': application.application_info.course.name,
-            'start_time': str(interview.start_time),
-            'date': str(interview.date),
-            'domain': Site.objects.get_current().domain,
-            'confirm_url': reverse('dashboard:interviews:confirm-interview',
-                                   kwargs=confirm_url_kwargs),
-            'choose_url': reverse('dashboard:interviews:choose-interview',
-                                  kwargs={"application_id": application.id,
-                                          "interview_token": str(interview.uuid)})
+    interview_generator = GenerateInterviews(application_infos=application_infos)
+    interview_generator.generate_interviews()
 
-        }
+    for info in application_infos:
+        applications_without_interviews = interview_generator.get_applications_without_interviews(info)
 
-        print('Sending to {} for application {}'.format(user.email, application))
+        context['log'].append("Interviews for {0}".format(info.course.name))
+        context['log'].append('Generated interviews: {0}'.format(
+            interview_generator.get_generated_interviews_count(info)))
+        context['log'].append('Applications without interviews: {0} '.format(applications_without_interviews))
 
-        email_template = settings.EMAIL_TEMPLATES['interview_confirmation']
-        send_email(email_template, [user.email], context)
+        # The capacity checks above count the slots shared with other courses for each of them
+        if applications_without_interviews:
+            context['log'].append("Not enough free slots after assigning all courses - {0}".format(
+                applications_without_interviews))
+        context['log'].append('All free interview slots: {0}'.format(
+            interview_generator.get_free_interview_slots(info)))
 
-        interview.has_received_email = True
-        interview.save()
+    return context
 
 
-def assign_accepted_users_to_courses():
+def get_interview_confirmation_context(*, interview: Interview, domain: str) -> Dict:
+    application = interview.application
+    url_kwargs = {"application_id": application.id,
+                  "interview_token": str(interview.uuid)}
+
+    return {
+        'protocol': 'http',
+        'full_name': application.user.get_full_name(),
+        'course_name': application.application_info.course.name,
+        'start_time': str(interview.start_time),
+        'date': str(interview.date),
+        'domain': domain,
+        'confirm_url': reverse('dashboard:interviews:confirm-interview', kwargs=url_kwargs),
+        'choose_url': reverse('dashboard:interviews:choose-interview', kwargs=url_kwargs),
+    }
+
+
+def send_interview_confirmation_emails() -> int:
+    """
+    Sends the confirmation emails of all interviews with an application in batches
+    and returns the number of emails sent.
+    """
+    interviews = list(Interview.objects.with_application().without_received_email().select_related(
+        'application__user__profile',
+        'application__application_info__course',
+    ))
+
+    if not interviews:
+        return 0
+
+    domain = Site.objects.get_current().domain
+
+    send_batch_template_mail(
+        template_name=settings.EMAIL_TEMPLATES['interview_confirmation'],
+        recipient_contexts=[
+            (interview.application.user.email, get_interview_confirmation_context(interview=interview, domain=domain))
+            for interview in interviews
+        ]
+    )
+
+    Interview.objects.filter(id__in=[interview.id for interview in interviews]).update(has_received_email=True)
+
+    return len(interviews)
+
+
+def assign_accepted_users_to_courses() -> Dict[str, Dict[str, int]]:
+    """
+    Enrolls the accepted applicants of every course open for interview
+    and returns the enrollment counts by course name.
+    """
     active_application_infos = ApplicationInfo.objects.get_open_for_interview()
+    enrollments = {}
+
     for info in active_application_infos:
-        accepted = info.accepted_applicants
-        for application in accepted:
-            if not application.user.is_student():
-                student = Student.objects.create_from_user(application.user)
-            else:
-                student = application.user.student
-
-            if not CourseAssignment.objects.filter(course=info.course, student=student):
-                add_student(course=info.course, student=student)
+        users = [application.user for application in info.accepted_applicants]
+        enrollments[info.course.name] = enroll_students(course=info.course, users=users)
+
+    return enrollments
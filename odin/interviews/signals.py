@@ -1,7 +1,7 @@
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from .models import Interview
+from .models import Interview, Interviewer
 
 
 @receiver(post_delete, sender=Interview)
@@ -9,3 +9,9 @@ def delete_has_interview_date_in_application(sender, instance, **kwargs):
     if instance.application:
         instance.application.has_interview_date = False
         instance.application.save()
+
+
+@receiver(post_save, sender=Interviewer)
+@receiver(post_delete, sender=Interviewer)
+def clear_user_roles_on_interviewer_change(sender, instance, **kwargs):
+    instance.clear_roles()
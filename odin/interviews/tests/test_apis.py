@@ -0,0 +1,84 @@
+from datetime import time
+
+from test_plus import TestCase
+
+from django.test import Client
+from django.shortcuts import reverse
+from django.utils import timezone
+
+from odin.common.faker import faker
+
+from odin.users.factories import BaseUserFactory
+
+from ..factories import InterviewerFreeTimeFactory
+from ..models import Interviewer, InterviewerFreeTime
+
+client = Client()
+
+
+class TestBulkInterviewerFreeTimeCreateApi(TestCase):
+    def setUp(self):
+        self.test_password = faker.password()
+        self.user = BaseUserFactory(password=self.test_password)
+        self.user.is_active = True
+        self.user.save()
+        self.interviewer = Interviewer.objects.create_from_user(self.user)
+
+        self.url = reverse('api:interviews:free-time-bulk')
+        self.date = timezone.now().date() + timezone.timedelta(days=1)
+
+        login_response = client.post(reverse('api:auth:login'), data={
+            'email': self.user.email,
+            'password': self.test_password,
+        })
+        self.auth_headers = {'HTTP_AUTHORIZATION': f'JWT {login_response.data["token"]}'}
+
+    def submit(self, free_times):
+        data = {
+            'free_times': [
+                {'date': str(date), 'start_time': str(start_time), 'end_time': str(end_time)}
+                for date, start_time, end_time in free_times
+            ]
+        }
+
+        return client.post(self.url, data=data, content_type='application/json', **self.auth_headers)
+
+    def test_whole_week_of_free_time_is_created(self):
+        week = [self.date + timezone.timedelta(days=day) for day in range(7)]
+
+        response = self.submit([(date, time(10, 0), time(12, 0)) for date in week])
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(7, len(response.data))
+        self.assertEqual(7, InterviewerFreeTime.objects.filter(interviewer=self.interviewer).count())
+
+    def test_all_conflicts_are_returned_and_nothing_is_created(self):
+        InterviewerFreeTimeFactory(interviewer=self.interviewer,
+                                   date=self.date,
+                                   start_time=time(9, 0),
+                                   end_time=time(10, 0))
+        free_time_count = InterviewerFreeTime.objects.count()
+
+        response = self.submit([
+            (self.date, time(9, 30), time(11, 0)),
+            (self.date, time(10, 30), time(12, 0)),
+            (self.date, time(13, 0), time(14, 0)),
+        ])
+
+        self.assertEqual(400, response.status_code)
+        self.assertEqual({'0', '1'}, {error['field'] for error in response.data['errors']})
+        self.assertEqual(free_time_count, InterviewerFreeTime.objects.count())
+
+    def test_users_that_are_not_interviewers_are_forbidden(self):
+        user = BaseUserFactory(password=self.test_password)
+        user.is_active = True
+        user.save()
+        login_response = client.post(reverse('api:auth:login'), data={
+            'email': user.email,
+            'password': self.test_password,
+        })
+        self.auth_headers = {'HTTP_AUTHORIZATION': f'JWT {login_response.data["token"]}'}
+
+        response = self.submit([(self.date, time(10, 0), time(12, 0))])
+
+        self.assertEqual(403, response.status_code)
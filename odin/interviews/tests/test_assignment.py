@@ -0,0 +1,41 @@
+from test_plus import TestCase
+
+from ..helpers.assignment import assign_interview_slots, get_interviewer_loads
+
+
+class TestAssignInterviewSlots(TestCase):
+    def test_load_is_balanced_between_interviewers(self):
+        slots = [(slot_id, 1) for slot_id in range(1, 7)] + [(slot_id, 2) for slot_id in range(7, 10)]
+        applications = [(application_id, 1) for application_id in range(1, 7)]
+
+        assignments = assign_interview_slots(applications=applications, slots=slots, eligibility={1: {1, 2}})
+
+        self.assertEqual(6, len(assignments))
+        self.assertEqual([3, 3], get_interviewer_loads(assignments=assignments, slots=slots))
+        self.assertEqual(6, len(set(assignments.values())))
+
+    def test_earliest_free_slot_of_the_interviewer_is_used(self):
+        slots = [(3, 1), (1, 1), (2, 1)]
+
+        assignments = assign_interview_slots(applications=[(10, 1), (11, 1)], slots=slots, eligibility={1: {1}})
+
+        self.assertEqual({10: 3, 11: 1}, assignments)
+
+    def test_only_interviewers_of_the_course_are_assigned(self):
+        slots = [(1, 1), (2, 2)]
+
+        assignments = assign_interview_slots(applications=[(10, 1), (11, 1)], slots=slots, eligibility={1: {2}})
+
+        self.assertEqual({10: 2}, assignments)
+
+    def test_constrained_course_is_assigned_first(self):
+        # Interviewer 1 interviews for both courses, interviewer 2 only for course 2
+        slots = [(1, 1), (2, 2), (3, 2)]
+        applications = [(10, 2), (11, 2), (12, 1)]
+
+        assignments = assign_interview_slots(applications=applications,
+                                             slots=slots,
+                                             eligibility={1: {1}, 2: {1, 2}})
+
+        self.assertEqual(3, len(assignments))
+        self.assertEqual(1, assignments[12])
@@ -1,11 +1,15 @@
+from datetime import time
+
 from test_plus import TestCase
 
+from django.db import IntegrityError, connection, transaction
+
 from odin.applications.factories import ApplicationFactory, ApplicationInfoFactory
 from odin.users.factories import BaseUserFactory
 from odin.education.factories import CourseFactory
 
-from ..models import Interview
-from ..factories import InterviewFactory
+from ..models import Interview, InterviewerFreeTime
+from ..factories import InterviewFactory, InterviewerFactory, InterviewerFreeTimeFactory
 
 
 class TestInterviews(TestCase):
@@ -39,3 +43,44 @@ class TestInterviews(TestCase):
 
         self.assertEqual(confirmed_interviews_for_user + 1,
                          Interview.objects.confirmed_interviews_on(self.user).count())
+
+
+class TestInterviewerFreeTimeOverlapConstraint(TestCase):
+    def setUp(self):
+        self.free_time = InterviewerFreeTimeFactory(start_time=time(10, 0), end_time=time(12, 0))
+
+    def build_free_time(self, *, interviewer, start_time, end_time):
+        return InterviewerFreeTime(interviewer=interviewer,
+                                   date=self.free_time.date,
+                                   start_time=start_time,
+                                   end_time=end_time)
+
+    def test_bulk_created_overlapping_free_time_is_rejected_by_the_database(self):
+        overlapping = self.build_free_time(interviewer=self.free_time.interviewer,
+                                           start_time=time(11, 0),
+                                           end_time=time(13, 0))
+
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                InterviewerFreeTime.objects.bulk_create([overlapping])
+
+    def test_overlapping_free_time_inserted_with_raw_sql_is_rejected_by_the_database(self):
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO interviews_interviewerfreetime
+                        (interviewer_id, date, start_time, end_time, interview_time_length, break_time)
+                    VALUES (%s, %s, %s, %s, 20, 5)
+                    """,
+                    [self.free_time.interviewer_id, self.free_time.date, time(9, 0), time(10, 30)]
+                )
+
+    def test_same_time_for_another_interviewer_is_accepted(self):
+        other = self.build_free_time(interviewer=InterviewerFactory(),
+                                     start_time=time(10, 0),
+                                     end_time=time(12, 0))
+
+        InterviewerFreeTime.objects.bulk_create([other])
+
+        self.assertEqual(2, InterviewerFreeTime.objects.filter(date=self.free_time.date).count())
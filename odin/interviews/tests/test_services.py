@@ -1,8 +1,15 @@
+from datetime import time
+from unittest.mock import patch
+
 from test_plus import TestCase
 
 from odin.common.faker import faker
 
+from django.contrib.sites.models import Site
+from django.core import mail
 from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from odin.users.factories import BaseUserFactory
@@ -14,9 +21,17 @@ from odin.interviews.models import Interview
 from odin.applications.factories import ApplicationFactory
 from odin.applications.models import Application
 
-from ..services import create_new_interview_for_application, create_interviewer_free_time, generate_interview_slots
+from ..services import (
+    create_new_interview_for_application,
+    create_interviewer_free_time,
+    create_interviewer_free_times,
+    generate_interview_slots,
+    get_free_time_errors,
+    send_interview_confirmation_emails,
+)
 from ..factories import InterviewFactory, InterviewerFreeTimeFactory
-from ..models import Interviewer
+from ..models import Interviewer, InterviewerFreeTime
+from ..helpers.interviews import GenerateInterviewSlots
 
 
 class TestAddCourseToInterViewerCourses(TestCase):
@@ -73,6 +88,62 @@ class TestCreateInterviewFreeTimeSlot(TestCase):
                                          break_time=5)
 
 
+class TestCreateInterviewerFreeTimes(TestCase):
+    def setUp(self):
+        self.interviewer = Interviewer.objects.create_from_user(BaseUserFactory())
+        self.date = timezone.now().date() + timezone.timedelta(days=1)
+
+    def get_free_time(self, *, date=None, start_time, end_time):
+        return {'date': date or self.date, 'start_time': start_time, 'end_time': end_time}
+
+    def test_free_times_are_created_when_there_are_no_conflicts(self):
+        free_times = create_interviewer_free_times(interviewer=self.interviewer, free_times=[
+            self.get_free_time(start_time=time(9, 0), end_time=time(10, 0)),
+            self.get_free_time(start_time=time(11, 0), end_time=time(12, 0)),
+        ])
+
+        self.assertEqual(2, len(free_times))
+        self.assertEqual(2, InterviewerFreeTime.objects.filter(interviewer=self.interviewer).count())
+
+    def test_overlaps_with_existing_and_submitted_free_time_are_reported_by_index(self):
+        InterviewerFreeTimeFactory(interviewer=self.interviewer,
+                                   date=self.date,
+                                   start_time=time(9, 0),
+                                   end_time=time(10, 0))
+
+        errors = get_free_time_errors(interviewer=self.interviewer, free_times=[
+            self.get_free_time(start_time=time(9, 30), end_time=time(11, 0)),
+            self.get_free_time(start_time=time(10, 30), end_time=time(12, 0)),
+            self.get_free_time(start_time=time(13, 0), end_time=time(14, 0)),
+            self.get_free_time(start_time=time(16, 0), end_time=time(15, 0)),
+        ])
+
+        self.assertEqual({'0', '1', '3'}, set(errors))
+        self.assertEqual(2, len(errors['0']))
+
+    def test_nothing_is_created_when_there_is_a_conflict(self):
+        free_time_count = InterviewerFreeTime.objects.count()
+
+        with self.assertRaises(ValidationError):
+            create_interviewer_free_times(interviewer=self.interviewer, free_times=[
+                self.get_free_time(start_time=time(9, 0), end_time=time(10, 0)),
+                self.get_free_time(start_time=time(9, 30), end_time=time(10, 30)),
+            ])
+
+        self.assertEqual(free_time_count, InterviewerFreeTime.objects.count())
+
+    def test_editing_free_time_does_not_overlap_with_itself(self):
+        slot = InterviewerFreeTimeFactory(interviewer=self.interviewer,
+                                          date=self.date,
+                                          start_time=time(9, 0),
+                                          end_time=time(10, 0))
+        slot.end_time = time(10, 30)
+        slot.save()
+
+        slot.refresh_from_db()
+        self.assertEqual(time(10, 30), slot.end_time)
+
+
 class TestAssignAcceptedUsersToCourses(TestCase):
     def setUp(self):
         start_date = timezone.now().date() - timezone.timedelta(days=3)
@@ -162,3 +233,100 @@ class TestGenerateInterviewSlots(TestCase):
         context = generate_interview_slots()
         self.assertIn(f"Generated interviews: {Interview.objects.count()}", context['log'])
         self.assertEqual(interview_count + 1, Interview.objects.count())
+
+    def test_course_left_short_by_slots_shared_with_another_course_is_reported(self):
+        other_course = CourseFactory(start_date=timezone.now() + timezone.timedelta(days=5))
+        other_application_info = ApplicationInfoFactory(
+            course=other_course,
+            start_date=self.application_info.start_date,
+            end_date=self.application_info.end_date,
+            start_interview_date=self.application_info.start_interview_date,
+            end_interview_date=self.application_info.end_interview_date
+        )
+        self.interviewer.courses_to_interview.add(other_application_info)
+        self.interviewer.profile.skype = faker.word()
+        self.interviewer.profile.save()
+
+        ApplicationFactory(application_info=self.application_info)
+        ApplicationFactory(application_info=other_application_info)
+        InterviewerFreeTimeFactory(interviewer=self.interviewer,
+                                   date=timezone.now().date() + timezone.timedelta(days=1),
+                                   start_time=time(10, 0),
+                                   end_time=time(10, 20),
+                                   interview_time_length=20,
+                                   break_time=5)
+
+        context = generate_interview_slots()
+
+        self.assertEqual(1, Interview.objects.with_application().count())
+        self.assertIn("Not enough free slots after assigning all courses - 1", context['log'])
+
+    def test_slots_are_generated_for_upcoming_free_time_in_one_insert(self):
+        date = timezone.now().date() + timezone.timedelta(days=1)
+        InterviewerFreeTimeFactory(interviewer=self.interviewer,
+                                   date=date,
+                                   start_time=time(10, 0),
+                                   end_time=time(11, 10),
+                                   interview_time_length=20,
+                                   break_time=5)
+        generator = GenerateInterviewSlots()
+
+        # savepoint, free time lookup, lock, lookup under the lock, insert, savepoint release
+        with CaptureQueriesContext(connection) as context:
+            generator.generate_interview_slots()
+
+        self.assertEqual(6, len(context.captured_queries))
+        self.assertTrue(any('FOR UPDATE' in query['sql'] for query in context.captured_queries))
+
+        interviews = Interview.objects.filter(interviewer=self.interviewer).order_by('start_time')
+        self.assertEqual(3, generator.get_generated_slots())
+        self.assertEqual([time(10, 0), time(10, 25), time(10, 50)], [interview.start_time for interview in interviews])
+        self.assertEqual(time(11, 10), interviews.last().end_time)
+
+    def test_slots_are_not_generated_twice_or_for_past_free_time(self):
+        slot = InterviewerFreeTimeFactory(interviewer=self.interviewer)
+        GenerateInterviewSlots().generate_interview_slots()
+        generated = slot.interviews.count()
+
+        past_slot = InterviewerFreeTimeFactory(interviewer=self.interviewer)
+        yesterday = timezone.now().date() - timezone.timedelta(days=1)
+        InterviewerFreeTime.objects.filter(id=past_slot.id).update(date=yesterday)
+
+        generator = GenerateInterviewSlots()
+        generator.generate_interview_slots()
+
+        self.assertEqual(0, generator.get_generated_slots())
+        self.assertEqual(generated, slot.interviews.count())
+        self.assertFalse(past_slot.interviews.exists())
+
+
+@patch('odin.interviews.services.reverse', return_value='/interview/')
+class TestSendInterviewConfirmationEmails(TestCase):
+    def setUp(self):
+        Site.objects.get_current()
+
+    def create_interviews(self, count):
+        return [InterviewFactory(application=ApplicationFactory(), has_received_email=False) for _ in range(count)]
+
+    def test_emails_are_sent_and_interviews_are_marked(self, reverse_mock):
+        interviews = self.create_interviews(3)
+        InterviewFactory(application=None, has_received_email=False)
+
+        sent = send_interview_confirmation_emails()
+
+        self.assertEqual(3, sent)
+        self.assertEqual(3, len(mail.outbox))
+        emailed = Interview.objects.filter(id__in=[interview.id for interview in interviews], has_received_email=True)
+        self.assertEqual(3, emailed.count())
+        self.assertEqual(0, send_interview_confirmation_emails())
+
+    def test_query_count_does_not_grow_with_interview_count(self, reverse_mock):
+        self.create_interviews(2)
+
+        with self.assertNumQueries(2):
+            send_interview_confirmation_emails()
+
+        self.create_interviews(10)
+
+        with self.assertNumQueries(2):
+            send_interview_confirmation_emails()
@@ -0,0 +1,12 @@
+from django.conf.urls import url
+
+from odin.interviews.apis import BulkInterviewerFreeTimeCreateApi
+
+
+urlpatterns = [
+    url(
+        regex='^free-time/bulk/$',
+        view=BulkInterviewerFreeTimeCreateApi.as_view(),
+        name='free-time-bulk'
+    ),
+]
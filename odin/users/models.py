@@ -1,6 +1,10 @@
 import uuid
 
+from typing import Dict
+
 from django.db import models
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 
 from django.contrib.postgres.fields import JSONField
@@ -35,13 +39,13 @@ class BaseUser(PermissionsMixin,
         self.full_clean()
         super().save(*args, **kwargs)
 
+    ROLES = ('student', 'teacher', 'interviewer')
+
     def downcast(self, t):
         """
-        Since we don't know if the given field is present,
-        We cannot refresh from db with it.
-        That's why we fetch a fresh object.
+        Returns the `t` instance for this user or None.
+        Role lookups go through `get_roles`, so they are memoized for the lifetime of the instance.
         """
-        user = BaseUser.objects.get(id=self.id)
         prop = t.__name__.lower()
 
         relations = [f.name for f in BaseUser._meta.get_fields()
@@ -50,8 +54,60 @@ class BaseUser(PermissionsMixin,
         if prop not in relations:
             raise ValueError(f'Cannot downcast to {prop}. Choices are {relations}')
 
-        if hasattr(user, prop):
-            return getattr(user, prop)
+        if prop not in self.ROLES:
+            user = BaseUser.objects.get(id=self.id)
+
+            return getattr(user, prop, None)
+
+        if not self.get_roles()[prop]:
+            return None
+
+        role_instances = self.__dict__.setdefault('_role_instances', {})
+
+        if role_instances.get(prop) is None:
+            role_instances[prop] = t.objects.get(id=self.id)
+
+        return role_instances[prop]
+
+    @property
+    def roles_cache_key(self):
+        return f'user_roles_{self.secret_key}'
+
+    def get_roles(self) -> Dict[str, bool]:
+        """
+        Resolves student, teacher and interviewer membership with a single query.
+        The result is memoized on the instance and, if USER_ROLES_CACHE_TIMEOUT is set,
+        in the cache (keyed by secret_key).
+        """
+        roles = self.__dict__.get('_roles')
+
+        if roles is not None:
+            return roles
+
+        timeout = settings.USER_ROLES_CACHE_TIMEOUT
+
+        if timeout:
+            roles = cache.get(self.roles_cache_key)
+
+        if roles is None:
+            user = BaseUser.objects.select_related(*self.ROLES).get(id=self.id)
+            role_instances = {role: getattr(user, role, None) for role in self.ROLES}
+            roles = {role: instance is not None for role, instance in role_instances.items()}
+
+            self.__dict__['_role_instances'] = role_instances
+
+            if timeout:
+                cache.set(self.roles_cache_key, roles, timeout)
+
+        self.__dict__['_roles'] = roles
+
+        return roles
+
+    def clear_roles(self):
+        self.__dict__.pop('_roles', None)
+        self.__dict__.pop('_role_instances', None)
+
+        cache.delete(self.roles_cache_key)
 
     def get_full_name(self):
         return self.profile.full_name
@@ -82,15 +138,16 @@ class BaseUser(PermissionsMixin,
         return f'{self.email}'
 
     def is_student(self):
-        return hasattr(self, 'student')
+        return self.get_roles()['student']
 
     def is_teacher(self):
-        return hasattr(self, 'teacher')
+        return self.get_roles()['teacher']
 
     def is_interviewer(self):
-        return hasattr(self, 'interviewer')
+        return self.get_roles()['interviewer']
 
     def rotate_secret_key(self):
+        self.clear_roles()
         self.secret_key = uuid.uuid4()
         self.save()
 
@@ -1,6 +1,10 @@
 from test_plus import TestCase
 
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.test import override_settings
+
+from odin.education.models import Student, Teacher
 
 from ..models import BaseUser, Profile
 
@@ -31,6 +35,52 @@ class BaseUserTests(TestCase):
             BaseUser.objects.create_user(email=None, password=self.test_password)
 
 
+class BaseUserRolesTests(TestCase):
+    def setUp(self):
+        self.user = BaseUser.objects.create(email=faker.email(), password=faker.password())
+
+    def test_get_roles_resolves_all_roles_with_a_single_query(self):
+        Student.objects.create_from_user(self.user)
+
+        with self.assertNumQueries(1):
+            roles = self.user.get_roles()
+
+        self.assertEqual({'student': True, 'teacher': False, 'interviewer': False}, roles)
+
+    def test_role_checks_after_the_first_cost_no_queries(self):
+        Teacher.objects.create_from_user(self.user)
+        self.user.get_roles()
+
+        with self.assertNumQueries(0):
+            self.assertTrue(self.user.is_teacher())
+            self.assertFalse(self.user.is_student())
+            self.assertFalse(self.user.is_interviewer())
+            self.assertIsNotNone(self.user.downcast(Teacher))
+            self.assertIsNone(self.user.downcast(Student))
+
+    def test_create_from_user_clears_resolved_roles(self):
+        self.assertFalse(self.user.is_student())
+
+        Student.objects.create_from_user(self.user)
+
+        self.assertTrue(self.user.is_student())
+
+    @override_settings(USER_ROLES_CACHE_TIMEOUT=60)
+    def test_roles_are_cached_by_secret_key_when_cache_timeout_is_set(self):
+        cache.clear()
+        self.user.get_roles()
+
+        fresh_user = BaseUser.objects.get(id=self.user.id)
+
+        with self.assertNumQueries(0):
+            self.assertFalse(fresh_user.is_student())
+
+        Student.objects.create_from_user(fresh_user)
+        fresh_user = BaseUser.objects.get(id=self.user.id)
+
+        self.assertTrue(fresh_user.is_student())
+
+
 class ProfileTests(TestCase):
 
     def setUp(self):